@@ -0,0 +1,80 @@
+"""search indexes
+
+Revision ID: a3f1c9d27b64
+Revises: 5dfe8b0dfb91
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f1c9d27b64'
+down_revision: Union[str, None] = '5dfe8b0dfb91'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+USER_SEARCH_COLUMNS = ('username', 'email', 'first_name', 'last_name')
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    with op.batch_alter_table('items', schema='auctora_dev') as batch_op:
+        batch_op.add_column(
+            sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True)
+        )
+
+    # Backfill; ItemRepository.refresh_search keeps it current from here on
+    op.execute("""
+        UPDATE auctora_dev.items AS i SET search_vector =
+            setweight(to_tsvector('simple', coalesce(i.name, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(i.description, '')), 'B') ||
+            setweight(to_tsvector('simple', concat_ws(' ',
+                (SELECT string_agg(c.name, ' ')
+                   FROM auctora_dev.item_categories ic
+                   JOIN auctora_dev.categories c ON c.id = ic.category_id
+                  WHERE ic.item_id = i.id),
+                (SELECT string_agg(s.name, ' ')
+                   FROM auctora_dev.item_subcategories isc
+                   JOIN auctora_dev.subcategories s ON s.id = isc.sub_category_id
+                  WHERE isc.item_id = i.id)
+            )), 'C')
+    """)
+
+    op.create_index(
+        'ix_auctora_dev_items_search_vector', 'items', ['search_vector'],
+        schema='auctora_dev', postgresql_using='gin',
+    )
+    # Speeds up the join from ranked items back to their auction
+    op.create_index(
+        'ix_auctora_dev_items_auction_id', 'items', ['auction_id'],
+        schema='auctora_dev',
+    )
+    for column in USER_SEARCH_COLUMNS:
+        op.create_index(
+            f'ix_auctora_dev_users_{column}_trgm', 'users', [column],
+            schema='auctora_dev', postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'},
+        )
+
+
+def downgrade() -> None:
+    for column in USER_SEARCH_COLUMNS:
+        op.drop_index(
+            f'ix_auctora_dev_users_{column}_trgm', table_name='users',
+            schema='auctora_dev',
+        )
+    op.drop_index(
+        'ix_auctora_dev_items_auction_id', table_name='items',
+        schema='auctora_dev',
+    )
+    op.drop_index(
+        'ix_auctora_dev_items_search_vector', table_name='items',
+        schema='auctora_dev',
+    )
+    with op.batch_alter_table('items', schema='auctora_dev') as batch_op:
+        batch_op.drop_column('search_vector')
@@ -0,0 +1,96 @@
+"""stat rollups
+
+Revision ID: c41d7e9a8f25
+Revises: a3f1c9d27b64
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d7e9a8f25'
+down_revision: Union[str, None] = 'a3f1c9d27b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (scope, table, bucket expression over a row, columns that move a row),
+# as in server/models/stats.py
+ROLLUPS = (
+    ('auctions', 'auctions', "{row}.status::text || ':' || {row}.private::text",
+     'status, private'),
+    ('users', 'users', '{row}.role::text', 'role'),
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'stat_rollups',
+        sa.Column('scope', sa.String(), nullable=False),
+        sa.Column('bucket', sa.String(), nullable=False),
+        sa.Column('count', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('scope', 'bucket'),
+        schema='auctora_dev'
+    )
+    op.execute("""
+        CREATE OR REPLACE FUNCTION auctora_dev.bump_stat_rollup(
+            _scope text, _bucket text, _delta bigint
+        ) RETURNS void AS $$
+            INSERT INTO auctora_dev.stat_rollups AS r (scope, bucket, count)
+            VALUES (_scope, _bucket, _delta)
+            ON CONFLICT (scope, bucket)
+            DO UPDATE SET count = r.count + excluded.count
+        $$ LANGUAGE sql
+    """)
+    for scope, table, bucket, columns in ROLLUPS:
+        old, new = bucket.format(row='OLD'), bucket.format(row='NEW')
+        # Writers wait while the triggers go in and the backfill runs, so
+        # no row is counted twice or missed
+        op.execute(f'LOCK TABLE auctora_dev.{table} IN SHARE ROW EXCLUSIVE MODE')
+        op.execute(f"""
+            CREATE OR REPLACE FUNCTION auctora_dev.{table}_stat_rollup()
+            RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP <> 'INSERT' THEN
+                    PERFORM auctora_dev.bump_stat_rollup('{scope}', {old}, -1);
+                END IF;
+                IF TG_OP <> 'DELETE' THEN
+                    PERFORM auctora_dev.bump_stat_rollup('{scope}', {new}, 1);
+                END IF;
+                RETURN NULL;
+            END
+            $$ LANGUAGE plpgsql
+        """)
+        op.execute(f"""
+            CREATE TRIGGER {table}_stat_rollup_rows
+            AFTER INSERT OR DELETE ON auctora_dev.{table}
+            FOR EACH ROW EXECUTE FUNCTION auctora_dev.{table}_stat_rollup()
+        """)
+        op.execute(f"""
+            CREATE TRIGGER {table}_stat_rollup_moves
+            AFTER UPDATE OF {columns} ON auctora_dev.{table}
+            FOR EACH ROW WHEN ({old} IS DISTINCT FROM {new})
+            EXECUTE FUNCTION auctora_dev.{table}_stat_rollup()
+        """)
+        op.execute(f"""
+            INSERT INTO auctora_dev.stat_rollups (scope, bucket, count)
+            SELECT '{scope}', {bucket.format(row=table)}, count(*)
+            FROM auctora_dev.{table} GROUP BY 2
+        """)
+
+
+def downgrade() -> None:
+    for _, table, _, _ in ROLLUPS:
+        op.execute(
+            f'DROP TRIGGER IF EXISTS {table}_stat_rollup_moves ON auctora_dev.{table}'
+        )
+        op.execute(
+            f'DROP TRIGGER IF EXISTS {table}_stat_rollup_rows ON auctora_dev.{table}'
+        )
+        op.execute(f'DROP FUNCTION IF EXISTS auctora_dev.{table}_stat_rollup()')
+    op.execute(
+        'DROP FUNCTION IF EXISTS auctora_dev.bump_stat_rollup(text, text, bigint)'
+    )
+    op.drop_table('stat_rollups', schema='auctora_dev')
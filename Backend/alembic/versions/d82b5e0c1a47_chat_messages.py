@@ -0,0 +1,99 @@
+"""chat messages
+
+Revision ID: d82b5e0c1a47
+Revises: c41d7e9a8f25
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'd82b5e0c1a47'
+down_revision: Union[str, None] = 'c41d7e9a8f25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'chat_messages',
+        sa.Column('chat_id', sa.UUID(), nullable=False),
+        sa.Column('chat_number', sa.Integer(), nullable=False),
+        sa.Column('timestamp', sa.String(), nullable=True),
+        sa.Column('message', sa.String(), nullable=False),
+        sa.Column('sender_id', sa.String(), nullable=True),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('sender_type', sa.String(), nullable=False),
+        sa.Column('is_visible', sa.Boolean(), nullable=False),
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(
+            ['chat_id'], ['auctora_dev.chats.id'], ondelete='CASCADE'
+        ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('chat_id', 'chat_number'),
+        schema='auctora_dev'
+    )
+    op.create_index(
+        op.f('ix_auctora_dev_chat_messages_id'), 'chat_messages', ['id'],
+        unique=False, schema='auctora_dev'
+    )
+    with op.batch_alter_table('chats', schema='auctora_dev') as batch_op:
+        batch_op.add_column(sa.Column(
+            'last_number', sa.Integer(), server_default='0', nullable=False
+        ))
+
+    # Messages are renumbered by their position in the array, which is
+    # what the old append computed unless a client sent its own number
+    op.execute("""
+        INSERT INTO auctora_dev.chat_messages (
+            id, chat_id, chat_number, timestamp, message, sender_id,
+            status, sender_type, is_visible, created_at
+        )
+        SELECT gen_random_uuid(), c.id, m.n,
+               m.msg->>'timestamp', coalesce(m.msg->>'message', ''),
+               m.msg->>'sender_id', coalesce(m.msg->>'status', 'sending'),
+               coalesce(m.msg->>'sender_type', 'buyer'),
+               coalesce((m.msg->>'is_visible')::boolean, true),
+               c.created_at
+        FROM auctora_dev.chats c,
+             jsonb_array_elements(coalesce(c.conversation, '[]'::jsonb))
+                 WITH ORDINALITY AS m(msg, n)
+    """)
+    op.execute("""
+        UPDATE auctora_dev.chats
+        SET last_number = jsonb_array_length(coalesce(conversation, '[]'::jsonb))
+    """)
+    with op.batch_alter_table('chats', schema='auctora_dev') as batch_op:
+        batch_op.drop_column('conversation')
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('chats', schema='auctora_dev') as batch_op:
+        batch_op.add_column(sa.Column(
+            'conversation', postgresql.JSONB(astext_type=sa.Text()),
+            nullable=True
+        ))
+    op.execute("""
+        UPDATE auctora_dev.chats c SET conversation = (
+            SELECT coalesce(jsonb_agg(jsonb_build_object(
+                'chat_number', m.chat_number, 'timestamp', m.timestamp,
+                'message', m.message, 'sender_id', m.sender_id,
+                'status', m.status, 'sender_type', m.sender_type,
+                'is_visible', m.is_visible
+            ) ORDER BY m.chat_number), '[]'::jsonb)
+            FROM auctora_dev.chat_messages m WHERE m.chat_id = c.id
+        )
+    """)
+    with op.batch_alter_table('chats', schema='auctora_dev') as batch_op:
+        batch_op.drop_column('last_number')
+    op.drop_index(
+        op.f('ix_auctora_dev_chat_messages_id'), table_name='chat_messages',
+        schema='auctora_dev'
+    )
+    op.drop_table('chat_messages', schema='auctora_dev')
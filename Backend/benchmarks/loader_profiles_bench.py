@@ -0,0 +1,69 @@
+"""
+loader_profiles_bench.py
+SQL statements and time per auction read, with the models' default
+eager loading against each AuctionRepository loader profile.
+
+Reads the database configured in the app's .env (the listing needs a few
+ACTIVE auctions to be meaningful). Run from Backend/:
+    python -m benchmarks.loader_profiles_bench --auction <id> --per-page 20
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import event
+
+from server.config.database import async_engine, AsyncSessionLocal
+from server.repositories.auction_repository import (
+    AuctionRepository, AuctionParticipantRepository,
+)
+
+
+class StatementCounter:
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self.bump)
+
+    def bump(self, *_):
+        self.count += 1
+
+
+async def measure(counter, label: str, read):
+    async with AsyncSessionLocal() as session:
+        repo = AuctionRepository(AuctionParticipantRepository(session), session)
+        counter.count = 0
+        started = time.perf_counter()
+        await read(repo)
+        elapsed = time.perf_counter() - started
+    print(f"{label:<28} {counter.count:4d} statements {elapsed * 1e3:9.1f} ms")
+
+
+async def main(auction_id: str, per_page: int):
+    counter = StatementCounter(async_engine.sync_engine)
+    listing = {"page": 1, "per_page": per_page, "status": "ACTIVE"}
+
+    await measure(counter, "list (model defaults)",
+                  lambda r: r.get_all(dict(listing), profile=None))
+    await measure(counter, "list (card)",
+                  lambda r: r.get_all(dict(listing), profile="card"))
+    if auction_id:
+        await measure(counter, "retrieve (model defaults)",
+                      lambda r: r.get_by_id(auction_id))
+        await measure(counter, "retrieve (detail)",
+                      lambda r: r.get_by_id(auction_id, profile="detail"))
+        await measure(counter, "bid placement (bid)",
+                      lambda r: r.get_by_id(auction_id, profile="bid"))
+        await measure(counter, "close (model defaults)",
+                      lambda r: r.get_with_bids(auction_id, profile=None))
+        await measure(counter, "close (close)",
+                      lambda r: r.get_with_bids(auction_id))
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--auction", default=None)
+    parser.add_argument("--per-page", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.auction, args.per_page))
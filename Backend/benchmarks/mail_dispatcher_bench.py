@@ -0,0 +1,102 @@
+"""
+mail_dispatcher_bench.py
+Messages per second through MailDispatcher against a local SMTP sink,
+compared with the old one-connection-per-message delivery.
+
+Run from Backend/ (needs the app's .env, as any `server` import does):
+    python -m benchmarks.mail_dispatcher_bench --messages 500 --latency 0.01
+
+`--latency` delays every sink reply, to stand in for a remote server.
+"""
+
+import argparse
+import asyncio
+import time
+from email.message import EmailMessage
+
+from server.utils.mail_dispatcher import MailDispatcher, SMTPSession
+
+
+class SMTPSink:
+    """Accepts and discards mail; just enough SMTP for smtplib."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.received = 0
+
+    async def reply(self, writer, line: str):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        writer.write(f"{line}\r\n".encode())
+        await writer.drain()
+
+    async def handle(self, reader, writer):
+        await self.reply(writer, "220 sink ready")
+        while line := await reader.readline():
+            command = line.decode().strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                await self.reply(writer, "250 sink")
+            elif command == "DATA":
+                await self.reply(writer, "354 go ahead")
+                while (await reader.readline()) not in (b".\r\n", b""):
+                    pass
+                self.received += 1
+                await self.reply(writer, "250 queued")
+            elif command == "QUIT":
+                await self.reply(writer, "221 bye")
+                break
+            else:
+                await self.reply(writer, "250 ok")
+        writer.close()
+
+
+def build_message(i: int) -> EmailMessage:
+    message = EmailMessage()
+    message["Subject"] = f"Bench {i}"
+    message["From"] = "bench@localhost"
+    message["To"] = f"user{i}@localhost"
+    message.add_alternative(f"<p>Message {i}</p>", subtype="html")
+    return message
+
+
+def one_connection_per_message(port: int, messages: list[EmailMessage]):
+    for message in messages:
+        session = SMTPSession("127.0.0.1", port, use_ssl=False)
+        session.send_batch([message])
+        session.close()
+
+
+async def main(count: int, workers: int, batch: int, latency: float):
+    sink = SMTPSink(latency)
+    server = await asyncio.start_server(sink.handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    messages = [build_message(i) for i in range(count)]
+
+    started = time.perf_counter()
+    await asyncio.to_thread(one_connection_per_message, port, messages)
+    baseline = time.perf_counter() - started
+
+    dispatcher = MailDispatcher(
+        workers=workers, batch=batch, host="127.0.0.1", port=port,
+        username="", password="", use_ssl=False,
+    )
+    await dispatcher.start()
+    started = time.perf_counter()
+    await asyncio.gather(*(dispatcher.send(m) for m in messages))
+    pooled = time.perf_counter() - started
+    await dispatcher.stop()
+    server.close()
+
+    print(f"messages delivered to sink: {sink.received}")
+    print(f"one connection per message: {count / baseline:8.1f} msg/s")
+    print(f"dispatcher ({workers}x{batch}):       {count / pooled:8.1f} msg/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--batch", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.messages, args.workers, args.batch, args.latency))
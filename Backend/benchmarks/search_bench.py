@@ -0,0 +1,122 @@
+"""
+search_bench.py
+Auction search over a synthetic item table: the old `ILIKE '%q%'` scan
+against the ranked tsvector query served by the GIN index.
+
+Builds (and drops) a scratch schema in the target database, so point it
+at a disposable one. Run from Backend/:
+    python -m benchmarks.search_bench --dsn postgresql://... --items 1000000
+"""
+
+import argparse
+import time
+
+from sqlalchemy import create_engine, text
+
+
+SCHEMA = "search_bench"
+WORDS = (
+    "vintage leather walnut brass ceramic silver oak linen wool copper "
+    "camera guitar lamp watch chair table vase bicycle speaker jacket "
+    "red blue green black white large small handmade rare antique"
+).split()
+TERMS = ["leather jacket", "vint", "brass lamp", "rare antique watch", "guit"]
+
+SETUP = f"""
+DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;
+CREATE SCHEMA {SCHEMA};
+CREATE TABLE {SCHEMA}.items (
+    id bigint PRIMARY KEY,
+    auction_id bigint NOT NULL,
+    name text NOT NULL,
+    description text NOT NULL,
+    search_vector tsvector
+);
+INSERT INTO {SCHEMA}.items
+SELECT g, g,
+       (SELECT string_agg(w, ' ') FROM (
+            SELECT (:words)[1 + floor(random() * :nwords)::int] AS w
+            FROM generate_series(1, 3 + (g % 2))) s),
+       (SELECT string_agg(w, ' ') FROM (
+            SELECT (:words)[1 + floor(random() * :nwords)::int] AS w
+            FROM generate_series(1, 12 + (g % 5))) s)
+FROM generate_series(1, :items) g;
+UPDATE {SCHEMA}.items SET search_vector =
+    setweight(to_tsvector('simple', name), 'A') ||
+    setweight(to_tsvector('simple', description), 'B');
+CREATE INDEX ON {SCHEMA}.items USING gin (search_vector);
+CREATE INDEX ON {SCHEMA}.items (auction_id);
+ANALYZE {SCHEMA}.items;
+"""
+
+ILIKE = f"""
+SELECT auction_id FROM {SCHEMA}.items
+WHERE name ILIKE :like OR description ILIKE :like
+LIMIT 10
+"""
+ILIKE_COUNT = f"""
+SELECT count(*) FROM {SCHEMA}.items
+WHERE name ILIKE :like OR description ILIKE :like
+"""
+RANKED = f"""
+SELECT auction_id, ts_rank_cd(search_vector, to_tsquery('simple', :q)) AS rank
+FROM {SCHEMA}.items
+WHERE search_vector @@ to_tsquery('simple', :q)
+ORDER BY rank DESC
+LIMIT 10
+"""
+RANKED_COUNT = f"""
+SELECT count(*) FROM {SCHEMA}.items
+WHERE search_vector @@ to_tsquery('simple', :q)
+"""
+
+
+def tsquery(term: str) -> str:
+    return " & ".join(f"{w}:*" for w in term.lower().split())
+
+
+def timed(conn, label: str, queries: list[tuple[str, dict]], repeat: int):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for sql, params in queries:
+            conn.execute(text(sql), params).all()
+    per_search = (time.perf_counter() - started) / (repeat * len(TERMS))
+    print(f"{label:<28} {per_search * 1e3:10.2f} ms/search")
+
+
+def main(dsn: str, items: int, repeat: int, keep: bool):
+    engine = create_engine(dsn)
+    with engine.begin() as conn:
+        started = time.perf_counter()
+        for statement in filter(str.strip, SETUP.split(";")):
+            conn.execute(
+                text(statement),
+                {"words": WORDS, "nwords": len(WORDS), "items": items},
+            )
+        print(f"built {items} items + index in "
+              f"{time.perf_counter() - started:.1f} s")
+
+    with engine.connect() as conn:
+        ilike = []
+        ranked = []
+        for term in TERMS:
+            like = {"like": f"%{term}%"}
+            ilike += [(ILIKE, like), (ILIKE_COUNT, like)]
+            q = {"q": tsquery(term)}
+            ranked += [(RANKED, q), (RANKED_COUNT, q)]
+        timed(conn, "ILIKE page + count", ilike, repeat)
+        timed(conn, "tsvector page + count", ranked, repeat)
+
+    if not keep:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dsn", required=True)
+    parser.add_argument("--items", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--keep", action="store_true")
+    args = parser.parse_args()
+    main(args.dsn, args.items, args.repeat, args.keep)
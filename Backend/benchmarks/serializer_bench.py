@@ -0,0 +1,124 @@
+"""
+serializer_bench.py
+Time to turn a page of ORM rows into response JSON: the old path
+(`to_dict` -> `model_validate` -> FastAPI's response-model validation and
+`json.dumps`) against `CompiledSerializer` + a single pydantic-core dump.
+Covers an auction list page (item + seller) and a bid list page (bidder).
+
+Rows are transient ORM objects, so no database is needed, but `server`
+imports still read the app's .env. Run from Backend/:
+    python -m benchmarks.serializer_bench --rows 20 --pages 500
+"""
+
+import argparse
+import json
+import time
+import uuid
+from datetime import timedelta
+
+from pydantic import TypeAdapter
+from sqlalchemy.orm import configure_mappers
+
+from server.enums.auction_enums import AuctionStatus
+from server.enums.user_enums import UserRoles
+from server.models.auction import Auctions
+from server.models.bids import Bids
+from server.models.items import Items
+from server.models.users import Users
+from server.schemas import PagedResponse, GetAuctionSchema, GetBidSchemaWUser
+from server.utils.datetime_utils import now_utc
+from server.utils.serializer import CompiledSerializer
+
+
+def transient(model, **attrs):
+    """An ORM instance without running the model's __init__."""
+    obj = model.__mapper__.class_manager.new_instance()
+    for key, value in attrs.items():
+        setattr(obj, key, value)
+    return obj
+
+
+def user(i: int) -> Users:
+    return transient(
+        Users, id=uuid.uuid4(), username=f"user{i}", email=f"user{i}@example.com",
+        first_name="Bench", last_name=str(i), role=UserRoles.CLIENT,
+        image_link={"link": "https://example.com/a.png"}, created_at=now_utc(),
+        updated_at=now_utc(),
+    )
+
+
+def auctions(n: int) -> list[Auctions]:
+    rows = []
+    for i in range(n):
+        seller = user(i)
+        item = transient(
+            Items, id=uuid.uuid4(), users_id=seller.id, name=f"Item {i}",
+            description="A thing worth bidding on " * 4,
+            image_link={"link": "https://example.com/i.png", "public_id": "i"},
+        )
+        rows.append(transient(
+            Auctions, id=uuid.uuid4(), users_id=seller.id, user=seller,
+            item=[item], private=False, start_price=100.0, current_price=150.0,
+            start_date=now_utc(), end_date=now_utc() + timedelta(days=2),
+            status=AuctionStatus.ACTIVE, buy_now=False, watchers_count=i,
+            created_at=now_utc(),
+        ))
+    return rows
+
+
+def bids(n: int) -> list[Bids]:
+    auction_id = uuid.uuid4()
+    return [
+        transient(
+            Bids, id=uuid.uuid4(), auction_id=auction_id, user_id=uuid.uuid4(),
+            user=user(i), username=f"user{i}", amount=100.0 + i,
+            created_at=now_utc(),
+        )
+        for i in range(n)
+    ]
+
+
+def old_path(rows, schema, adapter: TypeAdapter) -> bytes:
+    page = PagedResponse(
+        data=[schema.model_validate(r.to_dict()) for r in rows], count=len(rows)
+    )
+    # What FastAPI does with the returned model and the route annotation
+    checked = adapter.validate_python(page.model_dump())
+    return json.dumps(adapter.dump_python(checked, mode="json")).encode()
+
+
+def compiled_path(rows, schema) -> bytes:
+    page = PagedResponse(
+        data=CompiledSerializer.of(schema).rows(rows), count=len(rows)
+    )
+    return page.model_dump_json().encode()
+
+
+def timed(label: str, pages: int, fn, *args):
+    started = time.perf_counter()
+    for _ in range(pages):
+        fn(*args)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<30} {elapsed / pages * 1e3:8.3f} ms/page")
+
+
+if __name__ == "__main__":
+    configure_mappers()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=500)
+    args = parser.parse_args()
+
+    auction_rows = auctions(args.rows)
+    auction_adapter = TypeAdapter(PagedResponse[list[GetAuctionSchema]])
+    timed("auction list: to_dict path", args.pages,
+          old_path, auction_rows, GetAuctionSchema, auction_adapter)
+    timed("auction list: compiled", args.pages,
+          compiled_path, auction_rows, GetAuctionSchema)
+
+    bid_rows = bids(args.rows)
+    bid_adapter = TypeAdapter(PagedResponse)
+    timed("bid list: to_dict path", args.pages,
+          old_path, bid_rows, GetBidSchemaWUser, bid_adapter)
+    timed("bid list: compiled", args.pages,
+          compiled_path, bid_rows, GetBidSchemaWUser)
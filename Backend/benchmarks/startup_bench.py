@@ -0,0 +1,87 @@
+"""
+startup_bench.py
+Cold start of the serverless entry point, as `app.py` pays it: each run is
+a fresh interpreter that imports `server`, calls `create_app()` and, with
+`--lifespan`, runs the startup half of the lifespan (init_db or the
+FAST_START head check) against the configured database.
+
+Prints the median and worst of each phase; `--json` writes them for CI to
+track and `--budget` fails the run when the median total exceeds it.
+Run from Backend/:
+    python -m benchmarks.startup_bench --runs 10 --budget 1500 --json out.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+
+CHILD = """
+import asyncio, json, time
+started = time.perf_counter()
+import server
+imported = time.perf_counter()
+app = server.create_app()
+created = time.perf_counter()
+timings = {"import": imported - started, "create_app": created - imported}
+if LIFESPAN:
+    async def startup():
+        async with app.router.lifespan_context(app):
+            return time.perf_counter()
+    timings["lifespan"] = asyncio.run(startup()) - created
+timings["total"] = sum(timings.values())
+print(json.dumps(timings))
+"""
+
+
+def run(lifespan: bool, fast_start: bool) -> dict[str, float]:
+    env = {**os.environ, "FAST_START": "true" if fast_start else "false"}
+    out = subprocess.run(
+        [sys.executable, "-c", f"LIFESPAN = {lifespan}\n{CHILD}"],
+        env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    # The app prints while starting; the timings are the last line.
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def measure(label: str, runs: int, lifespan: bool, fast_start: bool) -> dict:
+    samples = [run(lifespan, fast_start) for _ in range(runs)]
+    result = {}
+    for phase in samples[0]:
+        values = [s[phase] * 1e3 for s in samples]
+        result[phase] = {
+            "median_ms": statistics.median(values), "max_ms": max(values),
+        }
+        print(f"{label:<12} {phase:<10} median {result[phase]['median_ms']:8.1f} ms"
+              f"  max {result[phase]['max_ms']:8.1f} ms")
+    return result
+
+
+def main(runs: int, lifespan: bool, budget: float, out: str):
+    results = {"default": measure("default", runs, lifespan, False)}
+    if lifespan:
+        results["fast_start"] = measure("fast_start", runs, lifespan, True)
+
+    if out:
+        with open(out, "w") as f:
+            json.dump(results, f, indent=2)
+    if budget:
+        total = results["fast_start" if lifespan else "default"]["total"]["median_ms"]
+        if total > budget:
+            sys.exit(f"startup median {total:.1f} ms is over the {budget} ms budget")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument(
+        "--lifespan", action="store_true",
+        help="also run the startup lifespan (needs the database)",
+    )
+    parser.add_argument("--budget", type=float, default=0, help="ms, 0 = none")
+    parser.add_argument("--json", dest="out", default="")
+    args = parser.parse_args()
+    main(args.runs, args.lifespan, args.budget, args.out)
@@ -0,0 +1,64 @@
+"""
+template_render_bench.py
+Per-email render time of the old Emailer setup (a new Environment per
+email, templates re-read and recompiled) against the TemplateRegistry.
+
+Run from Backend/ (needs the app's .env, as any `server` import does):
+    python -m benchmarks.template_render_bench --emails 2000 --repeat 3
+"""
+
+import argparse
+import statistics
+import time
+from datetime import datetime
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from server.utils.template_registry import TEMPLATE_DIR, TemplateRegistry
+
+
+CONTEXT = {
+    "link": "https://biddius.com/product-details/00000000-0000-0000-0000-000000000000",
+    "user": {"username": "bench"},
+    "otp": "123456",
+    "current_year": datetime.now().year,
+}
+TEMPLATES = ["outbid_template.html", "bid_placed_template.html", "otp_template.html"]
+
+
+def per_email_environment(n: int):
+    for i in range(n):
+        env = Environment(
+            loader=FileSystemLoader(TEMPLATE_DIR),
+            autoescape=select_autoescape(["html", "xml"]),
+        )
+        env.get_template(TEMPLATES[i % len(TEMPLATES)]).render(**CONTEXT)
+
+
+def registry(n: int, registry: TemplateRegistry):
+    for i in range(n):
+        registry.render(TEMPLATES[i % len(TEMPLATES)], **CONTEXT)
+
+
+def timed(label: str, n: int, repeat: int, fn, *args):
+    runs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(n, *args)
+        runs.append((time.perf_counter() - started) / n * 1e6)
+    print(f"{label:<24} {statistics.median(runs):10.1f} µs/email (median of {repeat})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--emails", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    warm = TemplateRegistry()
+    count = warm.load_all()
+    print(f"startup: compiled {count} templates in "
+          f"{(time.perf_counter() - started) * 1e3:.1f} ms")
+    timed("environment per email", args.emails, args.repeat, per_email_environment)
+    timed("template registry", args.emails, args.repeat, registry, warm)
@@ -0,0 +1,145 @@
+"""
+write_path_bench.py
+How long the bidder's row lock is held while a repeat bid is written: the
+old write path (savepoint + re-locking SELECT in `wtab`, existence check,
+`synchronize_session="fetch"` and a re-read in `Repository.update`)
+against `UPDATE ... RETURNING`.
+
+The statements are replayed as `BidServices.update` issues them, from the
+`SELECT ... FOR UPDATE` of the bidder to the COMMIT, on a scratch schema.
+`--rtt` adds a simulated network round trip per statement, since a local
+database hides what the extra round trips cost. Run from Backend/:
+    python -m benchmarks.write_path_bench --dsn postgresql://... --rtt 1
+"""
+
+import argparse
+import statistics
+import time
+import uuid
+
+from sqlalchemy import create_engine, text
+
+
+SCHEMA = "write_path_bench"
+
+SETUP = f"""
+DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;
+CREATE SCHEMA {SCHEMA};
+CREATE TABLE {SCHEMA}.users (
+    id uuid PRIMARY KEY,
+    available_balance float NOT NULL,
+    auctioned_amount float NOT NULL,
+    updated_at timestamptz
+);
+CREATE TABLE {SCHEMA}.bids (
+    id uuid PRIMARY KEY,
+    user_id uuid NOT NULL,
+    amount float NOT NULL,
+    updated_at timestamptz
+);
+CREATE TABLE {SCHEMA}.wallet_transactions (
+    id uuid PRIMARY KEY,
+    user_id uuid NOT NULL,
+    amount float NOT NULL,
+    description text
+)
+"""
+
+LOCK_USER = f"SELECT * FROM {SCHEMA}.users WHERE id = :user FOR UPDATE"
+FIND_BID = f"SELECT * FROM {SCHEMA}.bids WHERE user_id = :user"
+INSERT_TX = f"""
+INSERT INTO {SCHEMA}.wallet_transactions (id, user_id, amount, description)
+VALUES (:tx, :user, :amount, 'bench')
+"""
+
+OLD = [
+    # wtab
+    "SAVEPOINT wtab",
+    LOCK_USER,
+    f"""UPDATE {SCHEMA}.users SET available_balance = :balance,
+        auctioned_amount = :auctioned, updated_at = now() WHERE id = :user""",
+    "RELEASE SAVEPOINT wtab",
+    INSERT_TX,
+    # Repository.update
+    f"SELECT id FROM {SCHEMA}.bids WHERE id = :bid",
+    f"""UPDATE {SCHEMA}.bids SET amount = :amount, updated_at = now()
+        WHERE id = :bid RETURNING id""",
+    f"SELECT * FROM {SCHEMA}.bids WHERE id = :bid",
+]
+NEW = [
+    f"""UPDATE {SCHEMA}.users
+        SET available_balance = available_balance - :amount,
+            auctioned_amount = auctioned_amount + :amount, updated_at = now()
+        WHERE id = :user AND available_balance >= :amount RETURNING *""",
+    INSERT_TX,
+    f"""UPDATE {SCHEMA}.bids SET amount = :amount, updated_at = now()
+        WHERE id = :bid RETURNING *""",
+]
+
+
+def bid(conn, statements: list[str], params: dict, rtt: float) -> float:
+    """One repeat bid; returns how long the bidder's row stayed locked."""
+    def run(sql):
+        conn.execute(text(sql), {**params, "tx": uuid.uuid4()})
+        time.sleep(rtt)
+
+    run(LOCK_USER)
+    locked = time.perf_counter()
+    run(FIND_BID)
+    for sql in statements:
+        run(sql)
+    conn.commit()
+    time.sleep(rtt)
+    return time.perf_counter() - locked
+
+
+def timed(engine, label: str, statements: list[str], bids: int, rtt: float):
+    user, bid_id = uuid.uuid4(), uuid.uuid4()
+    with engine.begin() as conn:
+        conn.execute(
+            text(f"INSERT INTO {SCHEMA}.users VALUES (:u, 1e12, 0, now())"),
+            {"u": user},
+        )
+        conn.execute(
+            text(f"INSERT INTO {SCHEMA}.bids VALUES (:b, :u, 1, now())"),
+            {"b": bid_id, "u": user},
+        )
+
+    held = []
+    with engine.connect() as conn:
+        for i in range(bids):
+            params = {
+                "user": user, "bid": bid_id, "amount": 1.0,
+                "balance": 1e12 - i, "auctioned": float(i),
+            }
+            held.append(bid(conn, statements, params, rtt))
+    held.sort()
+    print(f"{label:<28} lock held: median {statistics.median(held) * 1e3:7.2f} ms"
+          f"  p95 {held[int(len(held) * 0.95)] * 1e3:7.2f} ms")
+
+
+def main(dsn: str, bids: int, rtt: float, keep: bool):
+    engine = create_engine(dsn)
+    with engine.begin() as conn:
+        for statement in filter(str.strip, SETUP.split(";")):
+            conn.execute(text(statement))
+
+    timed(engine, "select + update + re-read", OLD, bids, rtt)
+    timed(engine, "update ... returning", NEW, bids, rtt)
+
+    if not keep:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dsn", required=True)
+    parser.add_argument("--bids", type=int, default=2000)
+    parser.add_argument(
+        "--rtt", type=float, default=0.0,
+        help="simulated round trip per statement, in ms",
+    )
+    parser.add_argument("--keep", action="store_true")
+    args = parser.parse_args()
+    main(args.dsn, args.bids, args.rtt / 1e3, args.keep)
@@ -8,8 +8,20 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse
 from sqlalchemy.orm import close_all_sessions
-from server.config import app_configs, init_db, recreate_db, engine, async_engine
-from server.controllers import routes
+from server.config import (
+    app_configs,
+    init_db,
+    recreate_db,
+    schema_is_current,
+    get_engine,
+    get_async_engine,
+    dispose_engines,
+)
+# Loads the models, schemas, repositories and services in the one order
+# their imports allow. Entry points that import a single module (the
+# scheduler, the event subscriber) rely on it now that the controllers
+# are only imported by create_app().
+import server.enums  # noqa: F401
 from server.middlewares.logs_middleware import RequestLogger
 from server.middlewares.multipart_large_file import LargeFileMiddleware
 from server.middlewares.exception_handler import (
@@ -26,6 +38,9 @@ from server.middlewares.exception_handler import (
     db_exception_handler,
 )
 from server.utils.logs import setup_logging
+from server.utils.cache import cache
+from server.utils.notif_hub import notif_hub
+from server.utils.ws_manager import get_wsmanager
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -33,16 +48,24 @@ async def lifespan(app: FastAPI):
     # binding asyncpg connections to the startup event loop (which breaks under
     # TestClient's per-request loops). The async engine is reserved for request
     # handling and is created lazily on first use.
-    init_db()
+    # FAST_START (serverless cold starts): when the migrations are at head
+    # there is nothing for CREATE SCHEMA / create_all to do.
+    if not (app_configs.FAST_START and schema_is_current()):
+        init_db()
     yield
-    if async_engine is not None:
-        await async_engine.dispose()
+    await get_wsmanager().close()
+    await notif_hub.close()
+    await cache.close()
+    await dispose_engines()
 
 
 def create_app(app_name: str = "temporary") -> FastAPI:
     """
     The create_app function is the entry point for our application.
     """
+    # Imported here so `import server` (scheduler, alembic, createadmin)
+    # doesn't load every controller and the SDKs behind them.
+    from server.controllers import routes
 
     app = FastAPI(
         title=app_configs.APP_NAME.capitalize(),
@@ -83,16 +106,16 @@ def create_app(app_name: str = "temporary") -> FastAPI:
 
     @app.get("/sqlpool")
     def sql_pool():
-        pool_info = {"sync": engine.pool.status()}
-        if async_engine is not None:
-            pool_info["async"] = async_engine.pool.status()
+        pool_info = {"sync": get_engine().pool.status()}
+        if get_async_engine() is not None:
+            pool_info["async"] = get_async_engine().pool.status()
         return {"status": "running", "pool_status": pool_info}
 
     @app.get("/clear_pool")
     def clear_pool():
         close_all_sessions()
-        engine.dispose()
-        return {"status": "running", "pool_status": engine.pool.status()}
+        get_engine().dispose()
+        return {"status": "running", "pool_status": get_engine().pool.status()}
 
     @app.get("/recreate_db")
     def recreate_database():
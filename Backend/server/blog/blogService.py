@@ -1,4 +1,4 @@
-import cloudinary.uploader
+from server.config import cloudinary_uploader
 from server.config.app_configs import app_configs
 from server.blog.blogSchema import (
     BlogViewSchema,
@@ -80,7 +80,7 @@ class BlogService:
     async def upload_main_image(self, title, file):
         try:
             filename = f"blog/{title.replace(' ', '_')}_main_image"
-            result = cloudinary.uploader.upload(
+            result = cloudinary_uploader().upload(
                 file,
                 public_id=filename,
                 overwrite=True,
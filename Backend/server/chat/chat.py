@@ -1,6 +1,6 @@
-from sqlalchemy import Column, ForeignKey, UUID
-from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.ext.mutable import MutableList
+from sqlalchemy import (
+    Boolean, Column, ForeignKey, Integer, String, UUID, UniqueConstraint
+)
 from sqlalchemy.orm import relationship
 
 from server.models.base import BaseModel
@@ -19,7 +19,8 @@ class Chats(BaseModel):
     seller_id = Column(
         UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), index=True
     )
-    conversation = Column(MutableList.as_mutable(JSONB), nullable=True, default=list)
+    # chat_number of the latest message: the per-chat message sequence
+    last_number = Column(Integer, nullable=False, default=0)
 
     # Relationships
     auction = relationship(
@@ -33,3 +34,24 @@ class Chats(BaseModel):
         foreign_keys=[seller_id],
         back_populates="seller_chats"
     )
+
+
+class ChatMessages(BaseModel):
+    """One message of a chat, numbered 1.. by `Chats.last_number`."""
+    __tablename__ = 'chat_messages'
+    __mapper_args__ = {'polymorphic_identity': 'chat_messages'}
+    __table_args__ = (
+        UniqueConstraint('chat_id', 'chat_number'),
+    )
+
+    chat_id = Column(
+        UUID(as_uuid=True), ForeignKey('chats.id', ondelete='CASCADE'),
+        nullable=False
+    )
+    chat_number = Column(Integer, nullable=False)
+    timestamp = Column(String, nullable=True)
+    message = Column(String, nullable=False)
+    sender_id = Column(String, nullable=True)
+    status = Column(String, nullable=False, default='sending')
+    sender_type = Column(String, nullable=False, default='buyer')
+    is_visible = Column(Boolean, nullable=False, default=True)
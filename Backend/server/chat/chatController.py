@@ -3,6 +3,7 @@ import json
 from fastapi import (
     APIRouter,
     Depends,
+    Query,
     WebSocket,
     WebSocketDisconnect
 )
@@ -36,6 +37,19 @@ async def retrieve(
     return APIResponse(data=chat)
 
 
+@route.get("/messages")
+@permissions(permission_level=Permissions.CLIENT, service=ServiceKeys.CHAT)
+async def history(
+    user: current_user,
+    chat_id: str,
+    before: int = None,
+    limit: int = Query(None, ge=1, le=200),
+    chatServices: ChatServices = Depends(get_chat_service)
+) -> APIResponse[list[ConversationSchema]]:
+    messages = await chatServices.history(chat_id, before, limit)
+    return APIResponse(data=messages)
+
+
 @route.patch("/send")
 @permissions(permission_level=Permissions.CLIENT, service=ServiceKeys.CHAT)
 async def message(
@@ -97,7 +111,7 @@ async def connect(
             elif data_type == 'read_message':
                 data = data.get('payload')
                 chat = await chatServices.mark_read(
-                    chat_id, data.get('chat_number')
+                    chat_id, data.get('chat_number'), str(user.id)
                 )
                 await wsmanager.message_chatroom(
                     chat_id, str(user.id), chat, type='read_message'
@@ -1,11 +1,12 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm.attributes import flag_modified
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.orm import selectinload
 
-from server.middlewares.exception_handler import ExcRaiser, ExcRaiser500
+from server.middlewares.exception_handler import (
+    ExcRaiser, ExcRaiser404, ExcRaiser500
+)
 from server.repositories.repository import Repository
-from server.chat.chat import Chats
+from server.chat.chat import Chats, ChatMessages
 from server.models.auction import Auctions
 
 class ChatRepository(Repository):
@@ -28,33 +29,32 @@ class ChatRepository(Repository):
         except Exception as e:
             raise e
 
-    async def update_convo(
-        self,
-        chat_id: str,
-        msg_id: int | str,
-        msg_attr: str ='status',
-        value: str | bool | int ='read'
-    ) -> Chats:
-        msg_id = int(msg_id)
-
-        def update_func(msg):
-            if int(msg.get('chat_number')) == msg_id:
-                msg[msg_attr] = value
-            return msg
-
+    async def append(self, chat_id: str, message: dict) -> tuple:
+        """
+        Numbers and stores one message: the chat row's sequence is bumped
+        with `UPDATE ... RETURNING` (serializing senders of this chat only)
+        and the message inserted. Cost does not grow with the history.
+        Returns `(chat columns row, message)`.
+        """
         try:
-            chat: Chats = await self.get_by_attr({'id': chat_id})
-
-            convo = list(chat.conversation or [])
-            updated = [update_func(m) for m in convo]
-
-            chat.conversation = updated
-            flag_modified(chat, 'conversation')
-
+            chat = (await self.db.execute(
+                update(Chats)
+                .where(Chats.id == chat_id)
+                .values(last_number=Chats.last_number + 1)
+                .returning(
+                    Chats.id, Chats.auctions_id, Chats.buyer_id,
+                    Chats.seller_id, Chats.last_number,
+                )
+                .execution_options(synchronize_session=False)
+            )).first()
+            if chat is None:
+                raise ExcRaiser404(message='Chat not found')
+            message = ChatMessages(
+                **{**message, 'chat_id': chat.id, 'chat_number': chat.last_number}
+            )
+            self.db.add(message)
             await self.db.commit()
-            await self.db.refresh(chat)
-            return chat
-
+            return chat, message
         except ExcRaiser as e:
             await self.db.rollback()
             raise e
@@ -64,3 +64,54 @@ class ChatRepository(Repository):
                 self._inspect.info()
                 raise ExcRaiser500(detail=str(e), exception=e)
             raise ExcRaiser500(detail=str(e))
+
+    async def messages(
+        self, chat_id: str, before: int = None, limit: int = 50
+    ) -> list[ChatMessages]:
+        """Latest `limit` visible messages before `before`, oldest first."""
+        stmt = (
+            select(ChatMessages)
+            .where(ChatMessages.chat_id == chat_id, ChatMessages.is_visible == True)
+            .order_by(ChatMessages.chat_number.desc())
+            .limit(limit)
+        )
+        if before is not None:
+            stmt = stmt.where(ChatMessages.chat_number < before)
+        rows = (await self.db.execute(stmt)).scalars().all()
+        return rows[::-1]
+
+    async def update_messages(self, chat_id: str, *criteria, **values) -> int:
+        """Sets `values` on the chat's messages matching `criteria`."""
+        try:
+            result = await self.db.execute(
+                update(ChatMessages)
+                .where(ChatMessages.chat_id == chat_id, *criteria)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            await self.db.commit()
+            return result.rowcount
+        except Exception as e:
+            await self.db.rollback()
+            if self.configs.DEBUG:
+                self._inspect.info()
+                raise ExcRaiser500(detail=str(e), exception=e)
+            raise ExcRaiser500(detail=str(e))
+
+    async def mark_read(
+        self, chat_id: str, up_to: int, reader_id: str = None
+    ) -> int:
+        """Marks every message up to `up_to` read, bar the reader's own."""
+        criteria = [
+            ChatMessages.chat_number <= int(up_to),
+            ChatMessages.status != 'read',
+        ]
+        if reader_id is not None:
+            criteria.append(ChatMessages.sender_id != str(reader_id))
+        return await self.update_messages(chat_id, *criteria, status='read')
+
+    async def hide(self, chat_id: str, chat_number: int) -> int:
+        return await self.update_messages(
+            chat_id, ChatMessages.chat_number == int(chat_number),
+            is_visible=False,
+        )
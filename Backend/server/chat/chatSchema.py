@@ -30,7 +30,6 @@ class CreateChatSchema(BaseModel):
     auctions_id: UUID
     buyer_id: UUID
     seller_id: UUID
-    conversation: list[ConversationSchema] = []
 
 
 class GetChatSchema(CreateChatSchema):
@@ -38,6 +37,9 @@ class GetChatSchema(CreateChatSchema):
     auctions_id: UUID
     buyer_id: UUID
     seller_id: UUID
+    # The latest page of messages, see ChatServices.history for the rest
+    conversation: list[ConversationSchema] = []
+    last_number: int = Field(default=0, exclude=True)
     convo_len: int = Field(default=0)
 
     auction: Optional[dict] = None
@@ -59,7 +61,7 @@ class GetChatSchema(CreateChatSchema):
             convo = list(filter(lambda x: x.is_visible is True, value))
             return convo
         if isinstance(value, int):
-            return len(self.conversation)
+            return self.last_number or len(self.conversation)
         return str(value)
 
 class UpdateChatSchema(BaseModel):
@@ -1,5 +1,4 @@
 from server.middlewares.exception_handler import ExcRaiser500, ExcRaiser
-from server.chat.chat import Chats
 from server.services.base_service import BaseService
 from server.chat.chatRepo import ChatRepository
 from server.utils.ex_inspect import ExtInspect
@@ -67,10 +66,16 @@ class ChatServices(BaseService):
                 if chat.auction
                 else None
             )
+            messages = await self.chat_repo.messages(
+                chat.id, limit=self.config.CHAT_HISTORY_PAGE
+            )
             chat = GetChatSchema.model_validate(
                 chat.to_dict(exclude=["buyer", "seller", "auction"])
             )
             chat.auction = auction
+            chat.conversation = [
+                ConversationSchema.model_validate(m) for m in messages
+            ]
             return chat
         except ExcRaiser as e:
             raise e
@@ -80,39 +85,35 @@ class ChatServices(BaseService):
                 raise ExcRaiser500(detail=str(e), exception=e)
             raise ExcRaiser500(detail=str(e))
 
+    async def history(
+        self, chat_id: str, before: int = None, limit: int = None
+    ) -> list[ConversationSchema]:
+        """Visible messages before `before` (the latest if None), oldest first."""
+        try:
+            messages = await self.chat_repo.messages(
+                chat_id, before, limit or self.config.CHAT_HISTORY_PAGE
+            )
+            return [ConversationSchema.model_validate(m) for m in messages]
+        except ExcRaiser as e:
+            raise e
+        except Exception as e:
+            if self.config.DEBUG:
+                self.inspect()
+                raise ExcRaiser500(detail=str(e), exception=e)
+            raise ExcRaiser500(detail=str(e))
+
     async def update_chat(
         self,
         chat_id: str,
         chat_data: ConversationSchema
     ) -> GetChatSchema:
         try:
-            chat = await self.get_chat_by_id(chat_id)
-            chat_data.chat_number += (len(chat.conversation) + 1)
-            updated_chat = await self.chat_repo.update_jsonb(
-                chat_id,
-                chat_data.model_dump(),
-                model=Chats,
-                attr='conversation'
-            )
-            auction = (
-                updated_chat.auction.to_dict(
-                    exclude=[
-                        "user",
-                        "payment",
-                        "participants",
-                        "chat",
-                        "bids",
-                        "created_at",
-                        "updated_at",
-                    ]
-                )
-                if updated_chat.auction
-                else None
-            )
-            chat = GetChatSchema.model_validate(
-                updated_chat.to_dict(exclude=["buyer", "seller", "auction"])
+            chat, message = await self.chat_repo.append(
+                chat_id, chat_data.model_dump(exclude={'chat_number'})
             )
-            chat.auction = auction
+            chat_data.chat_number = message.chat_number
+            chat = GetChatSchema.model_validate(chat._asdict())
+            chat.conversation = [chat_data]
             return chat
         except ExcRaiser as e:
             raise e
@@ -125,10 +126,12 @@ class ChatServices(BaseService):
     async def mark_read(
             self,
             chat_id: str,
-            msg_id: int | str
-    ) -> GetChatSchema:
+            msg_id: int | str,
+            reader_id: str = None,
+    ) -> dict:
+        """Marks the chat read up to message `msg_id` for `reader_id`."""
         try:
-            _ = await self.chat_repo.update_convo(chat_id, msg_id)
+            _ = await self.chat_repo.mark_read(chat_id, msg_id, reader_id)
             return {
                 'read': True, 'chat_number': msg_id
             }
@@ -144,11 +147,9 @@ class ChatServices(BaseService):
         self,
         chat_id: str,
         msg_id: int | str
-    ) -> GetChatSchema:
+    ) -> dict:
         try:
-            _ = await self.chat_repo.update_convo(
-                chat_id, msg_id, msg_attr='is_visible', value=False
-            )
+            _ = await self.chat_repo.hide(chat_id, msg_id)
             return {
                 'Deleted': True, 'chat_number': msg_id
             }
@@ -1,14 +1,17 @@
-import cloudinary
+from functools import lru_cache
+
 from server.config.app_configs import app_configs
 from server.config.database import (
     Base,
-    engine,
-    async_engine,
+    get_engine,
+    get_async_engine,
+    dispose_engines,
     AsyncSessionLocal,
     RedisStorage,
     recreate_db,
     init_db,
     init_db_async,
+    schema_is_current,
     get_db,
     get_async_db,
 )
@@ -21,15 +24,22 @@ __all__ = [
     'init_db',
     'sync_redis',
     'redis_store',
-    'cloudinary',
+    'cloudinary_uploader',
 ]
 
 
-cloudinary_init = cloudinary.config(
-    cloud_name=app_configs.cloudinary.CLOUD_NAME,
-    api_key=app_configs.cloudinary.API_KEY,
-    api_secret=app_configs.cloudinary.API_SECRET,
-)
+@lru_cache(maxsize=None)
+def cloudinary_uploader():
+    """`cloudinary.uploader`, imported and configured on the first upload."""
+    import cloudinary
+    import cloudinary.uploader
+
+    cloudinary.config(
+        cloud_name=app_configs.cloudinary.CLOUD_NAME,
+        api_key=app_configs.cloudinary.API_KEY,
+        api_secret=app_configs.cloudinary.API_SECRET,
+    )
+    return cloudinary.uploader
 
 
 # def init_db():
@@ -38,4 +48,13 @@ cloudinary_init = cloudinary.config(
 
 
 redis_store = RedisStorage()
-sync_redis = redis_store.redis
+
+
+def __getattr__(name: str):
+    # Built on access (see server.config.database)
+    if name == 'sync_redis':
+        return redis_store.redis
+    if name in ('engine', 'async_engine'):
+        from server.config import database
+        return getattr(database, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
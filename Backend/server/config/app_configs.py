@@ -118,6 +118,9 @@ class AppConfig(BaseSettings):
     GOOGLE_REDIRECT_URI: str
     GOOGLE_TOKEN_URI: str
 
+    # Startup (server.create_app)
+    FAST_START: bool = False  # skip create_all when migrations are at head
+
     # Payment
     COMPANY_TAX: float = 0.05
     PAYMENT_DUE_DAYS: int = 7200 if ENV == "production" else 5
@@ -126,6 +129,76 @@ class AppConfig(BaseSettings):
     REDIS_CACHE_EXPIRATION_LANDING: int = 60 * 60 * 24 * 1
     REDIS_CACHE_EXPIRATION_CAT: int = 60 * 60 * 24 * 2
 
+    # Service cache (server.utils.cache)
+    CACHE_JITTER: float = 0.1  # +/- share of a TTL, spreads expiries
+    CACHE_STALE: int = 60  # seconds an expired entry may still be served
+    CACHE_LOCK_TTL: int = 10  # seconds one caller may spend recomputing
+    CACHE_COMPRESS_MIN: int = 1024  # bytes before an entry is compressed
+    CACHE_AUCTION_TTL: int = 30  # auction page (bids drop it sooner)
+    CACHE_L1_TTL: int = 30  # seconds an entry lives in a worker's own tier
+    CACHE_L1_MAX_ENTRIES: int = 10_000
+    CACHE_L1_MAX_BYTES: int = 32 * 1024 * 1024  # encoded size, per worker
+
+    # Order book (server.utils.order_book)
+    ORDER_BOOK_GRACE: int = 60 * 60  # seconds a book outlives its auction
+    ORDER_BOOK_FLUSH_INTERVAL: int = 2  # seconds between price write-backs
+    ORDER_BOOK_FLUSH_BATCH: int = 500
+
+    # WebSockets (server.utils.ws_manager)
+    WS_WATCHERS_TTL: int = 60 * 60 * 24  # clears counts of crashed workers
+    WS_SEND_QUEUE_SIZE: int = 32  # frames buffered per socket
+    WS_MAX_DROPPED: int = 64  # dropped frames before a slow socket is closed
+    WS_SEND_TIMEOUT: int = 10  # seconds a single send may take
+    BID_BOARD_LOG_SIZE: int = 200  # new_bid frames kept for resync
+
+    # Auction watchers (server.utils.watchers)
+    WATCHERS_FLUSH_INTERVAL: int = 10  # seconds between count write-backs
+    WATCHERS_FLUSH_BATCH: int = 500
+
+    # Auction lifecycle (server.utils.auction_schedule)
+    SCHEDULE_MAX_SLEEP: float = 1.0  # seconds; bounds latency of new deadlines
+    SCHEDULE_RETRY_DELAY: int = 30  # seconds before a failed transition retries
+    SCHEDULE_SYNC_INTERVAL: int = 60  # seconds between Postgres reconciles
+    SCHEDULE_HORIZON: int = 60 * 60  # seconds ahead the reconcile looks
+
+    # Event stream (server.events)
+    EVENTS_STREAM_MAXLEN: int = 100_000  # approximate cap per stream
+    EVENTS_BATCH: int = 32  # entries read per XREADGROUP
+    EVENTS_BLOCK: int = 5_000  # ms an idle XREADGROUP waits
+    EVENTS_CLAIM_IDLE: int = 60_000  # ms before a pending entry is reclaimed
+    EVENTS_CONCURRENCY: int = 32  # events handled at once per subscriber
+    EVENTS_MAX_DELIVERIES: int = 5  # deliveries before an entry is dead-lettered
+
+    # Mail delivery (server.utils.mail_dispatcher)
+    MAIL_WORKERS: int = 4  # concurrent SMTP sessions per process
+    MAIL_BATCH: int = 10  # messages sent per session turn
+    MAIL_QUEUE_SIZE: int = 1_000
+    MAIL_IDLE_TIMEOUT: int = 30  # seconds before an idle session is closed
+    TEMPLATE_BYTECODE_DIR: str | None = None  # persist compiled templates here
+
+    # Notifications (UserNotificationServices)
+    NOTIF_COALESCE_WINDOW: int = 60  # seconds repeats merge into one row
+    NOTIF_COUNT_TTL: int = 60 * 60 * 24 * 7  # idle users' counters lapse
+    NOTIF_COUNT_RECONCILE_INTERVAL: int = 60 * 10  # seconds between repairs
+    NOTIF_STREAM_QUEUE_SIZE: int = 64  # undelivered messages kept per stream
+    NOTIF_STREAM_WAIT: int = 15  # seconds an idle stream sleeps between checks
+
+    # Authenticated principal cache (AuthServices)
+    PRINCIPAL_TTL: int = 5  # seconds a principal lives in Redis
+    PRINCIPAL_L1_TTL: float = 2.0  # seconds in the in-process LRU
+    PRINCIPAL_L1_SIZE: int = 2048
+
+    # Chats (server.chat)
+    CHAT_HISTORY_PAGE: int = 50  # messages per history page / WS connect
+
+    # Trending auctions (server.utils.trending)
+    TRENDING_HALF_LIFE: int = 60 * 60 * 6  # seconds for activity to halve
+    TRENDING_CLOSE_HALF_LIFE: int = 60 * 60 * 24  # a day further out halves it
+    TRENDING_BID_WEIGHT: float = 3.0
+    TRENDING_WATCH_WEIGHT: float = 1.0
+    TRENDING_SEED_LOCK: int = 60  # seconds one worker may spend seeding
+    TRENDING_CARD_TTL: int = 60  # seconds a rendered trending card is served
+
     # Referrals
     MAX_COMMISIONS_COUNT: int = 2
     REFERRAL_TAX: float = 0.01
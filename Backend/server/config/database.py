@@ -7,6 +7,7 @@ Ensures schema creation before table creation, and safe Base import order.
 import os
 from typing import Generator, AsyncGenerator
 from sqlalchemy import create_engine, schema, text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import declarative_base, sessionmaker, Session
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
@@ -29,43 +30,73 @@ environment = os.getenv("ENV", "test")
 print(f"🔧 Environment: {environment}")
 
 # -----------------------------------------------------------------------------
-# Database Engine (sync — kept for auction_status_updater and legacy repos)
+# Engines — built on first use, so importing the app (a serverless cold start,
+# the scheduler, alembic) doesn't load the drivers and pools it may not need.
 # -----------------------------------------------------------------------------
-engine = (
-    create_engine(app_configs.DB.TEST_DATABASE)
-    if environment == "test"
-    else create_engine(
-        app_configs.DB.DATABASE_URL,
-        pool_size=10,
-        max_overflow=6,
-        pool_recycle=600,
-        pool_timeout=5,
-        pool_pre_ping=True,
-        isolation_level="READ COMMITTED",
-    )
-)
+_engine = None
+_async_engine = None
+
+
+def get_engine():
+    """Sync engine — kept for auction_status_updater and legacy repos."""
+    global _engine
+    if _engine is None:
+        _engine = (
+            create_engine(app_configs.DB.TEST_DATABASE)
+            if environment == "test"
+            else create_engine(
+                app_configs.DB.DATABASE_URL,
+                pool_size=10,
+                max_overflow=6,
+                pool_recycle=600,
+                pool_timeout=5,
+                pool_pre_ping=True,
+                isolation_level="READ COMMITTED",
+            )
+        )
+    return _engine
+
 
-# -----------------------------------------------------------------------------
-# Async Engine (target for all FastAPI request handling)
-# -----------------------------------------------------------------------------
 def _async_url(url: str) -> str:
     return (
         url.replace("postgresql+psycopg2://", "postgresql+asyncpg://")
            .replace("postgresql://", "postgresql+asyncpg://")
     )
 
-async_engine = (
-    None  # aiosqlite not wired up for test env; use sync engine in tests
-    if environment == "test"
-    else create_async_engine(
-        _async_url(app_configs.DB.DATABASE_URL),
-        pool_size=10,
-        max_overflow=6,
-        pool_recycle=600,
-        pool_timeout=5,
-        pool_pre_ping=True,
-    )
-)
+
+def get_async_engine():
+    """
+    Async engine (target for all FastAPI request handling). None in the
+    test env: aiosqlite is not wired up, tests use the sync engine.
+    """
+    global _async_engine
+    if _async_engine is None and environment != "test":
+        _async_engine = create_async_engine(
+            _async_url(app_configs.DB.DATABASE_URL),
+            pool_size=10,
+            max_overflow=6,
+            pool_recycle=600,
+            pool_timeout=5,
+            pool_pre_ping=True,
+        )
+    return _async_engine
+
+
+async def dispose_engines():
+    """Closes the pools of whichever engines were built."""
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    if _engine is not None:
+        _engine.dispose()
+
+
+def __getattr__(name: str):
+    # `engine` / `async_engine` as module attributes, built on access
+    if name == "engine":
+        return get_engine()
+    if name == "async_engine":
+        return get_async_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # -----------------------------------------------------------------------------
 # Declarative Base
@@ -80,19 +111,37 @@ Base = declarative_base(metadata=schema.MetaData(schema=default_schema))
 # -----------------------------------------------------------------------------
 # Session factories
 # -----------------------------------------------------------------------------
-SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+class LazySessionmaker:
+    """Session factory that builds its engine with the first session."""
+
+    def __init__(self, build):
+        self._build = build
+        self._factory = None
 
-# expire_on_commit=False keeps ORM objects usable after commit without
-# re-querying — essential for async where implicit lazy IO is not allowed.
-AsyncSessionLocal = (
-    None
-    if async_engine is None
-    else async_sessionmaker(
+    def __call__(self, **kw):
+        if self._factory is None:
+            self._factory = self._build()
+        return self._factory(**kw)
+
+
+SessionLocal = LazySessionmaker(
+    lambda: sessionmaker(bind=get_engine(), autocommit=False, autoflush=False)
+)
+
+
+def _async_sessionmaker():
+    async_engine = get_async_engine()
+    assert async_engine is not None, "async_engine is not configured (test env?)"
+    # expire_on_commit=False keeps ORM objects usable after commit without
+    # re-querying — essential for async where implicit lazy IO is not allowed.
+    return async_sessionmaker(
         async_engine,
         class_=AsyncSession,
         expire_on_commit=False,
     )
-)
+
+
+AsyncSessionLocal = LazySessionmaker(_async_sessionmaker)
 
 # -----------------------------------------------------------------------------
 # Schema + Table Initialization
@@ -113,7 +162,7 @@ def init_db():
     Used by the auction_status_updater process and test setup.
     """
     import_all_models()
-    with engine.begin() as conn:
+    with get_engine().begin() as conn:
         print(f"🗄️  Initializing database schema '{default_schema}'...")
         conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {default_schema}"))
         Base.metadata.create_all(bind=conn)
@@ -126,6 +175,7 @@ async def init_db_async():
     Called from the FastAPI lifespan on startup.
     """
     import_all_models()
+    async_engine = get_async_engine()
     assert async_engine is not None, "async_engine is not configured (test env?)"
     async with async_engine.begin() as conn:
         print(f"🗄️  Initializing database schema '{default_schema}'...")
@@ -134,10 +184,29 @@ async def init_db_async():
     print("✅ Registered models:", list(Base.metadata.tables.keys()))
 
 
+def schema_is_current() -> bool:
+    """
+    True when the database is at the Alembic head, i.e. the migrations
+    already created everything `init_db` would.
+    """
+    from alembic.script import ScriptDirectory
+
+    backend = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+    heads = set(ScriptDirectory(os.path.join(backend, "alembic")).get_heads())
+    try:
+        with get_engine().connect() as conn:
+            applied = set(conn.execute(text(
+                f"SELECT version_num FROM {default_schema}.alembic_version"
+            )).scalars())
+    except DBAPIError:
+        return False  # never migrated
+    return applied == heads
+
+
 def recreate_db():
     """Drops and recreates the entire database schema. Use with caution."""
     if environment != "production":
-        with engine.begin() as conn:
+        with get_engine().begin() as conn:
             print(f"⚠️  Dropping database schema '{default_schema}'...")
             Base.metadata.drop_all(bind=conn)
             print(f"✅ Creating database schema '{default_schema}'...")
@@ -161,7 +230,6 @@ def get_db() -> Generator[Session, None, None]:
 # FastAPI dependency — async (target for all new and migrated repos)
 # -----------------------------------------------------------------------------
 async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
-    assert AsyncSessionLocal is not None, "AsyncSessionLocal not configured"
     async with AsyncSessionLocal() as session:
         yield session
 
@@ -173,8 +241,15 @@ class RedisStorage:
     REDIS_URL = app_configs.DB.REDIS_URL
 
     def __init__(self) -> None:
-        self.redis = self.get_redis()
+        self._redis = None
         self.async_redis = None
+        self.async_redis_raw = None
+
+    @property
+    def redis(self) -> SyncRedis:
+        if self._redis is None:
+            self._redis = self.get_redis()
+        return self._redis
 
     def get_redis(self) -> SyncRedis:
         return SyncRedis.from_url(url=self.REDIS_URL, decode_responses=True)
@@ -186,6 +261,12 @@ class RedisStorage:
             )
         return self.async_redis
 
+    async def get_async_redis_raw(self) -> AsyncRedis:
+        """Async connection returning bytes, for binary values (server.utils.cache)."""
+        if self.async_redis_raw is None:
+            self.async_redis_raw = await AsyncRedis.from_url(url=self.REDIS_URL)
+        return self.async_redis_raw
+
     async def get_pubsub_redis(self) -> AsyncRedis:
         """Dedicated async connection for pubsub — must not share general-purpose connection."""
         return await AsyncRedis.from_url(url=self.REDIS_URL, decode_responses=True)
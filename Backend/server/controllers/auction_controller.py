@@ -1,3 +1,4 @@
+from typing import List
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from server.middlewares.exception_handler import ExcRaiser400
@@ -5,9 +6,10 @@ from server.config import get_db
 from server.schemas import (
     APIResponse, UpdateAuctionSchema,
     GetAuctionSchema, CreateAuctionSchema,
-    RestartAuctionSchema, PagedResponse, AuctionQueryScalar,
+    RestartAuctionSchema, PagedResponse, AuctionQueryScalar, PagedQuery,
 )
 from server.services import current_user, AuctionServices, get_auction_service
+from server.utils.serializer import json_response
 from server.middlewares.auth import (
     RequirePermission, permissions, Permissions,
     ServiceKeys
@@ -36,7 +38,19 @@ async def list(
     auctionServices: AuctionServices = Depends(get_auction_service),
 ) -> PagedResponse[list[GetAuctionSchema]]:
     result = await auctionServices.list(filter)
-    return result
+    return json_response(result)
+
+
+# List: at this point `list` is the route handler above.
+@route.get('/watching')
+@permissions(permission_level=Permissions.CLIENT)
+async def watching(
+    user: current_user,
+    filter: PagedQuery = Depends(),
+    auctionServices: AuctionServices = Depends(get_auction_service),
+) -> PagedResponse[List[GetAuctionSchema]]:
+    result = await auctionServices.watching(user.id, filter)
+    return json_response(result)
 
 
 @route.get('/{id}')
@@ -146,9 +160,11 @@ async def restart(
 @route.get('/stats/count')
 @permissions(permission_level=Permissions.ADMIN)
 async def count_auctions(
-    user: current_user, auctionServices: AuctionServices = Depends(get_auction_service)
+    user: current_user,
+    exact: bool = False,
+    auctionServices: AuctionServices = Depends(get_auction_service),
 ) -> APIResponse[dict[str, int]]:
-    result = await auctionServices.count()
+    result = await auctionServices.count(exact)
     return APIResponse(data=result)
 
 
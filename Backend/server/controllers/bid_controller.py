@@ -1,11 +1,9 @@
-import json
 from fastapi import (
     APIRouter, Depends,
     WebSocket, WebSocketDisconnect,
     WebSocketException, status,
 )
 from sqlalchemy.orm import Session
-from server.config import redis_store
 from server.middlewares.auth import (
     permissions, Permissions,
     ServiceKeys
@@ -15,7 +13,9 @@ from server.schemas import (
     APIResponse, BidQuery, PagedResponse
 )
 from server.schemas.bid_schema import GetBidSchemaWUser
-from server.utils.ws_manager import WSManager
+from server.utils.ws_manager import get_wsmanager
+from server.utils.bid_board import bid_board
+from server.utils.serializer import json_response
 from server.services import (
     current_user,
     BidServices,
@@ -25,15 +25,9 @@ from server.services import (
 
 
 route = APIRouter(prefix='/bids', tags=['bids'])
-wsmanager = WSManager()
-
-
-async def broadcast_bids(bidServices: BidServices, auction_id: str):
-    """Push the refreshed bid list to any clients already in this auction's WS room."""
-    prev_bids = await bidServices.list_ws(str(auction_id))
-    await wsmanager.broadcast(
-        str(auction_id), {"type": "new_bid", "payload": prev_bids}
-    )
+# Shared with the rest of the process; broadcasts reach other workers
+# through the manager's Redis channel.
+wsmanager = get_wsmanager()
 
 
 @route.post('/')
@@ -48,7 +42,6 @@ async def create(
     data["username"] = user.username
     result = await bidServices.create(CreateBidSchema(**data))
     result = GetBidSchemaWUser.model_validate(result)
-    await broadcast_bids(bidServices, result.auction_id)
     return APIResponse(data=result)
 
 
@@ -63,7 +56,6 @@ async def buy_now(
     data["user_id"] = user.id
     data["username"] = user.username
     result = await bidServices.buy_now(CreateBidSchema(**data))
-    await broadcast_bids(bidServices, result.auction_id)
     return APIResponse(data=result)
 
 
@@ -80,7 +72,6 @@ async def update(
         amount.amount, exisiting_bid=existing_bid
     )
     result = GetBidSchemaWUser.model_validate(result)
-    await broadcast_bids(bidServices, existing_bid.auction_id)
     return result
 
 
@@ -94,7 +85,7 @@ async def list(
     result = await bidServices.list(
         query.model_dump(exclude_unset=True), with_users=True
     )
-    return result
+    return json_response(result)
 
 
 @route.get('/{id}')
@@ -116,26 +107,28 @@ async def ws_create(
     try:
         _user = await AuthServices.get_ws_user(ws, token)
         await wsmanager.connect(id, ws)
-        redis = await redis_store.get_async_redis()
-        prev_bids = await redis.get(f"auction:{id}")
-        if prev_bids:
-            await wsmanager.send_data(json.loads(prev_bids), ws)
-        else:
-            prev_bids = await bidServices.list_ws(id)
-            await wsmanager.send_data(prev_bids, ws)
-
-        watcher = ws.client.host
-        await bidServices.add_watcher(id, watcher)
+        seq, prev_bids = await bidServices.snapshot_ws(id)
+        await wsmanager.send_data(prev_bids, ws, seq=seq)
+
+        await bidServices.add_watcher(id, str(_user.id))
         while True:
             data = await ws.receive_json(mode="text")
-            if data.get('type') != 'websocket.disconnect':
+            if data.get('type') == 'resync':
+                # Client noticed a gap in `seq` (or got a `resync_hint`
+                # after its outbox dropped frames): replay what it missed, or
+                # send a fresh snapshot if the log no longer goes back that far.
+                events = await bid_board.since(id, int(data.get('seq') or 0))
+                if events is None:
+                    seq, prev_bids = await bidServices.snapshot_ws(id)
+                    await wsmanager.send_data(prev_bids, ws, seq=seq)
+                else:
+                    for event in events:
+                        await ws.send_json(event)
+            elif data.get('type') != 'websocket.disconnect':
                 data["user_id"] = str(_user.id)
                 data["username"] = _user.username
-                bids = await bidServices.create_ws(
-                    CreateBidSchema(**data), wsmanager, ws
-                )
-                if bids:
-                    await wsmanager.broadcast(id, {'type': 'new_bid', 'payload': bids})
+                # create_ws broadcasts the resulting new_bid frame itself
+                await bidServices.create_ws(CreateBidSchema(**data), wsmanager, ws)
     except (WebSocketDisconnect, RuntimeError):
         await wsmanager.disconnect(id, ws)
     except WebSocketException as wse:
@@ -157,3 +150,10 @@ async def count_bids(
 ) -> APIResponse[dict[str, int]]:
     result = await bidServices.count({"auction_id": auction_id} if auction_id else None)
     return APIResponse(data={'result': result})
+
+
+@route.get('/stats/ws')
+@permissions(permission_level=Permissions.ADMIN)
+async def ws_metrics(user: current_user) -> APIResponse[dict[str, dict]]:
+    """Live broadcast metrics of this worker's auction rooms."""
+    return APIResponse(data=wsmanager.metrics())
@@ -16,9 +16,6 @@ from server.services import (
     get_category_service,
 )
 from sqlalchemy.orm import Session
-from server.config import app_configs, get_db, redis_store
-from server.utils.helpers import cache_obj_format, load_obj_from_cache
-from server.middlewares.exception_handler import ExcRaiser500
 
 
 route = APIRouter(prefix='/categories', tags=['categories'])
@@ -33,15 +30,6 @@ async def create_category(
     categoryServices: CategoryServices = Depends(get_category_service),
 ) -> APIResponse[GetCategorySchema]:
     new_cat = await categoryServices.create_category(category)
-    if new_cat:
-        redis = await redis_store.get_async_redis()
-        categories = await categoryServices.list_categories()
-        formated_categories = cache_obj_format(categories)
-        await redis.set(
-            "category_cache",
-            formated_categories,
-            ex=app_configs.REDIS_CACHE_EXPIRATION_CAT,
-        )
     return APIResponse(data=new_cat)
 
 
@@ -58,24 +46,7 @@ async def get_category(
 async def list_categories(
     categoryServices: CategoryServices = Depends(get_category_service),
 ) -> APIResponse[list[GetCategorySchema]]:
-    redis = await redis_store.get_async_redis()
-    category_cache = await redis.get('category_cache')
-    if category_cache:
-        try:
-            loaded_cache = load_obj_from_cache(category_cache, GetCategorySchema)
-            return APIResponse(data=loaded_cache)
-        except Exception as e:
-            raise ExcRaiser500(
-                detail="Error loading category cache",
-                exception=e
-            )
     categories = await categoryServices.list_categories()
-    formated_categories = cache_obj_format(categories)
-    await redis.set(
-        'category_cache',
-        formated_categories,
-        ex=app_configs.REDIS_CACHE_EXPIRATION_CAT
-    )
     return APIResponse(data=categories)
 
 
@@ -110,15 +81,6 @@ async def create_sub_category(
     categoryServices: CategoryServices = Depends(get_category_service),
 ) -> APIResponse[GetSubCategorySchema]:
     new_sub_cat = await categoryServices.create_sub_category(sub_cat)
-    if new_sub_cat:
-        redis = await redis_store.get_async_redis()
-        categories = await categoryServices.list_categories()
-        formated_categories = cache_obj_format(categories)
-        await redis.set(
-            "category_cache",
-            formated_categories,
-            ex=app_configs.REDIS_CACHE_EXPIRATION_CAT,
-        )
     return APIResponse(data=new_sub_cat)
 
 
@@ -135,26 +97,7 @@ async def get_sub_category(
 async def list_sub_categories(
     categoryServices: CategoryServices = Depends(get_category_service),
 ) -> APIResponse[list[GetSubCategorySchema]]:
-
-    redis = await redis_store.get_async_redis()
-    sub_category_cache = await redis.get('sub_category_cache')
-    if sub_category_cache:
-        try:
-            loaded_cache = load_obj_from_cache(sub_category_cache, GetSubCategorySchema)
-            return APIResponse(data=loaded_cache)
-        except Exception as e:
-            raise ExcRaiser500(
-                detail="Error loading subcategory cache",
-                exception=e
-            )
     sub_categories = await categoryServices.list_sub_categories()
-
-    formated_categories = cache_obj_format(sub_categories)
-    await redis.set(
-        'sub_category_cache',
-        formated_categories,
-        ex=app_configs.REDIS_CACHE_EXPIRATION_CAT
-    )
     return APIResponse(data=sub_categories)
 
 
@@ -1,8 +1,9 @@
 from typing import Union
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
 from server.config import app_configs, get_db, redis_store
+from server.utils.serializer import json_response
 from server.services import (
     get_auction_service,
     get_user_service,
@@ -23,22 +24,12 @@ router = APIRouter(prefix='/landing', tags=['Landing Page'])
 
 @router.get('/trending_auctions')
 async def get_trending_auctions(
+    page: int = Query(1, ge=1),
+    per_page: int = Query(20, ge=1, le=100),
     auctionServices: AuctionServices = Depends(get_auction_service),
 ):
-    redis = await redis_store.get_async_redis()
-    trending_auctions = await redis.get('trending_auctions')
-    if trending_auctions:
-        return PagedResponse.model_validate_json(trending_auctions)
-
-    else:
-        filter = PagedQuery(page=1, per_page=20)
-        auctions = await auctionServices.list(filter, {"status": "ACTIVE"})
-        await redis.set(
-            'trending_auctions',
-            auctions.model_dump_json(),
-            ex=app_configs.REDIS_CACHE_EXPIRATION_LANDING
-        )
-        return auctions
+    filter = PagedQuery(page=page, per_page=per_page)
+    return json_response(await auctionServices.trending(filter))
 
 
 @router.get('/search')
@@ -52,5 +43,5 @@ async def search(
     if model == 'User':
         result = await userServices.search(query)
     elif model == 'Auction':
-        result = await auctionServices.search(query)
+        return json_response(await auctionServices.search(query))
     return result
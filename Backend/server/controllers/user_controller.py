@@ -6,12 +6,11 @@ from typing import Union
 from fastapi import APIRouter, Depends, Request, Response, File, UploadFile
 from fastapi.responses import RedirectResponse, StreamingResponse
 import httpx
-from google.oauth2 import id_token
-from google.auth.transport import requests as google_requests
-from server.utils.helpers import cache_obj_format
+from server.utils.notif_hub import notif_hub
 from server.config import get_db, app_configs, redis_store
 from server.config.database import AsyncSessionLocal
 from server.enums import ServiceKeys
+from server.utils.principal_cache import principal_cache
 from server.enums.user_enums import (
     Permissions,
     TransactionTypes,
@@ -279,7 +278,10 @@ async def callback(
     if "error" in response_data:
         raise ExcRaiser400(detail="Failed to get token")
 
-    # Validate the ID token
+    # Validate the ID token (google-auth is only imported on this path)
+    from google.oauth2 import id_token
+    from google.auth.transport import requests as google_requests
+
     id_info = id_token.verify_oauth2_token(
         response_data["id_token"], google_requests.Request(), app_configs.GOOGLE_CLIENT_ID
     )
@@ -315,14 +317,9 @@ async def logout(request: Request, response: Response, user: current_user = None
     if not token:
         return APIResponse(data='No active session found')
 
-    await async_redis.setex(
-        f"blacklist_{token}",
-        app_configs.security.ACCESS_TOKEN_EXPIRES * 3600,
-        cache_obj_format({"token": token}),
-    )
-
     if user:
         await async_redis.delete(f"refresh_token:{user.id}")
+    await principal_cache.revoke(token, user.id if user else None)
 
     response.delete_cookie(key='access_token')
     response.delete_cookie(key='refresh_token')
@@ -474,10 +471,6 @@ async def redeem_reward_points(
 ############################ Notification Endpoints ###########################
 ###############################################################################
 
-def user_notif_channel(user_id: str) -> str:
-    return f"user_notif_{user_id}"
-
-
 @notif_route.get('/subscribe')
 @permissions(permission_level=Permissions.CLIENT)
 async def subscribe_notifications(
@@ -498,10 +491,8 @@ async def subscribe_notifications(
             return await notificationServices.count(user.id)
 
     async def event_generator():
-        # Dedicated connection — pubsub must not share the general async connection
-        pubsub_redis = await redis_store.get_pubsub_redis()
-        pubsub = pubsub_redis.pubsub()
-        await pubsub.subscribe(user_notif_channel(user.id))
+        # Fed by this worker's single pattern subscription (notif_hub)
+        queue = await notif_hub.subscribe(user.id)
         try:
             if not await AuthServices.verify_token(request):
                 return
@@ -522,27 +513,24 @@ async def subscribe_notifications(
                     last_auth_check = now
 
                 try:
-                    message = await pubsub.get_message(
-                        ignore_subscribe_messages=True, timeout=1.0
-                    )
+                    messages = [await asyncio.wait_for(
+                        queue.get(), app_configs.NOTIF_STREAM_WAIT
+                    )]
                 except asyncio.TimeoutError:
-                    message = None
-
-                if message is None:
                     continue
-                else:
-                    count = await _notif_count()
-                    yield f"event: count\ndata: {json.dumps(count)}\n\n"
-                    yield f"data: {message['data']}\n\n"
-                await asyncio.sleep(2)
+                # A burst is sent with one count refresh
+                while not queue.empty():
+                    messages.append(queue.get_nowait())
+                count = await _notif_count()
+                yield f"event: count\ndata: {json.dumps(count)}\n\n"
+                for data in messages:
+                    yield f"data: {data}\n\n"
 
         except asyncio.CancelledError:
             raise  # propagate so uvicorn can shut down cleanly
 
         finally:
-            await pubsub.unsubscribe(user_notif_channel(user.id))
-            await pubsub.close()
-            await pubsub_redis.aclose()
+            notif_hub.unsubscribe(user.id, queue)
     return StreamingResponse(event_generator(), media_type='text/event-stream')
 
 
@@ -570,6 +558,16 @@ async def retrieve(
     return APIResponse(data=notification)
 
 
+@notif_route.put('/read_all')
+@permissions(permission_level=Permissions.CLIENT)
+async def read_all(
+    user: current_user,
+    notificationServices: get_notification_service = Depends(get_notification_service),
+) -> APIResponse:
+    result = await notificationServices.mark_all_read(user.id)
+    return APIResponse(data={'marked': result})
+
+
 @notif_route.put('/{notification_id}')
 @permissions(permission_level=Permissions.CLIENT, service=ServiceKeys.NOTIFICATION)
 async def update(
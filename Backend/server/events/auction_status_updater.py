@@ -1,6 +1,6 @@
 import asyncio
 import logging
-from datetime import datetime, timezone
+from datetime import timedelta
 from server.utils.datetime_utils import now_utc
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from sqlalchemy import select
@@ -12,6 +12,11 @@ from ..models.payment import Payments
 from ..config.database import app_configs, _async_url
 from ..enums.auction_enums import AuctionStatus
 from ..enums.payment_enums import PaymentStatus
+from ..utils.order_book import order_book
+from ..utils.auction_schedule import auction_schedule, ACTIVATE
+from ..utils.trending import trending
+from ..utils.watchers import watcher_index
+from ..utils.cache import cache, AUCTION_UPDATED, BID_PLACED
 from ..services import (
     AuctionServices,
     DBAdaptor,
@@ -46,46 +51,115 @@ logger = logging.getLogger(__name__)
 # Scheduler instance
 scheduler = AsyncIOScheduler()
 
-async def update_status(auctionServices: AuctionServices):
+async def sync_schedule():
+    """
+    Safety net for the lifecycle queue: (re)registers every auction whose
+    next transition falls within the horizon, straight from Postgres. Covers
+    registrations lost to a Redis flush or a crash between claim and commit.
+    """
+    session: AsyncSession = SessionLocal()
+    try:
+        horizon = now_utc() + timedelta(seconds=app_configs.SCHEDULE_HORIZON)
+        rows = (await session.execute(
+            select(
+                Auctions.id, Auctions.status, Auctions.private,
+                Auctions.start_date, Auctions.end_date,
+            ).filter(
+                (Auctions.status == AuctionStatus.PENDING) & (Auctions.start_date <= horizon) |
+                (Auctions.status == AuctionStatus.ACTIVE) & (Auctions.end_date <= horizon)
+            )
+        )).all()
+        for row in rows:
+            await auction_schedule.schedule(row)
+            await trending.sync(row)
+        if rows:
+            logger.info(f"🔄 Synced {len(rows)} auction deadline(s)")
+    except Exception as e:
+        logger.error(f"Error syncing schedule: {e}")
+    finally:
+        await session.close()
+
+
+async def run_transition(auctionServices: AuctionServices, action: str, auction_id: str):
+    """
+    Runs one due transition in its own transaction. The row is taken with
+    SKIP LOCKED and re-checked against its deadline, so a replica that
+    lost the race, or an auction rescheduled since, is simply skipped.
+    """
     session: AsyncSession = SessionLocal()
     try:
-        update = False
-        # Query events where the status needs updating
         _now = now_utc()
-        events = (await session.execute(
-            select(Auctions).filter(
-                (Auctions.status == AuctionStatus.PENDING) & (Auctions.start_date <= _now) |
-                (Auctions.status == AuctionStatus.ACTIVE) & (Auctions.end_date <= _now)
-            ).with_for_update()
-        )).scalars().all()
+        stmt = select(Auctions).filter(Auctions.id == auction_id)
+        if action == ACTIVATE:
+            stmt = stmt.filter(
+                Auctions.status == AuctionStatus.PENDING, Auctions.start_date <= _now
+            )
+        else:
+            stmt = stmt.filter(
+                Auctions.status == AuctionStatus.ACTIVE, Auctions.end_date <= _now
+            )
+        event = (await session.execute(
+            stmt.with_for_update(skip_locked=True)
+        )).scalars().first()
+        if not event:
+            return
 
-        for event in events:
-            current_time = datetime.now(timezone.utc)
-            if event.status == AuctionStatus.PENDING and current_time >= event.start_date:
-                logger.info(f"♻ Updating status for event {event.id} to {AuctionStatus.ACTIVE}")
-                event.status = AuctionStatus.ACTIVE
-                logger.info('✅ Event status updated')
-                update = True
-            elif event.status == AuctionStatus.ACTIVE and current_time >= event.end_date:
-                logger.info(f"♻ Updating status for event {event.id} to {AuctionStatus.COMPLETED}")
-                await auctionServices.close(event.id, db=session)
-                logger.info('✅ Event status updated')
-                update = True
-
-        # Commit changes
-        if update:
+        if action == ACTIVATE:
+            logger.info(f"♻ Updating status for event {event.id} to {AuctionStatus.ACTIVE}")
+            event.status = AuctionStatus.ACTIVE
             await session.commit()
-            logger.info("🔄 Status updated successfully")
-
+            # A bid tried while the auction was pending seeded a book with
+            # the old status; drop it so the next bid reseeds as ACTIVE.
+            await order_book.drop(auction_id)
+            await auction_schedule.schedule(event)
+            await trending.sync(event)
+            await cache.emit(AUCTION_UPDATED, auction_id=auction_id)
+        else:
+            logger.info(f"♻ Updating status for event {event.id} to {AuctionStatus.COMPLETED}")
+            await auctionServices.close(event.id, db=session)
+            await session.commit()
+            await cache.emit(AUCTION_UPDATED, auction_id=auction_id)
+        logger.info('✅ Event status updated')
     except Exception as e:
-        logger.error(f"Error updating status: {e}")
+        await session.rollback()
+        logger.error(f"Error running {action} for auction {auction_id}: {e}")
+        # Retry later instead of blocking the rest of the queue.
+        await auction_schedule.add(
+            action, auction_id,
+            now_utc() + timedelta(seconds=app_configs.SCHEDULE_RETRY_DELAY),
+        )
     finally:
         await session.close()
 
 
+async def run_schedule(auctionServices: AuctionServices):
+    """
+    Sleeps until the earliest queued deadline and fires what is due.
+    Transitions run one at a time per process: the shared AuctionServices
+    re-attaches its repos to each transition's session.
+    """
+    while True:
+        try:
+            due = await auction_schedule.claim()
+            for action, auction_id in due:
+                await run_transition(auctionServices, action, auction_id)
+            if due:
+                continue
+            next_due = await auction_schedule.next_due()
+            delay = app_configs.SCHEDULE_MAX_SLEEP
+            if next_due is not None:
+                delay = min(max(next_due - now_utc().timestamp(), 0), delay)
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error running schedule: {e}")
+            await asyncio.sleep(1)
+
+
 async def process_intra_payment(auctionServices: AuctionServices):
     session: AsyncSession = SessionLocal()
-    update = False
+    updated = []
 
     try:
         current_time = now_utc()
@@ -106,7 +180,7 @@ async def process_intra_payment(auctionServices: AuctionServices):
                 event.auction_id, event.from_id, db=session
             )
             logger.info('✅ Payment finalized')
-            update = True
+            updated.append(event.auction_id)
 
         # Auto-confirm REFUNDING payments the seller has not responded to within the deadline
         refund_events = (await session.execute(
@@ -122,16 +196,68 @@ async def process_intra_payment(auctionServices: AuctionServices):
             )
             await auctionServices.auto_complete_refund(event.auction_id, db=session)
             logger.info('✅ Refund auto-confirmed')
-            update = True
+            updated.append(event.auction_id)
 
-        if update:
+        if updated:
             await session.commit()
+            for auction_id in updated:
+                await cache.emit(AUCTION_UPDATED, auction_id=auction_id)
             logger.info("🔄 Payment status updated successfully")
     except Exception as e:
         logger.error(f"Error processing intra payment: {e}")
     finally:
         await session.close()
 
+async def reconcile_notification_counts(notif_service: UserNotificationServices):
+    """Repairs drift of the cached notification counters."""
+    session: AsyncSession = SessionLocal()
+    try:
+        notif_service.repo.attachDB(session)
+        checked = await notif_service.reconcile_counts()
+        if checked:
+            logger.info(f"🔄 Reconciled {checked} notification counter(s)")
+    except Exception as e:
+        logger.error(f"Error reconciling notification counts: {e}")
+    finally:
+        await session.close()
+
+
+async def flush_order_books():
+    """Writes the order books' latest prices back to `auctions`."""
+    session: AsyncSession = SessionLocal()
+    try:
+        flushed = await order_book.flush(session)
+        if flushed:
+            try:
+                await session.commit()
+            except Exception:
+                await order_book.mark_dirty(flushed)
+                raise
+            for auction_id in flushed:
+                await cache.emit(BID_PLACED, auction_id=auction_id)
+            logger.info(f"🔄 Flushed {len(flushed)} order book price(s)")
+    except Exception as e:
+        logger.error(f"Error flushing order books: {e}")
+    finally:
+        await session.close()
+
+async def flush_watchers():
+    """Writes the auctions' watcher counts back to `auctions`."""
+    session: AsyncSession = SessionLocal()
+    try:
+        flushed = await watcher_index.flush(session)
+        if flushed:
+            try:
+                await session.commit()
+            except Exception:
+                await watcher_index.mark_dirty(flushed)
+                raise
+            logger.info(f"🔄 Flushed {len(flushed)} watcher count(s)")
+    except Exception as e:
+        logger.error(f"Error flushing watcher counts: {e}")
+    finally:
+        await session.close()
+
 # Keep the script running
 async def main():
     # Services and Repos
@@ -155,10 +281,9 @@ async def main():
     )
 
     scheduler.add_job(
-        update_status,
+        sync_schedule,
         'interval',
-        seconds=15,
-        args=[auction_service]
+        seconds=app_configs.SCHEDULE_SYNC_INTERVAL,
     )
     scheduler.add_job(
         process_intra_payment,
@@ -166,13 +291,33 @@ async def main():
         seconds=30,
         args=[auction_service]
     )
+    scheduler.add_job(
+        reconcile_notification_counts,
+        'interval',
+        seconds=app_configs.NOTIF_COUNT_RECONCILE_INTERVAL,
+        # Own instance: close() re-attaches the shared one to its session
+        args=[UserNotificationServices(factory.notif_repo())]
+    )
+    scheduler.add_job(
+        flush_order_books,
+        'interval',
+        seconds=app_configs.ORDER_BOOK_FLUSH_INTERVAL,
+    )
+    scheduler.add_job(
+        flush_watchers,
+        'interval',
+        seconds=app_configs.WATCHERS_FLUSH_INTERVAL,
+    )
     scheduler.start()
+    await sync_schedule()
+    lifecycle = asyncio.create_task(run_schedule(auction_service))
 
     try:
         logger.info("⏳ Scheduler started. Press Ctrl+C to exit.")
         while True:
             await asyncio.sleep(1)
     except (KeyboardInterrupt, SystemExit):
+        lifecycle.cancel()
         scheduler.shutdown()
         logger.info("❌ Scheduler stopped")
 
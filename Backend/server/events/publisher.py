@@ -6,18 +6,29 @@ from enum import Enum as PyEnum
 from uuid import UUID as PyUUID
 
 from sqlalchemy import UUID as SAUUID, Enum as SAEnum
-from server.config import redis_store
+from server.config import redis_store, app_configs
 from server.models.base import BaseModel
 
 
 UUIDType = Union[PyUUID, SAUUID]
 EnumType = Union[PyEnum, SAEnum]
 
+# Events are appended to one Redis Stream and consumed by the subscriber
+# processes as a consumer group, so nothing is lost while they are down.
+EVENTS_STREAM = 'events'
+EVENTS_GROUP = 'subscribers'
+DEAD_LETTER_STREAM = 'events:dead'
+
 
 async def local_publish(channel: str, data: dict[str, any]):
     redis = await redis_store.get_async_redis()
     payload = json.dumps(data)
-    await redis.publish(channel, payload)
+    await redis.xadd(
+        EVENTS_STREAM,
+        {'channel': channel, 'data': payload},
+        maxlen=app_configs.EVENTS_STREAM_MAXLEN,
+        approximate=True,
+    )
 
 
 async def dump_data(data: str | dict[str, any]) -> dict[str, any]:
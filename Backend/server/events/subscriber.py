@@ -1,8 +1,16 @@
 import logging
-from asyncio import run, sleep
+import os
+import socket
+from asyncio import run, sleep, gather, Semaphore
 import json
+from redis.exceptions import ResponseError
 from server.config import redis_store, app_configs
+from server.events.publisher import (
+    EVENTS_STREAM, EVENTS_GROUP, DEAD_LETTER_STREAM
+)
 from server.utils.email_context import Emailer
+from server.utils.mail_dispatcher import mail_dispatcher
+from server.utils.template_registry import templates
 from server.services.misc_service import ContactUsService
 
 # Configure logging
@@ -44,7 +52,6 @@ async def send_bid_placed_mail(data):
         reply_to="support@biddius.com",
     ) as emailer:
         await emailer.send_message()
-    await sleep(0.5)
     logging.info(f'♻ Type: {type(data)} -- {data}')
     logging.info('➡ sent ✅')
 
@@ -79,7 +86,6 @@ async def send_outbid_mail(data):
         reply_to="support@biddius.com",
     ) as emailer:
         await emailer.send_message()
-    await sleep(0.5)
     logging.info(f'♻ Type: {type(data)} -- {data}')
     logging.info('➡ sent ✅')
 
@@ -109,7 +115,6 @@ async def send_auction_created_mail(data):
         reply_to="support@biddius.com",
     ) as emailer:
         await emailer.send_message()
-    await sleep(0.5)
     logging.info(f'♻ Type: {type(data)} -- {data}')
     logging.info('➡ sent ✅')
 
@@ -128,7 +133,6 @@ async def send_win_auction_mail(data):
         reply_to="support@biddius.com",
     ) as emailer:
         await emailer.send_message()
-    await sleep(0.5)
     logging.info(f'♻ Type: {type(data)} -- {data}')
     logging.info('➡ sent ✅')
 
@@ -160,7 +164,6 @@ async def send_part_invite_mail(data):
         reply_to="support@biddius.com",
     ) as emailer:
         await emailer.send_message()
-    await sleep(0.5)
     logging.info(f'♻ Type: {type(data)} -- {data}')
     logging.info('➡ sent ✅')
 
@@ -181,7 +184,6 @@ async def send_fund_account_mail(data):
         reply_to="support@biddius.com",
     ) as emailer:
         await emailer.send_message()
-    await sleep(0.5)
     logging.info(f'♻ Type: {type(data)} -- {data}')
     logging.info('➡ sent ✅')
 
@@ -202,7 +204,6 @@ async def send_withdrawal_mail(data):
         reply_to="support@biddius.com",
     ) as emailer:
         await emailer.send_message()
-    await sleep(0.5)
     logging.info(f'♻ Type: {type(data)} -- {data}')
     logging.info('➡ sent ✅')
 
@@ -210,7 +211,6 @@ async def send_withdrawal_mail(data):
 async def send_contact_us_mail(data):
     logging.info('📨 Sending Contact Us mail 📫')
     await ContactUsService.contact_us(data)
-    await sleep(0.5)
     logging.info('➡ sent ✅')
 
 
@@ -218,18 +218,35 @@ MAX_ATTEMPTS = 3
 BASE_BACKOFF = 2  # seconds, doubles each retry (2, 4, 8...)
 
 
-async def execute_with_retry(task, data, channel):
+async def dead_letter(channel, data: str, error, attempts: int, msg_id: str = None):
+    redis = await redis_store.get_async_redis()
+    await redis.xadd(
+        DEAD_LETTER_STREAM,
+        {
+            'channel': channel or '',
+            'data': data or '',
+            'error': str(error),
+            'attempts': attempts,
+            'source_id': msg_id or '',
+        },
+        maxlen=app_configs.EVENTS_STREAM_MAXLEN,
+        approximate=True,
+    )
+
+
+async def execute_with_retry(task, data, channel, msg_id: str = None) -> bool:
     for attempt in range(1, MAX_ATTEMPTS + 1):
         try:
             await task(data)
-            return
+            return True
         except Exception as e:
             if attempt >= MAX_ATTEMPTS:
                 logging.error(
                     f"💀 Dead letter: channel={channel} failed after "
                     f"{MAX_ATTEMPTS} attempts. Last error: {e}"
                 )
-                return
+                await dead_letter(channel, json.dumps(data), e, MAX_ATTEMPTS, msg_id)
+                return False
             backoff = BASE_BACKOFF**attempt
             logging.warning(
                 f"⚠ Attempt {attempt}/{MAX_ATTEMPTS} failed for channel={channel}, "
@@ -254,21 +271,105 @@ channels = {
 }
 
 
+CONSUMER = f'{socket.gethostname()}-{os.getpid()}'
+
+
+async def ensure_group(redis):
+    try:
+        await redis.xgroup_create(EVENTS_STREAM, EVENTS_GROUP, id='0', mkstream=True)
+    except ResponseError as e:
+        # BUSYGROUP: another subscriber created it first
+        if 'BUSYGROUP' not in str(e):
+            raise
+
+
+async def handle(redis, limit: Semaphore, msg_id: str, fields: dict):
+    """
+    Runs one event. The entry is acknowledged once it was handled or
+    dead-lettered; a crash before that leaves it pending for reclaim.
+    """
+    async with limit:
+        channel = fields.get("channel")
+        logging.info(f"➡ INFO: {msg_id} {channel}")
+        data = json.loads(fields.get("data"))
+        task = channels.get(channel)
+        if task is None:
+            logging.error(f"❌ No handler for channel={channel}")
+        else:
+            await execute_with_retry(task, data, channel, msg_id)
+        await redis.xack(EVENTS_STREAM, EVENTS_GROUP, msg_id)
+
+
+async def drop_poison(redis, entries: list) -> list:
+    """
+    Dead-letters and acknowledges reclaimed entries delivered
+    EVENTS_MAX_DELIVERIES times already: they keep killing whoever handles
+    them (bad payload, crash mid-handler) and would be reclaimed forever.
+    Returns the entries still worth handling.
+    """
+    pending = await redis.xpending_range(
+        EVENTS_STREAM, EVENTS_GROUP,
+        min=entries[0][0], max=entries[-1][0],
+        count=len(entries), consumername=CONSUMER,
+    )
+    delivered = {p['message_id']: p['times_delivered'] for p in pending}
+    keep = []
+    for msg_id, fields in entries:
+        times = delivered.get(msg_id, 0)
+        if times <= app_configs.EVENTS_MAX_DELIVERIES:
+            keep.append((msg_id, fields))
+            continue
+        logging.error(
+            f"💀 Dead letter: {msg_id} channel={fields.get('channel')} "
+            f"delivered {times} times"
+        )
+        await dead_letter(
+            fields.get('channel'), fields.get('data'),
+            'delivery limit reached', times, msg_id,
+        )
+        await redis.xack(EVENTS_STREAM, EVENTS_GROUP, msg_id)
+    return keep
+
+
+async def reclaim(redis, limit: Semaphore):
+    """Takes over entries left pending by a subscriber that died."""
+    _, entries, *_ = await redis.xautoclaim(
+        EVENTS_STREAM, EVENTS_GROUP, CONSUMER,
+        min_idle_time=app_configs.EVENTS_CLAIM_IDLE,
+        start_id='0-0',
+        count=app_configs.EVENTS_BATCH,
+    )
+    entries = [(msg_id, fields) for msg_id, fields in entries if fields]
+    if entries:
+        entries = await drop_poison(redis, entries)
+    if entries:
+        logging.info(f"♻ Reclaimed {len(entries)} pending event(s)")
+        await gather(*(handle(redis, limit, *entry) for entry in entries))
+
+
 async def listner():
-    redis = await redis_store.get_async_redis()
-    sub = redis.pubsub()
-    await sub.subscribe(*channels.keys())
+    # Dedicated connection: XREADGROUP blocks it while waiting
+    redis = await redis_store.get_pubsub_redis()
+    await ensure_group(redis)
+    # Handlers' Emailers now share a pool of persistent SMTP sessions
+    await mail_dispatcher.start()
+    logging.info(f"📄 Compiled {templates.load_all()} email templates")
+    limit = Semaphore(app_configs.EVENTS_CONCURRENCY)
+    await reclaim(redis, limit)
 
     while True:
         try:
-            message = await sub.get_message(ignore_subscribe_messages=True)
-            if message:
-                logging.info(f"➡ INFO: {message}")
-                channel = message.get("channel")
-                data = json.loads(message.get("data"))
-                task = channels.get(channel, "OTP-sender")
-                await execute_with_retry(task, data, channel)
-            await sleep(0.2)
+            response = await redis.xreadgroup(
+                EVENTS_GROUP, CONSUMER, {EVENTS_STREAM: '>'},
+                count=app_configs.EVENTS_BATCH,
+                block=app_configs.EVENTS_BLOCK,
+            )
+            if not response:
+                # Idle: good time to pick up other consumers' leftovers
+                await reclaim(redis, limit)
+                continue
+            for _, entries in response:
+                await gather(*(handle(redis, limit, *entry) for entry in entries))
         except Exception as e:
             logging.error(f"❌ Error processing message: {e}")
             await sleep(1)
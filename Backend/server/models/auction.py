@@ -2,10 +2,10 @@ from datetime import datetime, timezone
 from sqlalchemy import (
     JSON, UUID, Column, ForeignKey,
     Boolean, DateTime, Index, String,
-    Float, Integer
+    Float, Integer, func, select
 )
 from sqlalchemy.dialects.postgresql import ENUM
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import column_property, relationship
 from server.config.app_configs import app_configs
 from server.enums.auction_enums import AuctionStatus
 from server.models.base import BaseModel
@@ -60,6 +60,7 @@ class Auctions(BaseModel):
     # lazy="selectin": eagerly loaded so GetAuctionSchema.model_validate works
     # under async (no implicit lazy IO). The back-reference sides (Items.auction,
     # Bids.auction, Payments.auction, Chats.auction) stay lazy to avoid cycles.
+    # Reads narrow this per view through AuctionRepository's loader profiles.
     user = relationship('Users', back_populates='auctions', lazy='selectin')
     item = relationship(
         'Items', back_populates='auction',
@@ -105,4 +106,27 @@ class AuctionParticipants(BaseModel):
     def __init__(self, auction_id: str, participant_email: str):
         self.id = f'{auction_id}:{participant_email}'
         self.auction_id = auction_id
-        self.participant_email = participant_email
\ No newline at end of file
+        self.participant_email = participant_email
+
+
+# Bid and participant counts as correlated subqueries, for views that show
+# the counts without loading the collections (listing cards). Deferred:
+# only reads that undefer them (AuctionRepository's 'card' profile) pay.
+# Any other row must not have them read off the ORM object, which would
+# lazy-load them (MissingGreenlet under AsyncSession): validate it from
+# `to_dict()`, which holds only what was loaded. They can't be undeferred
+# in 'detail': `update` runs that profile on UPDATE ... RETURNING.
+Auctions.bids_count = column_property(
+    select(func.count(Bids.id))
+    .where(Bids.auction_id == Auctions.id)
+    .correlate_except(Bids)
+    .scalar_subquery(),
+    deferred=True,
+)
+Auctions.participants_count = column_property(
+    select(func.count(AuctionParticipants.id))
+    .where(AuctionParticipants.auction_id == Auctions.id)
+    .correlate_except(AuctionParticipants)
+    .scalar_subquery(),
+    deferred=True,
+)
@@ -4,13 +4,17 @@ from sqlalchemy import (
     Float, ForeignKey, Integer,
     String
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from server.config import Base
 from server.models.base import BaseModel
 from server.utils.helpers import (
     category_id_generator, sub_category_id_generator
 )
 
+# Text search configuration of Items.search_vector (and of its GIN index)
+SEARCH_CONFIG = "simple"
+
 # Many-to-many association tables (ondelete="CASCADE" handles DB-level cleanup)
 item_categories = Table(
     "item_categories",
@@ -53,6 +57,9 @@ class Items(BaseModel):
     height = Column(Float, nullable=True)
     width = Column(Float, nullable=True)
     length = Column(Float, nullable=True)
+    # Weighted name (A), description (B) and category names (C); kept
+    # current by ItemRepository.refresh_search. Deferred: only search reads it.
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
 
     # lazy="selectin": category_ids/sub_category_ids properties and GetItemSchema
     # read these, so they must be eager-loaded for async serialization.
@@ -0,0 +1,83 @@
+from sqlalchemy import BigInteger, Column, String, event, text
+
+from server.config import Base
+
+
+class StatRollups(Base):
+    """
+    Row counts of the admin dashboards, one row per (scope, bucket), kept
+    current by triggers in the same transaction as the counted rows.
+        auctions  bucket '<STATUS>:<private>', e.g. 'ACTIVE:false'
+        users     bucket '<ROLE>'
+    """
+    __tablename__ = 'stat_rollups'
+
+    scope = Column(String, primary_key=True)
+    bucket = Column(String, primary_key=True)
+    count = Column(BigInteger, nullable=False, default=0)
+
+
+# (scope, table, bucket expression over a row, columns that move a row)
+ROLLUPS = (
+    ('auctions', 'auctions', "{row}.status::text || ':' || {row}.private::text",
+     'status, private'),
+    ('users', 'users', '{row}.role::text', 'role'),
+)
+
+
+def rollup_ddl(schema: str) -> list[str]:
+    """Function, triggers and backfill that maintain `stat_rollups`."""
+    statements = [f"""
+        CREATE OR REPLACE FUNCTION {schema}.bump_stat_rollup(
+            _scope text, _bucket text, _delta bigint
+        ) RETURNS void AS $$
+            INSERT INTO {schema}.stat_rollups AS r (scope, bucket, count)
+            VALUES (_scope, _bucket, _delta)
+            ON CONFLICT (scope, bucket)
+            DO UPDATE SET count = r.count + excluded.count
+        $$ LANGUAGE sql
+    """]
+    for scope, table, bucket, columns in ROLLUPS:
+        old, new = bucket.format(row='OLD'), bucket.format(row='NEW')
+        statements += [
+            f"""
+            CREATE OR REPLACE FUNCTION {schema}.{table}_stat_rollup()
+            RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP <> 'INSERT' THEN
+                    PERFORM {schema}.bump_stat_rollup('{scope}', {old}, -1);
+                END IF;
+                IF TG_OP <> 'DELETE' THEN
+                    PERFORM {schema}.bump_stat_rollup('{scope}', {new}, 1);
+                END IF;
+                RETURN NULL;
+            END
+            $$ LANGUAGE plpgsql
+            """,
+            f"""
+            CREATE TRIGGER {table}_stat_rollup_rows
+            AFTER INSERT OR DELETE ON {schema}.{table}
+            FOR EACH ROW EXECUTE FUNCTION {schema}.{table}_stat_rollup()
+            """,
+            f"""
+            CREATE TRIGGER {table}_stat_rollup_moves
+            AFTER UPDATE OF {columns} ON {schema}.{table}
+            FOR EACH ROW WHEN ({old} IS DISTINCT FROM {new})
+            EXECUTE FUNCTION {schema}.{table}_stat_rollup()
+            """,
+            f"""
+            INSERT INTO {schema}.stat_rollups (scope, bucket, count)
+            SELECT '{scope}', {bucket.format(row=table)}, count(*)
+            FROM {schema}.{table} GROUP BY 2
+            """,
+        ]
+    return statements
+
+
+@event.listens_for(Base.metadata, 'after_create')
+def _install_rollups(metadata, connection, tables=(), **kw):
+    # init_db's create_all: installs the triggers along with the table
+    if StatRollups.__table__ not in tables:
+        return
+    for statement in rollup_ddl(StatRollups.__table__.schema):
+        connection.execute(text(statement))
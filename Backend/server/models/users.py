@@ -12,7 +12,7 @@ from sqlalchemy import (
 )
 from sqlalchemy.dialects.postgresql import ENUM, JSONB
 from sqlalchemy.orm import relationship
-from passlib.context import CryptContext
+from functools import lru_cache
 
 from server.config.app_configs import app_configs
 from server.models.base import BaseModel
@@ -23,6 +23,14 @@ from server.enums.user_enums import (
 )
 
 
+@lru_cache(maxsize=None)
+def pwd_context():
+    """Shared bcrypt context; passlib is imported on first use."""
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
 class Users(BaseModel):
     __tablename__ = 'users'
     __mapper_args__ = {'polymorphic_identity': 'users'}
@@ -143,8 +151,7 @@ class Users(BaseModel):
         return self.buyer_chats + self.seller_chats
 
     def _hash_password(self, password: str) -> str:
-        context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-        return context.hash(password)
+        return pwd_context().hash(password)
 
     def __str__(self):
         return f"Name: {self.username}, Email: {self.email}"
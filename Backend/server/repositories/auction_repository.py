@@ -1,17 +1,64 @@
 import math
 import uuid
 
-from sqlalchemy import select, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, func, literal_column
+from sqlalchemy.orm import selectinload, noload, undefer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from server.models.auction import Auctions, AuctionParticipants
 from server.models.bids import Bids
-from server.models.items import Items, Categories, Subcategory
+from server.models.items import Items, Categories, Subcategory, SEARCH_CONFIG
 from server.repositories.repository import Repository, no_db_error
+from server.repositories.item_repository import search_refresh_stmt
 from server.enums.auction_enums import AuctionStatus
 from server.schemas import PagedResponse
-from server.utils import paginator
+from server.utils import paginator, prefix_tsquery
+
+
+# count() keys of each status
+STATUS_COUNTS = {
+    AuctionStatus.ACTIVE: 'active',
+    AuctionStatus.COMPLETED: 'completed',
+    AuctionStatus.CANCLED: 'cancelled',
+    AuctionStatus.PENDING: 'pending',
+}
+
+# Every Auctions relationship defaults to lazy="selectin". Each profile
+# states what its view serializes; the rest is noload-ed (empty / None).
+AUCTION_PROFILES = {
+    # Listing cards: the auction, its item and seller, plus the bid and
+    # participant counts selected with the auction row
+    'card': lambda: (
+        selectinload(Auctions.item),
+        selectinload(Auctions.user),
+        undefer(Auctions.bids_count),
+        undefer(Auctions.participants_count),
+        noload('*'),
+    ),
+    # Auction page: everything GetAuctionSchema renders; the bids there
+    # need neither their bidder nor their (already loaded) auction.
+    'detail': lambda: (
+        selectinload(Auctions.item),
+        selectinload(Auctions.user),
+        selectinload(Auctions.participants),
+        selectinload(Auctions.bids).options(
+            noload(Bids.auction), noload(Bids.user)
+        ),
+        selectinload(Auctions.payment),
+        selectinload(Auctions.chat),
+    ),
+    # Bid placement and watcher updates only read the auction's columns
+    'bid': lambda: (
+        noload('*'),
+    ),
+    # Closing settles the bids: amounts and bidder ids, no users
+    'close': lambda: (
+        selectinload(Auctions.bids).options(
+            noload(Bids.auction), noload(Bids.user)
+        ),
+        noload('*'),
+    ),
+}
 
 
 class AuctionParticipantRepository(Repository):
@@ -22,6 +69,8 @@ class AuctionParticipantRepository(Repository):
 
 
 class AuctionRepository(Repository):
+    profiles = AUCTION_PROFILES
+
     def __init__(self, auction_participant: AuctionParticipantRepository, db: AsyncSession = None):
         super().__init__(Auctions)
         if db:
@@ -37,14 +86,18 @@ class AuctionRepository(Repository):
             raise e
 
     async def get_with_bids(
-        self, auction_id: str, with_parent: bool = True, for_update: bool = False
+        self,
+        auction_id: str,
+        with_parent: bool = True,
+        for_update: bool = False,
+        profile: str = 'close',
     ):
         try:
-            stmt = (
+            stmt = self.with_profile(
                 select(Auctions)
                 .where(Auctions.id == auction_id)
-                .options(selectinload(Auctions.bids).selectinload(Bids.user))
-                .execution_options(populate_existing=True)
+                .execution_options(populate_existing=True),
+                profile
             )
             if for_update:
                 stmt = stmt.with_for_update()
@@ -56,6 +109,41 @@ class AuctionRepository(Repository):
         except Exception as e:
             raise e
 
+    async def get_order_book_seed(self, auction_id: str):
+        """Column-only snapshot used to seed the Redis order book."""
+        try:
+            result = await self.db.execute(
+                select(
+                    Auctions.id,
+                    Auctions.status,
+                    Auctions.end_date,
+                    Auctions.users_id,
+                    Auctions.private,
+                    Auctions.current_price,
+                    Auctions.buy_now,
+                    Auctions.buy_now_price,
+                ).where(Auctions.id == auction_id)
+            )
+            auction = result.mappings().first()
+            if not auction:
+                return None
+            result = await self.db.execute(
+                select(Bids.user_id, Bids.amount)
+                .where(Bids.auction_id == auction_id)
+                .order_by(Bids.amount.desc())
+                .limit(1)
+            )
+            top = result.first()
+            snapshot = dict(auction)
+            snapshot['high_bidder'] = top.user_id if top else None
+            snapshot['high_bid'] = top.amount if top else 0.0
+            snapshot['current_price'] = max(
+                snapshot['current_price'] or 0.0, snapshot['high_bid'] or 0.0
+            )
+            return snapshot
+        except Exception as e:
+            raise e
+
     @staticmethod
     def queryToFloatList(input: str):
         if not input:
@@ -73,12 +161,15 @@ class AuctionRepository(Repository):
         self,
         filter_ = None,
         relative = False,
-        sort = 'watchers_count'
+        sort = 'watchers_count',
+        profile = 'card',
     ):
         filter_ = filter_.copy() if filter_ else {}
 
         page = filter_.pop('page', 1)
         per_page = filter_.pop('per_page', 10)
+        cursor = filter_.pop('cursor', None)
+        with_total = filter_.pop('with_total', False)
         cat_id = filter_.pop('category_id', None)
         subcat_id = filter_.pop('sub_category_id', None)
 
@@ -91,15 +182,12 @@ class AuctionRepository(Repository):
         QueryModel: Auctions = Auctions
 
         try:
-            stmt = select(QueryModel)
+            stmt = self.with_profile(select(QueryModel), profile)
 
             for key, value in filter_.items():
                 if hasattr(QueryModel, key):
                     stmt = stmt.filter(getattr(QueryModel, key) == value)
 
-            if hasattr(QueryModel, sort):
-                stmt = stmt.order_by(getattr(QueryModel, sort).desc())
-
             if cat_id:
                 stmt = stmt.filter(
                     QueryModel.item.any(Items.categories.any(Categories.id == cat_id))
@@ -125,6 +213,14 @@ class AuctionRepository(Repository):
                     QueryModel.buy_now_price <= buy_now_price[1]
                 )
 
+            if cursor is not None:
+                return await self.keyset_page(
+                    stmt, getattr(QueryModel, sort, QueryModel.created_at),
+                    QueryModel.id, 'desc', cursor, limit, with_total
+                )
+            if hasattr(QueryModel, sort):
+                stmt = stmt.order_by(getattr(QueryModel, sort).desc())
+
             total = (await self.db.execute(
                 select(func.count()).select_from(stmt.subquery())
             )).scalar() or 0
@@ -146,30 +242,83 @@ class AuctionRepository(Repository):
         )
 
     @no_db_error
-    async def search(self, filter_: dict | None = None):
+    async def get_cards(self, ids: list) -> list[Auctions]:
+        """Auctions `ids` as listing cards, in no particular order."""
+        stmt = self.with_profile(
+            select(Auctions).filter(Auctions.id.in_(ids)), 'card'
+        )
+        return (await self.db.execute(stmt)).scalars().all()
+
+    @no_db_error
+    async def trending_seed(self, since) -> list[tuple]:
+        """
+        `(id, end_date, watchers_count, bids since `since`)` of every
+        public ACTIVE auction, to build the trending set from.
+        """
+        recent = (
+            select(func.count())
+            .where(Bids.auction_id == Auctions.id, Bids.created_at >= since)
+            .correlate(Auctions)
+            .scalar_subquery()
+        )
+        return (await self.db.execute(
+            select(
+                Auctions.id, Auctions.end_date, Auctions.watchers_count, recent
+            ).filter(
+                Auctions.status == AuctionStatus.ACTIVE,
+                Auctions.private == False,
+            )
+        )).all()
+
+    @no_db_error
+    async def search(self, filter_: dict | None = None, profile: str = 'card'):
         filter_ = filter_.copy() if filter_ else {}
         page = filter_.pop("page", 1)
         per_page = filter_.pop("per_page", 10)
+        cursor = filter_.pop("cursor", None)
+        with_total = filter_.pop("with_total", False)
 
         limit = per_page
         offset = paginator(page, per_page)
         QueryModel = Auctions
 
         try:
-            search_term = filter_.get("q", "").strip()
-            stmt = select(QueryModel)
+            query = prefix_tsquery(filter_.get("q"))
+            stmt = self.with_profile(select(QueryModel), profile)
+            rank = None
 
-            if search_term:
-                stmt = stmt.filter(
-                    QueryModel.item.any(
-                        (Items.name.ilike(f"%{search_term}%")) |
-                        (Items.description.ilike(f"%{search_term}%"))
+            if query:
+                # Served by the GIN index on items.search_vector
+                tsquery = func.to_tsquery(
+                    literal_column(f"'{SEARCH_CONFIG}'::regconfig"), query
+                )
+                ranked = (
+                    select(
+                        Items.auction_id.label("auction_id"),
+                        func.max(
+                            func.ts_rank_cd(Items.search_vector, tsquery)
+                        ).label("rank"),
                     )
+                    .filter(Items.search_vector.op("@@")(tsquery))
+                    .group_by(Items.auction_id)
+                    .subquery()
                 )
+                stmt = stmt.join(ranked, ranked.c.auction_id == QueryModel.id)
+                rank = ranked.c.rank
 
+            if cursor is not None:
+                # Keyset pages follow recency; ranking needs offset mode
+                return await self.keyset_page(
+                    stmt, QueryModel.created_at, QueryModel.id,
+                    'desc', cursor, limit, with_total
+                )
             total = (await self.db.execute(
                 select(func.count()).select_from(stmt.subquery())
             )).scalar() or 0
+            if rank is not None:
+                stmt = stmt.order_by(rank.desc(), QueryModel.created_at.desc())
+            else:
+                stmt = stmt.order_by(QueryModel.created_at.desc())
             results = (await self.db.execute(
                 stmt.limit(limit).offset(offset)
             )).scalars().all()
@@ -189,35 +338,46 @@ class AuctionRepository(Repository):
         )
 
     @no_db_error
-    async def count(self) -> dict[str, int]:
-        async def _count(**flt) -> int:
-            stmt = select(func.count()).select_from(self._Model)
-            if flt:
-                stmt = select(func.count()).select_from(
-                    select(self._Model).filter_by(**flt).subquery()
-                )
-            return (await self.db.execute(stmt)).scalar() or 0
+    async def refresh_search(self, auction_id, commit: bool = True):
+        """Recomputes the search vector of the auction's items."""
+        try:
+            await self.db.flush()
+            await self.db.execute(
+                search_refresh_stmt(Items.auction_id == auction_id)
+            )
+            if commit:
+                await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            raise e
 
+    @no_db_error
+    async def count(self, exact: bool = False) -> dict[str, int]:
+        """
+        Auctions by status, plus private ones. Read from the trigger-kept
+        `stat_rollups` rows; `exact=True` recounts the table instead, in
+        one grouped pass.
+        """
         try:
-            total = await _count()
-            if total == 0:
-                return {
-                    'total': 0, 'active': 0, 'completed': 0,
-                    'cancelled': 0, 'pending': 0, 'private': 0
-                }
-            active = await _count(status=AuctionStatus.ACTIVE)
-            completed = await _count(status=AuctionStatus.COMPLETED)
-            cancelled = await _count(status=AuctionStatus.CANCLED)
-            pending = await _count(status=AuctionStatus.PENDING)
-            private = await _count(private=True)
-            return {
-                'total': total,
-                'active': active,
-                'completed': completed,
-                'cancelled': cancelled,
-                'pending': pending,
-                'private': private
-            }
+            if exact:
+                rows = (await self.db.execute(
+                    select(Auctions.status, Auctions.private, func.count())
+                    .group_by(Auctions.status, Auctions.private)
+                )).all()
+            else:
+                rows = []
+                for bucket, count in (await self.rollup('auctions')).items():
+                    status, _, private = bucket.partition(':')
+                    rows.append((AuctionStatus[status], private == 'true', count))
+            counts = dict.fromkeys(
+                ('total', *STATUS_COUNTS.values(), 'private'), 0
+            )
+            for status, private, count in rows:
+                counts['total'] += count
+                counts[STATUS_COUNTS[status]] += count
+                if private:
+                    counts['private'] += count
+            return counts
         except Exception as e:
             print(f"Error in count: {e}")
             raise e
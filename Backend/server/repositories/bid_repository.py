@@ -1,13 +1,20 @@
-from sqlalchemy import select, update as sa_update
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload, noload
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from server.repositories.repository import Repository, no_db_error
 from server.models.bids import Bids
 from server.schemas.bid_schema import GetBidSchema
-from server.middlewares.exception_handler import ExcRaiser404
 
 
 class BidRepository(Repository):
+    # Bids.auction and Bids.user default to lazy="selectin"; the auction
+    # would in turn pull every relationship of Auctions.
+    profiles = {
+        'list': lambda: (noload(Bids.auction), selectinload(Bids.user)),
+        'row': lambda: (noload('*'),),
+    }
+
     def __init__(self, db: AsyncSession = None):
         super().__init__(Bids)
         if db:
@@ -27,21 +34,16 @@ class BidRepository(Repository):
             data: dict = None,
             commit: bool = True,
         ) -> GetBidSchema:
-        """Updates entity"""
-        try:
-            await self.db.execute(
-                sa_update(self._Model)
-                .where(self._Model.id == entity.id)
-                .values(**data)
-                .execution_options(synchronize_session="fetch")
-            )
-            if commit:
-                await self.db.commit()
-            else:
-                await self.db.flush()
-            return (await self.db.execute(
-                select(self._Model).filter_by(id=entity.id)
-            )).scalars().first()
-        except Exception as e:
-            await self.db.rollback()
-            raise e
+        """Updates entity, see `Repository.update`"""
+        return (await super().update(entity, data, commit))[0]
+
+    @no_db_error
+    async def leaderboard(self, auction_id) -> list[Bids]:
+        """Every bid of an auction (one per bidder), highest first."""
+        stmt = self.with_profile(
+            select(Bids)
+            .where(Bids.auction_id == auction_id)
+            .order_by(Bids.amount.desc()),
+            'list',
+        )
+        return (await self.db.execute(stmt)).scalars().all()
@@ -1,11 +1,57 @@
-from sqlalchemy import UUID, select, func
+from sqlalchemy import UUID, select, func, update as sa_update, literal_column
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from server.repositories.repository import Repository, no_db_error
-from server.models.items import Items, Categories, Subcategory
+from server.models.items import (
+    Items, Categories, Subcategory,
+    item_categories, item_subcategories, SEARCH_CONFIG,
+)
 from server.schemas import GetItemSchema
 from server.middlewares.exception_handler import ExcRaiser404
 
+
+def search_refresh_stmt(*criteria):
+    """
+    UPDATE recomputing Items.search_vector for the rows matching
+    `criteria`: name (A), description (B), category and subcategory
+    names (C).
+    """
+    config = literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+
+    def weighted(text, weight: str):
+        return func.setweight(
+            func.to_tsvector(config, func.coalesce(text, '')), weight
+        )
+
+    category_names = (
+        select(func.string_agg(Categories.name, ' '))
+        .join(item_categories, item_categories.c.category_id == Categories.id)
+        .where(item_categories.c.item_id == Items.id)
+        .scalar_subquery()
+    )
+    subcategory_names = (
+        select(func.string_agg(Subcategory.name, ' '))
+        .join(
+            item_subcategories,
+            item_subcategories.c.sub_category_id == Subcategory.id
+        )
+        .where(item_subcategories.c.item_id == Items.id)
+        .scalar_subquery()
+    )
+    return (
+        sa_update(Items)
+        .where(*criteria)
+        .values(search_vector=(
+            weighted(Items.name, 'A')
+            .op('||')(weighted(Items.description, 'B'))
+            .op('||')(weighted(
+                func.concat_ws(' ', category_names, subcategory_names), 'C'
+            ))
+        ))
+        .execution_options(synchronize_session=False)
+    )
+
+
 class ItemRepository(Repository):
     def __init__(self, db: AsyncSession = None):
         super().__init__(Items)
@@ -30,6 +76,7 @@ class ItemRepository(Repository):
                     select(Subcategory).filter(Subcategory.id.in_(sub_category_ids))
                 )).scalars().all()
 
+            await self.refresh_search([new_item.id], commit=False)
             await self.db.commit()
             await self.db.refresh(new_item)
             return new_item
@@ -62,6 +109,11 @@ class ItemRepository(Repository):
                     select(Subcategory).filter(Subcategory.id.in_(sub_category_ids))
                 )).scalars().all()
 
+            if (
+                (data and ('name' in data or 'description' in data))
+                or category_ids is not None or sub_category_ids is not None
+            ):
+                await self.refresh_search([item.id], commit=False)
             await self.db.commit()
             await self.db.refresh(item)
             return [item]
@@ -69,6 +121,18 @@ class ItemRepository(Repository):
             await self.db.rollback()
             raise e
 
+    @no_db_error
+    async def refresh_search(self, item_ids: list, commit: bool = True):
+        """Recomputes the search vector of `item_ids` (flushes first)."""
+        try:
+            await self.db.flush()
+            await self.db.execute(search_refresh_stmt(Items.id.in_(item_ids)))
+            if commit:
+                await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            raise e
+
     @no_db_error
     async def get_by_seller_id(
             self, id: str|UUID, schema_mode: bool = False
@@ -1,13 +1,14 @@
 import math
-from typing import Any, Union
-from functools import wraps
+from typing import Any, Callable, Union
+from functools import cache, wraps
 
-from sqlalchemy import select, update as sa_update, func
+from sqlalchemy import select, update as sa_update, func, tuple_, literal
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from server.config.app_configs import app_configs
 from server.models.base import BaseModel
 from server.models.users import Users
+from server.models.stats import StatRollups
 from server.schemas import (
     GetUserSchema, GetCategorySchema,
     GetSubCategorySchema, GetItemSchema,
@@ -15,9 +16,9 @@ from server.schemas import (
     GetBidSchema
 )
 from server.middlewares.exception_handler import (
-    ExcRaiser, ExcRaiser404, ExcRaiser500
+    ExcRaiser, ExcRaiser400, ExcRaiser404, ExcRaiser500
 )
-from server.utils.helpers import paginator
+from server.utils.helpers import paginator, encode_cursor, decode_cursor
 from server.utils.ex_inspect import ExtInspect
 
 
@@ -42,14 +43,31 @@ def no_db_error(func):
     return wrapper
 
 
+@cache
+def _loader_options(repo: type, profile: str) -> tuple:
+    return repo.profiles[profile]()
+
+
 class Repository:
     """Store Access (async)"""
     db: AsyncSession = None
+    # Named loader profiles: profile name -> function returning the loader
+    # options. A read that names a profile loads only the relationships
+    # that view serializes. Functions because building loader options
+    # configures the mappers, which must wait until every model is imported.
+    profiles: dict[str, Callable[[], tuple]] = {}
+
     def __init__(self, model: BaseModel):
         self._Model = model
         self._inspect = ExtInspect(self.__class__.__name__)
         self.configs = app_configs
 
+    def with_profile(self, stmt, profile: str = None):
+        """Applies the loader profile `profile` (None keeps model defaults)."""
+        if profile is None:
+            return stmt
+        return stmt.options(*_loader_options(type(self), profile))
+
     def attachDB(self, db: AsyncSession):
         """Attach database session to the repository"""
         self.db = db
@@ -100,7 +118,9 @@ class Repository:
             raise e
 
     @no_db_error
-    async def get_by_id(self, id: str, for_update: bool = False):
+    async def get_by_id(
+        self, id: str, for_update: bool = False, profile: str = None
+    ):
         """
         `for_update=True` issues `SELECT ... FOR UPDATE`, taking a row lock
         that is held until the current transaction commits or rolls back.
@@ -108,10 +128,11 @@ class Repository:
         placement) against the same row.
         """
         try:
-            stmt = (
+            stmt = self.with_profile(
                 select(self._Model)
                 .filter(self._Model.id == id)
-                .order_by(self._Model.id)
+                .order_by(self._Model.id),
+                profile
             )
             if for_update:
                 stmt = stmt.with_for_update()
@@ -138,40 +159,47 @@ class Repository:
                 raise e
             raise e
 
+    def update_stmt(self, id, data: dict, profile: str = None):
+        """The `UPDATE ... RETURNING` statement `update` runs."""
+        stmt = (
+            sa_update(self._Model)
+            .where(self._Model.id == id)
+            .values(**data)
+            .returning(self._Model)
+        )
+        if profile is not None:
+            # The entity may sit in the session under another profile
+            stmt = self.with_profile(stmt, profile).execution_options(
+                populate_existing=True
+            )
+        return stmt
+
     @no_db_error
     async def update(
             self,
             entity: T,
             data: dict = None,
             commit: bool = True,
+            profile: str = None,
         ) -> T:
         """Updates entity.
 
-        `commit=False` flushes the update without ending the transaction,
-        letting callers batch several writes under one lock and commit
-        them together.
+        One `UPDATE ... RETURNING` round trip: the returned rows are the
+        updated entities (the session's copies, synchronized in place), and
+        no row back means the entity does not exist.
+
+        `commit=False` leaves the update in the open transaction, letting
+        callers batch several writes under one lock and commit them
+        together. `profile` picks what the returned rows load.
         """
         try:
-            _id = entity.id or str(entity.id)
-            exists = (await self.db.execute(
-                select(self._Model).filter_by(id=_id)
-            )).scalars().first()
-            if exists is None:
+            stmt = self.update_stmt(entity.id or str(entity.id), data, profile)
+            updated = (await self.db.execute(stmt)).scalars().all()
+            if not updated:
                 raise ExcRaiser404(message='Entity not found')
-            await self.db.execute(
-                sa_update(self._Model)
-                .where(self._Model.id == _id)
-                .values(**data)
-                .execution_options(synchronize_session="fetch")
-            )
             if commit:
                 await self.db.commit()
-            else:
-                await self.db.flush()
-            refreshed = await self.db.execute(
-                select(self._Model).filter_by(id=_id)
-            )
-            return refreshed.scalars().all()
+            return updated
         except Exception as e:
             await self.db.rollback()
             if self.configs.DEBUG:
@@ -198,11 +226,7 @@ class Repository:
                 raise ExcRaiser404(message='Entity not found')
 
             if hasattr(entity, attr):
-                if attr == 'conversation':
-                    convo = list(entity.conversation or [])
-                    convo.append(data)
-                    setattr(entity, attr, convo)
-                elif attr == 'referred_users' and new_slot:
+                if attr == 'referred_users' and new_slot:
                     setattr(entity, attr, data)
                     entity.referral_slots_used += 1
             else:
@@ -256,19 +280,27 @@ class Repository:
         filter: dict = None,
         relative: bool = False,
         sort: str = 'created_at',
+        profile: str = None,
     ) -> PagedResponse:
 
         page = filter.pop('page') if (filter and filter.get('page')) else 1
         per_page = filter.pop('per_page') if (filter and filter.get('per_page')) else 10
         order = filter.pop('order') if (filter and filter.get('order')) else 'asc'
+        cursor = filter.pop('cursor', None) if filter else None
+        with_total = filter.pop('with_total', False) if filter else False
         limit = per_page
         offset = paginator(page, per_page)
         QueryModel = self._Model
 
         try:
-            stmt = select(QueryModel)
+            stmt = self.with_profile(select(QueryModel), profile)
             if filter:
                 stmt = stmt.filter_by(**filter)
+            if cursor is not None:
+                return await self.keyset_page(
+                    stmt, getattr(QueryModel, sort), QueryModel.id,
+                    order, cursor, limit, with_total
+                )
             total = (await self.db.execute(
                 select(func.count()).select_from(stmt.subquery())
             )).scalar() or 0
@@ -296,6 +328,74 @@ class Repository:
             total=total,
         )
 
+    @no_db_error
+    async def keyset_page(
+        self,
+        stmt,
+        sort_col,
+        id_col,
+        order: str,
+        cursor: str,
+        limit: int,
+        with_total: bool = False,
+    ) -> PagedResponse:
+        """
+        Cursor mode of the paged listings. Orders `stmt` by (sort_col,
+        id_col), seeks past the row encoded in `cursor` (empty string for
+        the first page) and returns `next_cursor` while more rows follow.
+        The exact total is only counted when `with_total` is set.
+        Rows whose sort value is NULL are not reachable this way.
+        """
+        total = None
+        if with_total:
+            total = (await self.db.execute(
+                select(func.count()).select_from(stmt.subquery())
+            )).scalar() or 0
+
+        descending = order == 'desc'
+        if cursor:
+            try:
+                value, id_ = decode_cursor(cursor)
+                id_ = id_col.type.python_type(id_)
+            except (ValueError, TypeError):
+                raise ExcRaiser400(detail='Invalid pagination cursor')
+            key = tuple_(literal(value, sort_col.type), literal(id_, id_col.type))
+            stmt = stmt.filter(
+                tuple_(sort_col, id_col) < key if descending
+                else tuple_(sort_col, id_col) > key
+            )
+        stmt = stmt.order_by(
+            *((sort_col.desc(), id_col.desc()) if descending
+              else (sort_col.asc(), id_col.asc()))
+        ).limit(limit + 1)
+        results = (await self.db.execute(stmt)).scalars().all()
+
+        next_cursor = None
+        if len(results) > limit:
+            results = results[:limit]
+            last = results[-1]
+            next_cursor = encode_cursor([
+                getattr(last, sort_col.key), str(getattr(last, id_col.key))
+            ])
+        return PagedResponse(
+            data=results,
+            pages=max(math.ceil(total / limit), 1) if total else 1,
+            page_number=1,
+            per_page=limit,
+            count=len(results),
+            total=total,
+            next_cursor=next_cursor,
+        )
+
+    @no_db_error
+    async def rollup(self, scope: str) -> dict[str, int]:
+        """Trigger-maintained row counts of `scope`, by bucket (one PK scan)."""
+        rows = await self.db.execute(
+            select(StatRollups.bucket, StatRollups.count)
+            .filter(StatRollups.scope == scope)
+        )
+        return {bucket: count for bucket, count in rows}
+
     @no_db_error
     async def count(self, filter: dict = None) -> int:
         try:
@@ -1,5 +1,9 @@
 import math
-from sqlalchemy import String, select, func
+import uuid
+from sqlalchemy import (
+    String, Float, UUID, select, func, insert, update, values, column, or_
+)
+from sqlalchemy.orm import selectinload, noload
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from server.config import app_configs
@@ -8,6 +12,7 @@ from server.repositories.repository import Repository, no_db_error
 from server.models.users import Users, Notifications, WalletTransactions
 from server.schemas import GetUserSchema, PagedResponse, WalletTransactionSchema
 from server.middlewares.exception_handler import ExcRaiser, ExcRaiser400, ExcRaiser404
+from server.utils.principal_cache import principal_cache
 from sqlalchemy.exc import SQLAlchemyError
 from server.enums.user_enums import TransactionStatus, TransactionTypes
 
@@ -31,6 +36,29 @@ class UserRepository(Repository):
             super().attachDB(db)
         self.wallet_transaction = wallet_transaction
 
+    @no_db_error
+    async def update(
+            self,
+            entity,
+            data: dict = None,
+            commit: bool = True,
+            profile: str = None,
+        ):
+        # A bulk UPDATE: the unit of work won't report it to the cache
+        principal_cache.touch(self.db, [entity.id])
+        return await super().update(entity, data, commit, profile)
+
+    @no_db_error
+    async def count(self, filter: dict = None) -> int:
+        """Users, or users of `filter['role']`, from the rollup rows."""
+        if filter and set(filter) != {'role'}:
+            return await super().count(filter)
+        counts = await self.rollup('users')
+        if not filter:
+            return sum(counts.values())
+        role = filter['role']
+        return counts.get(getattr(role, 'name', role), 0)
+
     @no_db_error
     async def get_by_email(
         self, email: str, schema_mode: bool = False
@@ -72,19 +100,24 @@ class UserRepository(Repository):
               transaction (e.g. the auction row) can commit everything
               together.
 
-        Locks the user row with `SELECT ... FOR UPDATE` and re-checks the
-        balance after acquiring the lock, since a caller-side balance check
-        made before the lock could be stale by the time it's applied.
+        The balance is re-checked by the UPDATE itself (it only matches
+        while `available_balance >= amount`, under the row lock it takes),
+        since a caller-side check made before the lock could be stale.
+        One `UPDATE ... RETURNING` round trip, no savepoint.
         """
         try:
-            async with self.db.begin_nested():
-                user = (await self.db.execute(
-                    select(Users).filter(Users.id == id).with_for_update()
-                )).scalars().first()
-                if user.available_balance < amount:
-                    raise ExcRaiser400('Insufficient wallet balance')
-                user.available_balance -= amount
-                user.auctioned_amount += amount
+            user = (await self.db.execute(
+                update(Users)
+                .where(Users.id == id, Users.available_balance >= amount)
+                .values(
+                    available_balance=Users.available_balance - amount,
+                    auctioned_amount=Users.auctioned_amount + amount,
+                )
+                .returning(Users)
+            )).scalars().first()
+            if user is None:
+                raise ExcRaiser400('Insufficient wallet balance')
+            principal_cache.touch(self.db, [user.id])
             DESCRIPTION = f'{amount} placed on bid'
             data = {
                 'user_id': user.id,
@@ -142,6 +175,58 @@ class UserRepository(Repository):
                 detail=str(e)
             )
 
+    @no_db_error
+    async def abtw_many(
+        self, refunds: list[tuple[str, float]], commit: bool = True
+    ):
+        """
+        AUCTION_BALANCE TO WALLET/AVAILABLE_BALANCE, for many users at once\n
+        Same transfer as `abtw`, done with one set-based UPDATE over all
+        users and one multi-row INSERT of their wallet transactions.
+        Args:
+            - refunds <list[tuple[str, float]]>: (user id, amount) pairs
+            - commit <bool>: pass False to leave committing to the caller
+        """
+        try:
+            if not refunds:
+                return
+            refund = values(
+                column('user_id', UUID(as_uuid=True)),
+                column('amount', Float),
+                name='refunds',
+            ).data([(user_id, amount) for user_id, amount in refunds])
+            await self.db.execute(
+                update(Users)
+                .where(Users.id == refund.c.user_id)
+                .values(
+                    auctioned_amount=Users.auctioned_amount - refund.c.amount,
+                    available_balance=Users.available_balance + refund.c.amount,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            principal_cache.touch(self.db, [user_id for user_id, _ in refunds])
+            await self.db.execute(
+                insert(WalletTransactions).values([
+                    {
+                        'user_id': user_id,
+                        'amount': amount,
+                        'description': f'{amount} placed on bid',
+                        'transaction_type': TransactionTypes.CREDIT,
+                        'status': TransactionStatus.COMPLETED
+                    }
+                    for user_id, amount in refunds
+                ])
+            )
+            if commit:
+                await self.db.commit()
+        except (Exception, SQLAlchemyError) as e:
+            await self.db.rollback()
+            raise ExcRaiser(
+                status_code=500,
+                message='Transaction failed',
+                detail=str(e)
+            )
+
     @no_db_error        
     async def intra_payment(self, payer_id: str, recipient_id: str, amount: float):
         """Intra payment"""
@@ -349,27 +434,46 @@ class UserRepository(Repository):
         filter_ = filter_.copy() if filter_ else {}
         page = filter_.pop("page", 1)
         per_page = filter_.pop("per_page", 10)
+        cursor = filter_.pop("cursor", None)
+        with_total = filter_.pop("with_total", False)
 
         limit = per_page
         offset = paginator(page, per_page)
         QueryModel = Users
 
         try:
-            search_term = filter_.get("q", "").strip()
+            search_term = (filter_.get("q") or "").strip()
             stmt = select(QueryModel)
+            rank = None
 
             if search_term:
-                stmt = stmt.filter(
-                    QueryModel.first_name.ilike(f"%{search_term}%") |
-                    QueryModel.last_name.ilike(f"%{search_term}%") |
-                    QueryModel.username.ilike(f"%{search_term}%") |
-                    QueryModel.email.ilike(f"%{search_term}%") |
-                    QueryModel.id.cast(String).ilike(f"%{search_term}%")
+                # ILIKE '%q%' on these columns is served by their pg_trgm
+                # GIN indexes; an id can only be matched whole.
+                fields = (
+                    QueryModel.first_name, QueryModel.last_name,
+                    QueryModel.username, QueryModel.email,
+                )
+                matches = [f.ilike(f"%{search_term}%") for f in fields]
+                try:
+                    matches.append(QueryModel.id == uuid.UUID(search_term))
+                except ValueError:
+                    pass
+                stmt = stmt.filter(or_(*matches))
+                rank = func.greatest(*(
+                    func.similarity(func.coalesce(f, ''), search_term)
+                    for f in fields
+                ))
+
+            if cursor is not None:
+                return await self.keyset_page(
+                    stmt, QueryModel.created_at, QueryModel.id,
+                    'desc', cursor, limit, with_total
                 )
-
             total = (await self.db.execute(
                 select(func.count()).select_from(stmt.subquery())
             )).scalar() or 0
+            if rank is not None:
+                stmt = stmt.order_by(rank.desc(), QueryModel.created_at.desc())
             results = (await self.db.execute(
                 stmt.limit(limit).offset(offset)
             )).scalars().all()
@@ -390,16 +494,35 @@ class UserRepository(Repository):
 
     @no_db_error
     async def get_relations(self, id: str, _filter: dict, model=None):
+        # (model, owner column(s), loader options of the listing)
         relations_map = {
-            'auctions': (Auctions, Auctions.users_id),
-            'bids': (Bids, Bids.user_id),
-            'chats': (Chats, (Chats.seller_id, Chats.buyer_id)),
+            'auctions': (
+                Auctions, Auctions.users_id,
+                (selectinload(Auctions.item), noload('*')),
+            ),
+            'bids': (
+                Bids, Bids.user_id,
+                (
+                    noload(Bids.user),
+                    selectinload(Bids.auction).selectinload(Auctions.item),
+                    selectinload(Bids.auction).noload('*'),
+                ),
+            ),
+            'chats': (
+                Chats, (Chats.seller_id, Chats.buyer_id),
+                (
+                    selectinload(Chats.auction).selectinload(Auctions.item),
+                    selectinload(Chats.auction).noload('*'),
+                ),
+            ),
         }
 
         try:
             page = _filter.pop('page') if (_filter and _filter.get('page')) else 1
             per_page = _filter.pop('per_page') if (_filter and _filter.get('per_page')) else 10
             order = _filter.pop('order') if (_filter and _filter.get('order')) else 'asc'
+            cursor = _filter.pop('cursor', None) if _filter else None
+            with_total = _filter.pop('with_total', False) if _filter else False
             limit = per_page
             offset = paginator(page, per_page)
             QueryModel = relations_map.get(model, None)[0] if model else Auctions
@@ -413,6 +536,13 @@ class UserRepository(Repository):
                 stmt = select(QueryModel).filter(
                     relations_map.get(model, None)[1].in_([id])
                 )
+            if model:
+                stmt = stmt.options(*relations_map[model][2])
+            if cursor is not None:
+                return await self.keyset_page(
+                    stmt, QueryModel.created_at, QueryModel.id,
+                    order, cursor, limit, with_total
+                )
             stmt = stmt.order_by(QueryModel.created_at.desc()
                 if order == 'desc' else QueryModel.created_at.asc()
             )
@@ -443,3 +573,99 @@ class UserNotificationRepository(Repository):
         super().__init__(Notifications)
         if db:
             super().attachDB(db)
+
+    @no_db_error
+    async def add_many(self, entities: list[dict], commit: bool = True):
+        """
+        Inserts many notifications with one multi-row INSERT ... RETURNING
+        and returns the created rows, in the order of `entities`.
+        """
+        try:
+            if not entities:
+                return []
+            result = await self.db.scalars(
+                insert(Notifications).returning(
+                    Notifications, sort_by_parameter_order=True
+                ),
+                entities,
+            )
+            created = result.all()
+            if commit:
+                await self.db.commit()
+            else:
+                await self.db.flush()
+            return created
+        except Exception as e:
+            await self.db.rollback()
+            raise e
+
+    @no_db_error
+    async def merge_many(self, entities: list[dict], commit: bool = True):
+        """
+        Rewrites coalesced notifications in place, matched on `id`.
+        Every entity must carry the same keys. Returns the rows and the
+        ids of those that were read before (i.e. became unread again).
+        """
+        try:
+            if not entities:
+                return [], set()
+            ids = [e['id'] for e in entities]
+            reopened = set((await self.db.scalars(
+                select(Notifications.id).where(
+                    Notifications.id.in_(ids), Notifications.read.is_(True)
+                )
+            )).all())
+            await self.db.execute(update(Notifications), entities)
+            result = await self.db.scalars(
+                select(Notifications)
+                .where(Notifications.id.in_([e['id'] for e in entities]))
+                .execution_options(populate_existing=True)
+            )
+            merged = result.all()
+            if commit:
+                await self.db.commit()
+            else:
+                await self.db.flush()
+            return merged, reopened
+        except Exception as e:
+            await self.db.rollback()
+            raise e
+
+    @no_db_error
+    async def mark_all_read(self, user_id: str, commit: bool = True) -> int:
+        """Marks every unread notification of a user read; returns how many."""
+        try:
+            result = await self.db.execute(
+                update(Notifications)
+                .where(
+                    Notifications.user_id == user_id,
+                    Notifications.read.is_(False),
+                )
+                .values(read=True)
+                .execution_options(synchronize_session=False)
+            )
+            if commit:
+                await self.db.commit()
+            return result.rowcount
+        except Exception as e:
+            await self.db.rollback()
+            raise e
+
+    @no_db_error
+    async def counts(self, user_ids: list[str]) -> dict[str, dict[str, int]]:
+        """`{user_id: {'unread', 'total'}}` from one grouped aggregate."""
+        rows = (await self.db.execute(
+            select(
+                Notifications.user_id,
+                func.count().filter(Notifications.read.is_(False)),
+                func.count(),
+            )
+            .where(Notifications.user_id.in_(
+                [uuid.UUID(str(user_id)) for user_id in user_ids]
+            ))
+            .group_by(Notifications.user_id)
+        )).all()
+        counts = {str(user_id): {'unread': 0, 'total': 0} for user_id in user_ids}
+        for user_id, unread, total in rows:
+            counts[str(user_id)] = {'unread': unread, 'total': total}
+        return counts
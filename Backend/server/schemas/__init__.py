@@ -49,14 +49,24 @@ class PagedResponse(APIResponse):
     pages: int = 1
     page_number: int = 1
     count: int = 0
-    total: int = 0
+    total: t.Optional[int] = 0
     per_page: int = 0
+    next_cursor: t.Optional[str] = None
 
 
 class PagedQuery(pyd.BaseModel):
     page: int = Query(1, ge=1)
     per_page: int = Query(10, ge=1, le=100)
     order: Optional[str] = Query(default='asc')
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Keyset cursor: send it empty for the first page, then "
+        "the previous page's next_cursor. Replaces page when set"
+    )
+    with_total: bool = Query(
+        default=False,
+        description="Cursor mode only: also compute the exact total"
+    )
     # attr: Optional[str|int] = Query(default=None, description="Attribute to filter by")
 
 # =====
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import Optional, Union
+from pydantic import BaseModel, Field, model_validator
+from typing import ClassVar, Optional, Union
 from datetime import datetime, timezone
 from uuid import UUID
 
@@ -94,10 +94,22 @@ class GetAuctionSchema(CreateAuctionSchema):
     payment: Optional[GetPaymentSchema] = Field(default=None)
     chat: Optional[GetChatSchema] = Field(default=None)
 
-    def __init__(self, **data):
-        super().__init__(**data)
-        self.bids_count = len(self.bids) if self.bids else 0
-        self.participants_count = len(self.participants) if self.participants else 0
+    # count field -> the list it counts. A row carrying the list (auction
+    # page) is counted here; one without it (listing cards) carries the
+    # count itself, selected with the row. CompiledSerializer applies the
+    # same counts in place of `count_lists`.
+    counted: ClassVar[dict[str, str]] = {
+        'bids_count': 'bids',
+        'participants_count': 'participants',
+    }
+
+    # An after validator, unlike __init__, also runs under model_validate.
+    @model_validator(mode='after')
+    def count_lists(self):
+        for count, items in self.counted.items():
+            if getattr(self, items):
+                setattr(self, count, len(getattr(self, items)))
+        return self
 
     model_config = {
         'from_attributes': True
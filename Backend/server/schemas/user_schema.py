@@ -177,6 +177,9 @@ class CreateNotificationSchema(BaseModel):
     user_id: Union[str, UUID]
     links: Optional[list] = Field(default=None)
     class_name: Optional[str] = Field(default=None)
+    # Auction the notice is about: repeats about it are coalesced (see
+    # UserNotificationServices.coalesce_key). Not stored.
+    auction_id: Optional[Union[str, UUID]] = Field(default=None, exclude=True)
 
     model_config = {"from_attributes": True}
 
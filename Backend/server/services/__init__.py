@@ -31,6 +31,7 @@ from server.repositories.user_repository import (
     WalletTranscationRepository
 )
 from server.services.rewardhistory_service import RewardHistoryService
+from server.utils.principal_cache import principal_cache
 
 
 # Service dependencies
@@ -183,53 +184,59 @@ class AuthServices:
 
     @staticmethod
     async def get_ws_user(ws: WebSocket, token: str = None):
-        # The session is owned here via `async with`, so it is always returned
-        # to the pool — on success or on any error path. Returning only the
-        # validated user (expire_on_commit=False keeps its attributes usable
-        # after close) means callers never have to manage a session lifecycle.
-        async with AsyncSessionLocal() as db:
-            try:
-                requested_protocols = ws.headers.get('sec-websocket-protocol')
-                requested_protocols = (
-                    [p.strip() for p in requested_protocols.split(",")]
-                    if requested_protocols else []
-                )
+        # The session is only opened on a principal cache miss, and is owned
+        # by `async with`, so it always goes back to the pool. Returning only
+        # the validated user means callers never manage a session lifecycle.
+        try:
+            requested_protocols = ws.headers.get('sec-websocket-protocol')
+            requested_protocols = (
+                [p.strip() for p in requested_protocols.split(",")]
+                if requested_protocols else []
+            )
 
-                if not token:
-                    if len(requested_protocols) > 1:
-                        token = requested_protocols[1].strip()
-                    else:
-                        auth = ws.headers.get('Authorization', None)
-                        token = auth.split(' ')[-1] if auth else None
-
-                # Only echo back a subprotocol the client actually offered —
-                # per RFC 6455 §4.2.2, selecting one it never requested forces
-                # spec-compliant clients (browsers included) to abort the
-                # connection right after the handshake.
-                subprotocol = "auth" if "auth" in requested_protocols else None
-                await ws.accept(subprotocol=subprotocol)
-                if not token:
-                    raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION)
-
-                claims = jwt.decode(
-                    token,
-                    app_configs.security.JWT_SECRET_KEY,
-                    algorithms=[app_configs.security.ALGORITHM]
-                )
+            if not token:
+                if len(requested_protocols) > 1:
+                    token = requested_protocols[1].strip()
+                else:
+                    auth = ws.headers.get('Authorization', None)
+                    token = auth.split(' ')[-1] if auth else None
+
+            # Only echo back a subprotocol the client actually offered —
+            # per RFC 6455 §4.2.2, selecting one it never requested forces
+            # spec-compliant clients (browsers included) to abort the
+            # connection right after the handshake.
+            subprotocol = "auth" if "auth" in requested_protocols else None
+            await ws.accept(subprotocol=subprotocol)
+            if not token:
+                raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION)
 
-                user_repo = get_user_repo()
-                user = await user_repo.attachDB(db).get_by_attr({'id': claims["id"]})
+            claims = jwt.decode(
+                token,
+                app_configs.security.JWT_SECRET_KEY,
+                algorithms=[app_configs.security.ALGORITHM]
+            )
 
+            principal = await principal_cache.get(claims["id"])
+            if principal:
+                return principal
+            async with AsyncSessionLocal() as db:
+                user_repo = get_user_repo()
+                user = await user_repo.attachDB(db).get_by_attr(
+                    {'id': claims["id"]}
+                )
                 if not user:
-                    raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION)
-
-                return GetUserSchema.model_validate(user)
+                    raise WebSocketException(
+                        code=status.WS_1008_POLICY_VIOLATION
+                    )
+                principal = GetUserSchema.model_validate(user)
+            await principal_cache.put(principal)
+            return principal
 
-            except WebSocketException:
-                raise
-            except Exception as e:
-                print(e)
-                raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION)
+        except WebSocketException:
+            raise
+        except Exception as e:
+            print(e)
+            raise WebSocketException(code=status.WS_1008_POLICY_VIOLATION)
 
     @staticmethod
     async def _get_current_user(
@@ -246,15 +253,6 @@ class AuthServices:
                     detail='No token provided'
                 )
 
-            async_redis = await redis_store.get_async_redis()
-            blacklisted = await async_redis.get(f"blacklist_{token}")
-            if blacklisted:
-                raise ExcRaiser(
-                    status_code=401,
-                    message='Unauthenticated',
-                    detail='No token provided'
-                )
-
             claims = jwt.decode(
                 token=token,
                 algorithms=app_configs.security.ALGORITHM,
@@ -268,9 +266,22 @@ class AuthServices:
                         message='Unauthenticated',
                         detail='Invalid token type'
                     )
+                blacklisted, principal = await principal_cache.lookup(
+                    token, claims.get('id')
+                )
+                if blacklisted:
+                    raise ExcRaiser(
+                        status_code=401,
+                        message='Unauthenticated',
+                        detail='No token provided'
+                    )
+                if principal:
+                    return principal
                 user = await repo.attachDB(db).get_by_attr({'id': claims.get('id')})
                 if user:
-                    return GetUserSchema.model_validate(user)
+                    principal = GetUserSchema.model_validate(user)
+                    await principal_cache.put(principal)
+                    return principal
             else:
                 raise ExcRaiser(
                     status_code=401,
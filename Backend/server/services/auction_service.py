@@ -1,3 +1,5 @@
+import json
+import math
 from datetime import datetime, timedelta
 from server.utils.datetime_utils import now_utc
 import inspect
@@ -20,6 +22,14 @@ from server.middlewares.exception_handler import (
     ExcRaiser400,
 )
 from server.utils.ex_inspect import ExtInspect
+from server.utils.order_book import order_book
+from server.utils.bid_board import bid_board
+from server.utils.auction_schedule import auction_schedule
+from server.utils.serializer import CompiledSerializer
+from server.utils.trending import trending
+from server.utils.cache import cached, cache, AUCTION_UPDATED
+from server.utils.watchers import watcher_index
+from server.utils.helpers import paginator
 from server.schemas import (
     GetAuctionSchema,
     CreateNotificationSchema,
@@ -109,13 +119,16 @@ class AuctionServices(BaseService):
                 )
                 new_item.sub_categories = sub_res.scalars().all()
 
+            await self.repo.refresh_search(result.id, commit=False)
             await self.repo.db.commit()
             await self.repo.db.refresh(new_item)
+            await auction_schedule.schedule(result)
+            await trending.sync(result)
             if result.private == True:
                 for p in participants:
                     await self.create_participants(
                         {"auction_id": result.id, "participant_email": p},
-                        auction=GetAuctionSchema.model_validate(result),
+                        auction=GetAuctionSchema.model_validate(result.to_dict()),
                     )
             await self.notify(
                 user_id,
@@ -127,8 +140,9 @@ class AuctionServices(BaseService):
             _ = await self.reward_service.save_reward_history(
                 user_id, reward_type="LIST_PRODUCT"
             )
-            # Serialize before releasing the connection so Redis publish has no DB dependency
-            validated_result = GetAuctionSchema.model_validate(result)
+            # Serialize before releasing the connection so Redis publish has no DB dependency.
+            # From to_dict(): the new row's counts are deferred and unloaded.
+            validated_result = GetAuctionSchema.model_validate(result.to_dict())
             await self.repo.db.close()
             await publ.publish_create_auction(
                 {
@@ -152,9 +166,11 @@ class AuctionServices(BaseService):
                 print(f"Unexpected error in {method_name}: {e}")
             raise ExcRaiser500(detail=str(e))
 
+    @cached("auction", GetAuctionSchema, app_configs.CACHE_AUCTION_TTL,
+            tags=("auction:{id}",), local=True)
     async def retrieve(self, id: str):
         try:
-            result = await self.repo.get_by_id(id)
+            result = await self.repo.get_by_id(id, profile='detail')
             if not result:
                 raise ExcRaiser404("Auction not found")
             # print(result.to_dict())
@@ -176,9 +192,7 @@ class AuctionServices(BaseService):
             if extra:
                 filter.update(extra)
             result = await self.repo.get_all(filter)
-            result.data = [
-                GetAuctionSchema.model_validate(r.to_dict()) for r in result.data
-            ]
+            result.data = CompiledSerializer.of(GetAuctionSchema).rows(result.data)
             return result
         except ExcRaiser as e:
             raise
@@ -188,9 +202,90 @@ class AuctionServices(BaseService):
                 print(f"Unexpected error in {method_name}: {e}")
             raise ExcRaiser500(detail=str(e))
 
-    async def count(self) -> int:
+    async def trending(self, filter: PagedQuery) -> PagedResponse:
+        """
+        A page of the live trending set (`server.utils.trending`).
+        Postgres is only read for cards not cached yet, and to seed the
+        set the first time; while another worker seeds it, the page falls
+        back to the most watched auctions.
+        """
+        try:
+            seeding = await trending.seed_lock()
+            if seeding is None:
+                return await self.list(filter, {"status": AuctionStatus.ACTIVE})
+            if seeding:
+                await trending.seed(await self.repo.trending_seed(
+                    now_utc() - timedelta(seconds=app_configs.TRENDING_HALF_LIFE)
+                ))
+
+            total, rows = await trending.page(
+                paginator(filter.page, filter.per_page), filter.per_page
+            )
+            missing = [auction_id for auction_id, card, _ in rows if card is None]
+            if missing:
+                plan = CompiledSerializer.of(GetAuctionSchema)
+                fresh = {
+                    str(auction.id): GetAuctionSchema.model_validate(
+                        plan.row(auction)
+                    ).model_dump_json()
+                    for auction in await self.repo.get_cards(missing)
+                }
+                await trending.store_cards(fresh)
+                rows = [
+                    (auction_id, card or fresh.get(auction_id), live)
+                    for auction_id, card, live in rows
+                ]
+            data = [
+                {**json.loads(card), **live}
+                for _, card, live in rows if card is not None
+            ]
+            return PagedResponse(
+                data=data,
+                total=total,
+                count=len(data),
+                per_page=filter.per_page,
+                page_number=filter.page,
+                pages=max(math.ceil(total / filter.per_page), 1),
+            )
+        except ExcRaiser as e:
+            raise
+        except Exception as e:
+            if self.debug:
+                method_name = inspect.stack()[0].frame.f_code.co_name
+                print(f"Unexpected error in {method_name}: {e}")
+            raise ExcRaiser500(detail=str(e))
+
+    async def watching(self, user_id: str, filter: PagedQuery) -> PagedResponse:
+        """Auctions `user_id` watches, latest joined first."""
         try:
-            count = await self.repo.count()
+            total, ids = await watcher_index.watching(
+                user_id, paginator(filter.page, filter.per_page), filter.per_page
+            )
+            auctions = {
+                str(a.id): a for a in await self.repo.get_cards(ids)
+            } if ids else {}
+            data = CompiledSerializer.of(GetAuctionSchema).rows(
+                auctions[i] for i in ids if i in auctions
+            )
+            return PagedResponse(
+                data=data,
+                total=total,
+                count=len(data),
+                per_page=filter.per_page,
+                page_number=filter.page,
+                pages=max(math.ceil(total / filter.per_page), 1),
+            )
+        except ExcRaiser as e:
+            raise
+        except Exception as e:
+            if self.debug:
+                method_name = inspect.stack()[0].frame.f_code.co_name
+                print(f"Unexpected error in {method_name}: {e}")
+            raise ExcRaiser500(detail=str(e))
+
+    async def count(self, exact: bool = False) -> dict[str, int]:
+        try:
+            count = await self.repo.count(exact)
             return count
         except ExcRaiser as e:
             raise
@@ -202,9 +297,15 @@ class AuctionServices(BaseService):
 
     async def update(self, id: str, data: dict):
         try:
-            entity = await self.repo.get_by_id(id)
-            updated = await self.repo.update(entity, data)
-            return GetAuctionSchema.model_validate(updated[0])
+            entity = await self.repo.get_by_id(id, profile='bid')
+            updated = await self.repo.update(entity, data, profile='detail')
+            await order_book.drop(id)
+            await auction_schedule.schedule(updated[0])
+            await trending.forget_card(id)
+            await trending.sync(updated[0])
+            await cache.emit(AUCTION_UPDATED, auction_id=id)
+            # From to_dict(), as retrieve does: the loaded lists give the counts
+            return GetAuctionSchema.model_validate(updated[0].to_dict())
         except ExcRaiser as e:
             raise
         except Exception as e:
@@ -225,6 +326,9 @@ class AuctionServices(BaseService):
             )
             user = await self.user_repo.get_by_email(data.get("participant_email"))
             _ = await self.participant_repo.add(data)
+            # The page lists participants and the card counts them
+            await trending.forget_card(data.get("auction_id"))
+            await cache.emit(AUCTION_UPDATED, auction_id=str(data.get("auction_id")))
             if user:
                 await self.notify(
                     str(user.id),
@@ -258,9 +362,9 @@ class AuctionServices(BaseService):
 
     async def ws_bids(self, auction_id: str, ws: WebSocket):
         try:
-            async_redis = await redis_store.get_async_redis()
-            bid_list = async_redis.get(f'auction:{auction_id}')
-            await ws.send(bid_list)
+            snapshot = await bid_board.snapshot(auction_id)
+            seq, bid_list = snapshot if snapshot else (0, [])
+            await ws.send_json({'type': 'bids', 'seq': seq, 'payload': bid_list})
         except ExcRaiser as e:
             raise
         except Exception as e:
@@ -276,6 +380,10 @@ class AuctionServices(BaseService):
         caller: str = "create",
         existing_amount: float = 0.0,
     ):
+        # Until the status is committed the auction is still open: on a
+        # failure its book (CLOSING after a buy-now), board and deadline
+        # stay, so the deadline close can settle it.
+        flushed, closed = [], False
         try:
             # Get the auction, bids and winner's details
             # `db` is only passed by callers outside a normal HTTP request
@@ -289,18 +397,22 @@ class AuctionServices(BaseService):
                 self.notification.repo.attachDB(db)
                 self.chat_service.chat_repo.attachDB(db)
                 self.reward_service.repo.attachDB(db)
+            # Bring the write-behind price from the order book in first.
+            flushed = await order_book.flush(self.repo.db, [id])
             auction = await self.repo.get_with_bids(id)
             bids: list = auction.bids
             winner = None
             if len(bids) > 0:
                 winner = max(bids, key=lambda x: x.amount)
 
-            print(winner.to_dict())
             # If auction exists
             if auction:
                 # Cancel if no bids were placed
                 if not winner:
-                    await self.repo.update(auction, {"status": AuctionStatus.CANCLED})
+                    await self.repo.update(
+                        auction, {"status": AuctionStatus.CANCLED}, profile='bid'
+                    )
+                    closed = True
                     await self.notify(
                         auction.users_id,
                         "Auction Closed",
@@ -311,24 +423,23 @@ class AuctionServices(BaseService):
                 # Cancel if winning bid is below the reserve price
                 if auction.use_reserve_price and \
                         winner.amount < auction.reserve_price:
-                    await self.repo.update(auction, {"status": AuctionStatus.CANCLED})
+                    await self.repo.update(
+                        auction, {"status": AuctionStatus.CANCLED}, profile='bid'
+                    )
+                    closed = True
                     await self.notify(
                         auction.users_id,
                         "Auction Closed",
                         "Your auction has been closed",
                     )
-                    for bid in bids:
-                        _ = await self.user_repo.abtw(bid.user_id, bid.amount)
-                        await self.notify(
-                            bid.user_id,
-                            "Auction Lost",
-                            "You have lost the auction, Amount has been returned",
-                            class_name=NotificationClasses.AUCTION.value,
-                        )
+                    await self.refund_bidders(bids)
                     return
 
                 # Update auction status to completed
-                await self.repo.update(auction, {"status": AuctionStatus.COMPLETED})
+                await self.repo.update(
+                    auction, {"status": AuctionStatus.COMPLETED}, profile='bid'
+                )
+                closed = True
                 await self.notify(
                     auction.users_id, "Auction Closed", "Your auction has been closed"
                 )
@@ -371,7 +482,6 @@ class AuctionServices(BaseService):
                         'auctions_id': auction.id,
                         'buyer_id': winner.user_id,
                         'seller_id': auction.users_id,
-                        'conversation': []
                     }
                 )
                 # Reward winner for winning auction
@@ -381,17 +491,10 @@ class AuctionServices(BaseService):
                 # TODO: Develop system to move amount to company's account
                 bids = sorted(bids, key=lambda x: x.amount)
                 bids = bids[:-1]
-                for bid in bids:
-                    await self.user_repo.abtw(bid.user_id, bid.amount)
-                    await self.notify(
-                        bid.user_id,
-                        "Auction Lost",
-                        "You have lost the auction, Amount has been returned",
-                        class_name=NotificationClasses.AUCTION.value,
-                        links=[
-                            f"{app_configs.FRONTEND_URL}/product-details/{auction.id}"
-                        ],
-                    )
+                await self.refund_bidders(
+                    bids,
+                    links=[f"{app_configs.FRONTEND_URL}/product-details/{auction.id}"],
+                )
         except ExcRaiser as e:
             raise
         except Exception as e:
@@ -400,8 +503,39 @@ class AuctionServices(BaseService):
                 print(f"Unexpected error in {method_name}: {e}")
             raise ExcRaiser500(detail=str(e))
         finally:
-            redis = await redis_store.get_async_redis()
-            await redis.delete(f"auction:{id}")
+            if closed:
+                await bid_board.drop(id)
+                await order_book.drop(id)
+                await auction_schedule.unschedule(id)
+                await trending.untrack(id)
+                await watcher_index.drop(id)
+                await cache.emit(AUCTION_UPDATED, auction_id=id)
+            else:
+                # The flushed price rolled back with the rest
+                await order_book.mark_dirty(flushed)
+
+    async def refund_bidders(self, bids: list, links: list = None):
+        """
+        Returns every losing bid to its bidder's available balance and
+        tells them so. Refunds and notifications are written in one
+        transaction with set-based statements; the notifications are
+        published together once it commits.
+        """
+        if not bids:
+            return
+        await self.user_repo.abtw_many(
+            [(bid.user_id, bid.amount) for bid in bids], commit=False
+        )
+        await self.notification.create_many([
+            CreateNotificationSchema(
+                title="Auction Lost",
+                message="You have lost the auction, Amount has been returned",
+                user_id=bid.user_id,
+                links=links or [],
+                class_name=NotificationClasses.AUCTION.value,
+            )
+            for bid in bids
+        ])
 
     async def restart(self, id: str, data: RestartAuctionSchema):
         try:
@@ -424,6 +558,9 @@ class AuctionServices(BaseService):
                 auction.buy_now_price = data.buy_now_price or auction.buy_now_price
                 auction.status = AuctionStatus.PENDING
                 auction.bids = []
+                await order_book.drop(id)
+                await auction_schedule.schedule(auction)
+                await trending.sync(auction)
 
                 if payment:
                     # If payment exists, delete it
@@ -442,6 +579,7 @@ class AuctionServices(BaseService):
                 raise ExcRaiser400(
                     detail='Payment completed or not refunded, cannot restart auction'
                 )
+            await cache.emit(AUCTION_UPDATED, auction_id=id)
             return True
         except ExcRaiser as e:
             raise
@@ -471,6 +609,7 @@ class AuctionServices(BaseService):
                     "due_data": now_utc() + timedelta(days=5),
                 },
             )
+            await cache.emit(AUCTION_UPDATED, auction_id=id)
             return True
         except ExcRaiser as e:
             raise
@@ -504,6 +643,7 @@ class AuctionServices(BaseService):
                     detail='Payment cannot be finalized in its current state'
                 )
             res = await self.payment_repo.disburse(payment)
+            await cache.emit(AUCTION_UPDATED, auction_id=auction_id)
             if res:
                 await self.notify(
                     payment.to_id,
@@ -557,6 +697,7 @@ class AuctionServices(BaseService):
 
             # Update the payment status to REFUNDING
             res = await self.payment_repo.update(payment, payment_)
+            await cache.emit(AUCTION_UPDATED, auction_id=id)
 
             # Notify the seller and buyer
             await self.notify(
@@ -608,6 +749,7 @@ class AuctionServices(BaseService):
 
             # Update the payment status to REFUNDING
             res = await self.payment_repo.refund(payment_)
+            await cache.emit(AUCTION_UPDATED, auction_id=id)
 
             # Notify the seller and buyer
             await self.notify(
@@ -654,6 +796,7 @@ class AuctionServices(BaseService):
                 return
             payment_ = GetPaymentSchema.model_validate(payment)
             res = await self.payment_repo.refund(payment_)
+            await cache.emit(AUCTION_UPDATED, auction_id=auction_id)
             if res:
                 await self.notify(
                     payment.from_id,
@@ -688,6 +831,8 @@ class AuctionServices(BaseService):
                     "The auction has been canceled, The amount placed on the bid has been returned",
                 )
             result = await self.repo.delete(auction)
+            await watcher_index.drop(id)
+            await cache.emit(AUCTION_UPDATED, auction_id=id)
             if result:
                 return True
         except ExcRaiser as e:
@@ -729,7 +874,7 @@ class AuctionServices(BaseService):
         try:
             filter = filter.model_dump()
             result = await self.repo.search(filter)
-            result.data = [GetAuctionSchema.model_validate(r) for r in result.data]
+            result.data = CompiledSerializer.of(GetAuctionSchema).rows(result.data)
             return result
         except ExcRaiser as e:
             raise
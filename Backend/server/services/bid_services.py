@@ -1,16 +1,24 @@
+import logging
 from datetime import datetime
+from typing import List
 from server.utils.datetime_utils import now_utc
-import json
 from fastapi import WebSocket
 from sqlalchemy.orm import Session
 from server.services.base_service import BaseService
 from server.config import app_configs
 from server.enums.notification_enums import NotificationClasses
-from server.config import redis_store
 from server.models.bids import Bids
-from server.middlewares.exception_handler import ExcRaiser400, ExcRaiser
+from server.middlewares.exception_handler import (
+    ExcRaiser400, ExcRaiser404, ExcRaiser
+)
 from server.enums.auction_enums import AuctionStatus
-from server.utils.ws_manager import WSManager
+from server.utils.ws_manager import WSManager, get_wsmanager
+from server.utils.bid_board import bid_board
+from server.utils.order_book import order_book, PlacedBid
+from server.utils.serializer import CompiledSerializer
+from server.utils.trending import trending, BID, WATCH
+from server.utils.watchers import watcher_index
+from server.utils.cache import cache, BID_PLACED
 from server.events.publisher import publish_bid_placed, publish_outbid
 from server.schemas import (
     CreateNotificationSchema,
@@ -18,6 +26,20 @@ from server.schemas import (
 )
 from server.schemas.bid_schema import GetBidSchemaWUser
 
+
+logger = logging.getLogger(__name__)
+
+# Order book rejection codes -> client facing messages.
+BOOK_ERRORS = {
+    "MISSING": "Auction has ended",
+    "NOT_ACTIVE": "Auction is not active",
+    "ENDED": "Auction has ended",
+    "OWNER": "You cannot bid on your own auction",
+    "BUY_NOW_DISABLED": "Buy now is not enabled",
+    "BUY_NOW": "Amount reaches the buy now price",
+    "LOW": "Amount must be higher than current highest bid",
+}
+
 class BidServices(BaseService):
 
     def __init__(
@@ -38,7 +60,7 @@ class BidServices(BaseService):
 
     async def retrieve(self, id: str) -> GetBidSchema:
         try:
-            bid = await self.repo.get_by_id(id)
+            bid = await self.repo.get_by_id(id, profile='row')
             return GetBidSchema.model_validate(bid)
         except Exception as e:
             raise e
@@ -47,17 +69,10 @@ class BidServices(BaseService):
         self, filter: dict, with_users: bool = False
     ) -> list[GetBidSchema | GetBidSchemaWUser]:
         try:
-            bids = await self.repo.get_all(filter=filter)
-            if not with_users:
-                bids.data = [
-                    GetBidSchema.model_validate(bid.to_dict()) for bid in bids.data
-                ]
-                return bids
-            else:
-                bids.data = [
-                    GetBidSchemaWUser.model_validate(bid.to_dict()) for bid in bids.data
-                ]
-                return bids
+            bids = await self.repo.get_all(filter=filter, profile='list')
+            schema = GetBidSchemaWUser if with_users else GetBidSchema
+            bids.data = CompiledSerializer.of(schema).rows(bids.data)
+            return bids
         except Exception as e:
             raise e
 
@@ -68,51 +83,86 @@ class BidServices(BaseService):
         except Exception as e:
             raise e
 
-    async def buy_now(self, data: CreateBidSchema) -> GetBidSchema:
-        try:
-            user = await self.user_repo.get_by_id(data.user_id)
-            # Lock the auction row for the rest of this transaction so a
-            # concurrent bid/buy_now on the same auction has to wait instead
-            # of racing on current_price / buy_now.
-            auction = await self.auction_repo.get_by_id(
-                data.auction_id, for_update=True
+    async def _load_book(self, auction_id: str) -> dict:
+        """The order book's pre-check fields, seeding the book on first use."""
+        book = await order_book.peek(auction_id)
+        if book is None:
+            snapshot = await self.auction_repo.get_order_book_seed(auction_id)
+            if not snapshot:
+                raise ExcRaiser404("Auction not found")
+            await order_book.seed(auction_id, snapshot)
+            book = await order_book.peek(auction_id)
+        return book
+
+    async def _place_on_book(
+        self, auction_id: str, user_id: str, amount: float, mode: str = "bid"
+    ) -> PlacedBid:
+        """
+        Validates the bid against the auction's order book and advances it
+        in one atomic step. Callers run the participant and balance checks
+        first: an accepted bid is the auction's top bid from here on.
+        """
+        placed = await order_book.place(auction_id, user_id, amount, mode)
+        if placed.code == "MISSING":
+            # The book expired since `_load_book`; reseed it.
+            await self._load_book(auction_id)
+            placed = await order_book.place(auction_id, user_id, amount, mode)
+        # BUY_NOW is left to the caller, which may turn the bid into a buy now.
+        if placed.code in BOOK_ERRORS and placed.code != "BUY_NOW":
+            raise ExcRaiser400(BOOK_ERRORS[placed.code])
+        return placed
+
+    async def _check_participant(self, auction_id: str, user, book: dict):
+        if not book["private"]:
+            return
+        participant = await self.auction_repo.validate_participant(
+            auction_id, user.email
+        )
+        if not participant:
+            raise ExcRaiser(
+                status_code=403,
+                message="Unauthorized",
+                detail="You are not a participant in this auction",
             )
-            date = now_utc()
-            data.amount = auction.buy_now_price
 
-            if auction.status != AuctionStatus.ACTIVE:
-                raise ExcRaiser400(
-                    f"Auction is not active, status: {auction.status.value}"
+    async def _after_commit(self, auction_id: str, *steps):
+        """
+        Runs the side effects of a committed bid. The bid is in Postgres
+        and on the book by now, so a failing step is logged and the rest
+        still run; the book is never reverted past the commit.
+        """
+        for step in steps:
+            try:
+                await step
+            except Exception as e:
+                logger.error(
+                    f"❌ Post-commit step of a bid on {auction_id} failed: {e}"
                 )
-            if auction.end_date < date:
-                raise ExcRaiser400("Auction has ended")
-
-            if auction.users_id == user.id:
-                raise ExcRaiser400("You cannot bid on your own auction")
 
-            if not auction.buy_now:
-                raise ExcRaiser400("Buy now is not enabled")
+    async def buy_now(self, data: CreateBidSchema) -> GetBidSchema:
+        placed = None
+        committed = False
+        try:
+            # Locking the buyer's row serializes their own concurrent bids;
+            # the auction itself is guarded by the order book, which stops
+            # accepting bids once a buy now is in flight.
+            user = await self.user_repo.get_by_id(data.user_id, for_update=True)
+            book = await self._load_book(data.auction_id)
+            await self._check_participant(data.auction_id, user, book)
 
-            if auction.private:
-                participant = await self.auction_repo.validate_participant(
-                    data.auction_id, user.email
-                )
-                if not participant:
-                    raise ExcRaiser(
-                        status_code=403,
-                        message="Unauthorized",
-                        detail="You are not a participant in this auction",
-                    )
             exist = await self.repo.exists(
                 {"auction_id": data.auction_id, "user_id": data.user_id}
             )
-            if exist:
-                amount = data.amount - exist.amount
-                e_amount = exist.amount
-            else:
-                amount = data.amount
+            e_amount = exist.amount if exist else 0.0
+            if user.available_balance < book["buy_now_price"] - e_amount:
+                raise ExcRaiser400("Insufficient wallet balance")
 
-            if user.available_balance < amount:
+            placed = await self._place_on_book(
+                data.auction_id, data.user_id, data.amount, mode="buy_now"
+            )
+            data.amount = placed.amount
+            # The price may have moved since the book was read.
+            if user.available_balance < data.amount - e_amount:
                 raise ExcRaiser400("Insufficient wallet balance")
             if exist:
                 bid = await self.repo.update(
@@ -120,161 +170,147 @@ class BidServices(BaseService):
                 )
             else:
                 bid = await self.repo.add(data.model_dump(), commit=False)
-            await self.auction_repo.update(
-                auction, {"current_price": data.amount}, commit=False
-            )
-            # Single commit releases the auction row lock together with
-            # every write made under it.
             await self.repo.db.commit()
-
-            if exist:
-                await self.auctions_services.close(
-                    id=data.auction_id,
-                    caller="buy_now",
-                    existing_amount=e_amount,
-                )
-            else:
-                await self.auctions_services.close(
-                    id=data.auction_id,
-                    caller="buy_now",
-                    existing_amount=0.0,
-                )
-            await self.list_ws(data.auction_id)
-            return bid
+            committed = True
         except Exception as e:
-            await self.repo.db.rollback()
+            if not committed:
+                await self.repo.db.rollback()
+                await order_book.revert(data.auction_id, placed)
             raise e
 
+        # close() flushes the book's price before settling the auction. If
+        # it fails before the status commits, close keeps the book CLOSING
+        # and its price dirty, and the deadline close settles it.
+        await self._after_commit(
+            data.auction_id,
+            self.push_bid(data.auction_id, bid, user),
+            self.auctions_services.close(
+                id=data.auction_id,
+                caller="buy_now",
+                existing_amount=e_amount,
+            ),
+        )
+        return bid
+
     async def create(self, data: CreateBidSchema) -> GetBidSchemaWUser:
+        placed = None
+        committed = False
         try:
             NOTIF_TITLE = "Bid Placed"
             NOTIF_BODY = "Bid submitted successfully in auction: " f"{data.auction_id}"
-            user = await self.user_repo.get_by_id(data.user_id)
-            # Lock the auction row up front so two concurrent bids on the
-            # same auction serialize instead of both reading the same
-            # current_price and racing to write it back.
-            auction = await self.auction_repo.get_by_id(
-                data.auction_id, for_update=True
-            )
-            date = now_utc()
-
-            if auction.status != AuctionStatus.ACTIVE:
-                raise ExcRaiser400("Auction is not active")
-
-            if auction.end_date < date:
-                raise ExcRaiser400("Auction has ended")
-
-            if auction.users_id == user.id:
-                raise ExcRaiser400("You cannot bid on your own auction")
-
-            # TODO: Check if price >= auction.buy_now_price
-            if auction.buy_now:
-                if data.amount >= auction.buy_now_price:
-                    return await self.buy_now(data)
-
-            # Check if price is within 10% of buy_now_price
-            if auction.buy_now:
-                if data.amount >= auction.buy_now_price * 0.9:
-                    await self.auction_repo.update(
-                        auction, {"buy_now": False}, commit=False
-                    )
-
-            prev_bids = sorted(auction.bids, key=lambda x: x.amount, reverse=True)
-            if data.amount <= auction.current_price:
-                raise ExcRaiser400("Amount must be higher than current highest bid")
-
-            if auction.private:
-                participant = await self.auction_repo.validate_participant(
-                    data.auction_id, user.email
-                )
-                if not participant:
-                    raise ExcRaiser(
-                        status_code=403,
-                        message="Unauthorized",
-                        detail="You are not a participant in this auction",
-                    )
+            # Only the bidder's own row is locked: concurrent bids from
+            # different users on the same auction no longer queue on the
+            # auction row, the order book decides which of them wins.
+            user = await self.user_repo.get_by_id(data.user_id, for_update=True)
+            book = await self._load_book(data.auction_id)
+            await self._check_participant(data.auction_id, user, book)
 
             # Check is user had placed a prev bid
             # If so, call update instead.
             exist = await self.repo.exists(
                 {"auction_id": data.auction_id, "user_id": data.user_id}
             )
-            if exist:
-                return await self.update(exisiting_bid=exist, amount=data.amount)
 
-            print("post update")
-            # Check available balance against bid amount (fast-path check;
-            # wtab re-checks under lock since this read isn't locked)
-            if user.available_balance < data.amount:
+            # Check available balance against bid amount before the book
+            # sees the bid (wtab re-checks under lock)
+            raised = data.amount - (exist.amount if exist else 0.0)
+            if user.available_balance < raised:
                 raise ExcRaiser400("Insufficient wallet balance")
 
+            placed = await self._place_on_book(
+                data.auction_id, data.user_id, data.amount
+            )
+            if placed.code == "BUY_NOW":
+                return await self.buy_now(data)
+            if exist:
+                return await self.update(
+                    exisiting_bid=exist, amount=data.amount, placed=placed
+                )
+
             # Move funds from users wallet to users auctioned_amount
             _ = await self.user_repo.wtab(user.id, data.amount, commit=False)
             bid = await self.repo.add(data.model_dump(), commit=False)
-            await self.auction_repo.update(
-                auction, {"current_price": data.amount}, commit=False
-            )
-            # Single commit releases the auction/user row locks together
-            # with every write made under them.
+            # auctions.current_price is written behind by order_book.flush.
             await self.repo.db.commit()
-
-            if bid:
-                await self.notify(
-                    user.id,
-                    NOTIF_TITLE,
-                    NOTIF_BODY,
-                    links=[f"{app_configs.FRONTEND_URL}/product-details/{auction.id}"],
-                )
-                await self.nphb(bid.auction_id, user.id)
-                await publish_bid_placed(
-                    {
-                        "auction_id": data.auction_id,
-                        "bid_user": user.id,
-                        "amount": data.amount,
-                        "link": f"{app_configs.FRONTEND_URL}/product-details/{auction.id}",
-                        "email": user.email,
-                    }
-                )
-                # Reward user for placing a bid
-                _ = await self.reward_service.save_reward_history(
-                    user.id, reward_type="PLACE_BID"
-                )
-                _ = await self.list_ws(data.auction_id)
-            return bid.to_dict()
+            committed = True
         except Exception as e:
-            await self.repo.db.rollback()
+            if not committed:
+                await self.repo.db.rollback()
+                await order_book.revert(data.auction_id, placed)
             raise e
 
+        link = f"{app_configs.FRONTEND_URL}/product-details/{data.auction_id}"
+        await self._after_commit(
+            data.auction_id,
+            self.notify(
+                user.id, NOTIF_TITLE, NOTIF_BODY, links=[link],
+                auction_id=data.auction_id,
+            ),
+            self.nphb(data.auction_id, user.id, placed.prev_bidder),
+            publish_bid_placed(
+                {
+                    "auction_id": data.auction_id,
+                    "bid_user": user.id,
+                    "amount": data.amount,
+                    "link": link,
+                    "email": user.email,
+                }
+            ),
+            # Reward user for placing a bid
+            self.reward_service.save_reward_history(
+                user.id, reward_type="PLACE_BID"
+            ),
+            self.push_bid(data.auction_id, bid, user),
+        )
+        return bid.to_dict()
+
     async def list_ws(
         self,
         auction_id: str,
     ):
+        """
+        Cold path: rebuilds the auction's leaderboard from Postgres. Live
+        updates go through `push_bid` instead.
+        """
         try:
-            redis = await redis_store.get_async_redis()
-            prev_bids = await self.list({"auction_id": auction_id}, with_users=True)
-            prev_bids: list[Bids] = sorted(
-                prev_bids.data, key=lambda b: b.amount, reverse=True
-            )
+            # All of them, not a listing page: the board is authoritative
             prev_bids = [
-                {
-                    "id": str(b.user_id),
-                    "username": b.username,
-                    "amount": b.amount,
-                    "created_at": str(b.created_at),
-                    "avatar": (
-                        b.user.get("image_link", None).get("link", None)
-                        if b.user.get("image_link")
-                        else ""
-                    ),
-                }
-                for b in prev_bids
+                bid_board.entry(b, b.username, b.user.image_link)
+                for b in await self.repo.leaderboard(auction_id)
             ]
-            prev_bids_ = json.dumps(prev_bids)
-            _ = await redis.set(f"auction:{auction_id}", prev_bids_)
-            return json.loads(prev_bids_)
+            await bid_board.seed(str(auction_id), prev_bids)
+            return prev_bids
         except Exception as e:
             raise e
 
+    # List: inside this class `list` is the method above.
+    async def snapshot_ws(self, auction_id: str) -> tuple[int, List[dict]]:
+        """`(seq, leaderboard)` for a (re)connecting watcher."""
+        snapshot = await bid_board.snapshot(auction_id)
+        if snapshot is None:
+            await self.list_ws(auction_id)
+            snapshot = await bid_board.snapshot(auction_id)
+        return snapshot
+
+    async def push_bid(self, auction_id: str, bid: Bids, user) -> str:
+        """
+        Applies one committed bid to the leaderboard and broadcasts it to
+        the auction's watchers as a single sequenced `new_bid` frame.
+        """
+        auction_id = str(auction_id)
+        entry = bid_board.entry(bid, user.username, user.image_link)
+        event = await bid_board.apply(auction_id, entry)
+        if event is None:
+            # Board not built yet; Postgres already has this bid.
+            await self.list_ws(auction_id)
+            event = await bid_board.apply(auction_id, entry)
+        await get_wsmanager().broadcast(auction_id, event)
+        await trending.record(auction_id, BID, current_price=bid.amount)
+        # The card's bid count changed with it
+        await trending.forget_card(auction_id)
+        await cache.emit(BID_PLACED, auction_id=auction_id)
+        return event
+
     async def create_ws(
         self,
         data: CreateBidSchema,
@@ -284,10 +320,9 @@ class BidServices(BaseService):
         try:
             bid = await self.create(data)
             if bid:
-                # create()/update()/buy_now() already refreshed the
-                # "auction:{id}" cache; re-read it here so the broadcast
-                # payload always matches what a reconnecting client sees.
-                return await self.list_ws(data.auction_id)
+                # create()/update()/buy_now() already pushed the new_bid
+                # frame to every watcher, this socket included.
+                return bid
             else:
                 await wsmanager.send_message("Unable to place bid", ws)
 
@@ -295,9 +330,16 @@ class BidServices(BaseService):
             print(e.__class__, e, e.__traceback__)
             await wsmanager.send_message(message=str(e), websocket=ws)
 
-    async def add_watcher(self, auction_id: str, watcher: str):
+    async def add_watcher(self, auction_id: str, user_id: str):
+        """
+        Adds `user_id` to the auction's watchers (`server.utils.watchers`).
+        Postgres is only read, to turn away finished auctions, and only
+        for a user not yet watching; the count is written behind.
+        """
         try:
-            auction = await self.auction_repo.get_by_id(auction_id)
+            if await watcher_index.is_watching(auction_id, user_id):
+                return True
+            auction = await self.auction_repo.get_by_id(auction_id, profile='bid')
             if not auction:
                 return False
 
@@ -306,16 +348,10 @@ class BidServices(BaseService):
                 AuctionStatus.CANCLED,
             ]:
                 return False
-            watchers: list = auction.watchers or []
-
-            if watcher in watchers:
-                return True
 
-            watchers.append(watcher)
-            lent = len(watchers)
-            await self.auction_repo.update(
-                auction, {"watchers": watchers, "watchers_count": lent}
-            )
+            joined, count = await watcher_index.join(auction_id, user_id)
+            if joined:
+                await trending.record(auction_id, WATCH, watchers_count=count)
             return True
         except Exception as e:
             raise e
@@ -326,82 +362,86 @@ class BidServices(BaseService):
         user_id: str = None,
         auction_id: str = None,
         exisiting_bid: Bids = None,
+        placed: PlacedBid = None,
     ) -> GetBidSchemaWUser:
+        """
+        `placed` is the order book entry create() already accepted for this
+        bid, after its own checks; without it the bid is checked and then
+        validated against the book here.
+        """
+        committed = False
+        auc__id = auction_id if auction_id else getattr(
+            exisiting_bid, "auction_id", None
+        )
         try:
             user__id = user_id if user_id else exisiting_bid.user_id
-            auc__id = auction_id if auction_id else exisiting_bid.auction_id
-            user = await self.user_repo.get_by_id(user__id)
-            # Lock the auction row up front — same reasoning as create():
-            # serialize concurrent writers instead of racing on current_price.
-            auction = await self.auction_repo.get_by_id(auc__id, for_update=True)
+            user = await self.user_repo.get_by_id(user__id, for_update=True)
 
             NOTIF_TITLE = "Bid Placed"
             NOTIF_BODY = f"Bid submitted successfully in auction: {auc__id}"
 
             is_direct_update = False
             if exisiting_bid:
-                amount_ = amount - exisiting_bid.amount
-
-                if user.available_balance < amount_:
-                    raise ExcRaiser400("Insufficient wallet balance")
-
-                # Move funds from users wallet to users auctioned_amount
-                _ = await self.user_repo.wtab(user.id, amount_, commit=False)
-                bid = await self.repo.update(
-                    exisiting_bid, {"amount": amount}, commit=False
-                )
-
+                bid = exisiting_bid
             elif user_id and auction_id:
-                exists = await self.repo.exists(
+                bid = await self.repo.exists(
                     {"auction_id": auction_id, "user_id": user_id}
                 )
-                if not exists:
+                if not bid:
                     raise ExcRaiser400(message="Bid not found")
-
-                amount_ = amount - exists.amount
-
-                if user.available_balance < amount_:
-                    raise ExcRaiser400("Insufficient wallet balance")
-
-                # Move funds from users wallet to users auctioned_amount
-                _ = await self.user_repo.wtab(user.id, amount_, commit=False)
-                bid = await self.repo.update(exists, {"amount": amount}, commit=False)
                 is_direct_update = True
             else:
                 raise ExcRaiser400(message="Bid not found")
 
-            await self.auction_repo.update(
-                auction, {"current_price": amount}, commit=False
-            )
-            # Single commit releases the auction/user row locks together
-            # with every write made under them.
+            amount_ = amount - bid.amount
+            if user.available_balance < amount_:
+                raise ExcRaiser400("Insufficient wallet balance")
+
+            if not placed:
+                placed = await self._place_on_book(auc__id, user__id, amount)
+                if not placed.accepted:
+                    raise ExcRaiser400(BOOK_ERRORS[placed.code])
+
+            # Move funds from users wallet to users auctioned_amount
+            _ = await self.user_repo.wtab(user.id, amount_, commit=False)
+            bid = await self.repo.update(bid, {"amount": amount}, commit=False)
+
+            # auctions.current_price is written behind by order_book.flush.
             await self.repo.db.commit()
+            committed = True
+        except Exception as e:
+            if not committed:
+                await self.repo.db.rollback()
+                await order_book.revert(auc__id, placed)
+            raise e
 
-            if bid and not is_direct_update:
-                await self.notify(user.id, NOTIF_TITLE, NOTIF_BODY)
-                await self.nphb(bid.auction_id, user.id)
-            elif bid:
-                await self.notify(
-                    user.id,
-                    NOTIF_TITLE,
-                    NOTIF_BODY,
-                    links=[f"{app_configs.FRONTEND_URL}/product-details/{auction.id}"],
-                )
-                await self.nphb(bid.auction_id, user.id)
-                await publish_bid_placed(
+        link = f"{app_configs.FRONTEND_URL}/product-details/{auc__id}"
+        if not is_direct_update:
+            steps = [
+                self.notify(user.id, NOTIF_TITLE, NOTIF_BODY, auction_id=auc__id),
+                self.nphb(auc__id, user.id, placed.prev_bidder),
+            ]
+        else:
+            steps = [
+                self.notify(
+                    user.id, NOTIF_TITLE, NOTIF_BODY, links=[link],
+                    auction_id=auc__id,
+                ),
+                self.nphb(auc__id, user.id, placed.prev_bidder),
+                publish_bid_placed(
                     {
                         "auction_id": auc__id,
                         "bid_user": user.id,
                         "amount": amount,
-                        "link": f"{app_configs.FRONTEND_URL}/product-details/{auc__id}",
+                        "link": link,
                         "email": user.email,
                     }
-                )
-            await self.list_ws(auc__id)
-            return bid.to_dict()
-        except Exception as e:
-            await self.repo.db.rollback()
-            raise e
+                ),
+            ]
+        await self._after_commit(
+            auc__id, *steps, self.push_bid(auc__id, bid, user)
+        )
+        return bid.to_dict()
 
     async def delete(self, id: str):
         ...
@@ -413,39 +453,38 @@ class BidServices(BaseService):
         title: str,
         message: str,
         links: list = None,
+        auction_id: str = None,
     ):
+        """`auction_id` coalesces repeats about that auction into one notice."""
         try:
             notice = CreateNotificationSchema(
                 title=title, message=message,
                 user_id=user_id, class_name=NotificationClasses.BID.value,
-                links=links or []
+                links=links or [], auction_id=auction_id,
             )
             await self.notification.create(notice)
         except Exception as e:
             raise e
 
-    async def nphb(self, id: str, current_id: str):
-        """nphb: NOTIFY PREVIOUS HIGHEST BIDDER"""
+    async def nphb(self, id: str, current_id: str, phb: str = None):
+        """
+        nphb: NOTIFY PREVIOUS HIGHEST BIDDER\n
+        `phb` is the previous high bidder as reported by the order book.
+        """
         try:
             NOTIF_TITLE = 'You Have been Outbid!'
             NOTIF_BODY = f'Someone placed a higher bid in auction: {id}'
-            auction = await self.auction_repo.get_by_id(id)
-            links = [f'{app_configs.FRONTEND_URL}/product-details/{auction.id}']
+            links = [f'{app_configs.FRONTEND_URL}/product-details/{id}']
 
             # phb: previous highest bidder
-            if len(auction.bids) <= 0:
-                return
-            bids = sorted(auction.bids, key=lambda x: x.amount, reverse=True)
-            phb_bid = next((b for b in bids if b.user_id != current_id), None)
-            if not phb_bid:
+            if not phb or str(phb) == str(current_id):
                 return
-            phb = phb_bid.user_id
-            await self.notify(phb, NOTIF_TITLE, NOTIF_BODY, links=links)
+            await self.notify(phb, NOTIF_TITLE, NOTIF_BODY, links=links, auction_id=id)
             await publish_outbid(
                 {
                     "auction_id": id,
                     "outbid_user": phb,
-                    "link": f"{app_configs.FRONTEND_URL}/product-details/{auction.id}",
+                    "link": f"{app_configs.FRONTEND_URL}/product-details/{id}",
                     "email": (await self.user_repo.get_by_id(phb)).email,
                 }
             )
@@ -1,5 +1,6 @@
 import inspect
 from sqlalchemy.orm import Session
+from server.config import app_configs
 from server.services.base_service import BaseService
 from server.schemas import (
     CreateCategorySchema, GetCategorySchema,
@@ -9,6 +10,7 @@ from server.schemas import (
 from server.middlewares.exception_handler import (
     ExcRaiser, ExcRaiser404, ExcRaiser500
 )
+from server.utils.cache import cached, cache, CATEGORY_CHANGED
 
 
 class CategoryServices(BaseService):
@@ -22,6 +24,7 @@ class CategoryServices(BaseService):
         try:
             category_dict = category.model_dump()
             _category = await self.cat_repo.add(category_dict)
+            await cache.emit(CATEGORY_CHANGED)
             return _category
         except Exception as e:
             raise ExcRaiser(
@@ -30,6 +33,8 @@ class CategoryServices(BaseService):
                 detail=repr(e)
             )
 
+    @cached("category", GetCategorySchema, app_configs.REDIS_CACHE_EXPIRATION_CAT,
+            tags=("categories",), local=True)
     async def get_cat_by_id(self, id: str) -> GetCategorySchema:
         try:
             category = await self.cat_repo.get_by_attr({"id": id})
@@ -52,6 +57,9 @@ class CategoryServices(BaseService):
                 detail=repr(e)
             )
 
+    @cached("categories", list[GetCategorySchema],
+            app_configs.REDIS_CACHE_EXPIRATION_CAT, tags=("categories",),
+            local=True)
     async def list_categories(self):
         try:
             categories = await self.cat_repo.all()
@@ -86,6 +94,7 @@ class CategoryServices(BaseService):
             _data = data.model_dump(exclude_unset=True)
             if cat:
                 response = await self.cat_repo.update(cat, _data)
+                await cache.emit(CATEGORY_CHANGED)
             else:
                 raise ExcRaiser404(message='Category not found')
             if response:
@@ -104,6 +113,7 @@ class CategoryServices(BaseService):
         try:
             sub_category_dict = sub_cat.model_dump()
             sub_category = await self.sub_cat_repo.add(sub_category_dict)
+            await cache.emit(CATEGORY_CHANGED)
             return sub_category
         except Exception as e:
             raise ExcRaiser(
@@ -112,6 +122,9 @@ class CategoryServices(BaseService):
                 detail=repr(e)
             )
 
+    @cached("subcategory", GetSubCategorySchema,
+            app_configs.REDIS_CACHE_EXPIRATION_CAT, tags=("categories",),
+            local=True)
     async def get_subcat_by_id(self, id: str) -> GetSubCategorySchema:
         try:
             sub_category = await self.sub_cat_repo.get_by_attr({"id": id})
@@ -133,6 +146,9 @@ class CategoryServices(BaseService):
                 detail=repr(e)
             )
 
+    @cached("subcategories", list[GetSubCategorySchema],
+            app_configs.REDIS_CACHE_EXPIRATION_CAT, tags=("categories",),
+            local=True)
     async def list_sub_categories(self, full: bool = True):
         try:
             sub_categories = await self.sub_cat_repo.all()
@@ -164,6 +180,7 @@ class CategoryServices(BaseService):
             _data = data.model_dump(exclude_unset=True)
             if sub_cat:
                 response = await self.sub_cat_repo.update(sub_cat, _data)
+                await cache.emit(CATEGORY_CHANGED)
             else:
                 raise ExcRaiser404(message='Subcategory not found')
             if response:
@@ -1,11 +1,9 @@
-import cloudinary
-import cloudinary.uploader
 import inspect
 
 from fastapi import UploadFile
 from sqlalchemy.orm import Session
 
-from server.config import cloudinary_init
+from server.config import cloudinary_uploader
 from server.services.base_service import BaseService
 from server.schemas import (
     GetItemSchema,
@@ -16,6 +14,8 @@ from server.middlewares.exception_handler import (
     ExcRaiser404,
     ExcRaiser500
 )
+from server.utils.cache import cache, AUCTION_UPDATED
+from server.utils.trending import trending
 from starlette.concurrency import run_in_threadpool
 
 
@@ -24,6 +24,13 @@ class ItemServices(BaseService):
         self.repo = item_repo
         self.subcat_repo = sub_cat_repo
 
+    @staticmethod
+    async def _listing_changed(item):
+        """An item renders inside its auction's page and trending card."""
+        if item.auction_id:
+            await trending.forget_card(item.auction_id)
+            await cache.emit(AUCTION_UPDATED, auction_id=str(item.auction_id))
+
     async def create(self, data: dict[str, any]) -> GetItemSchema:
         try:
             category_ids = data.get("category_ids", [])
@@ -74,7 +81,7 @@ class ItemServices(BaseService):
                 if content is None:
                     continue
                 _result = await run_in_threadpool(
-                    cloudinary.uploader.upload,
+                    cloudinary_uploader().upload,
                     content,
                     folder=folder_path
                 )
@@ -85,6 +92,7 @@ class ItemServices(BaseService):
                 result = ImageLinkObj.model_validate(result).model_dump()
                 cloudn_resp['image_link' if idx == 1 else f'image_link_{idx}'] = result
             updated_entity = await self.repo.update(item, cloudn_resp)
+            await self._listing_changed(updated_entity[0])
             return GetItemSchema.model_validate(*updated_entity)
         except Exception as e:
             if issubclass(type(e), ExcRaiser):
@@ -95,6 +103,7 @@ class ItemServices(BaseService):
         try:
             entity = await self.repo.get_by_id(id)
             updated = await self.repo.update(entity, data)
+            await self._listing_changed(updated[0])
             return GetItemSchema.model_validate(updated[0])
         except ExcRaiser as e:
             raise
@@ -1,19 +1,19 @@
-from uuid import uuid4
+import hashlib
+from uuid import uuid4, UUID
 from jose import jwt
 from jose.exceptions import JWTError, JWTClaimsError, ExpiredSignatureError
 from datetime import datetime, timezone, timedelta
 import inspect
-import cloudinary
-import cloudinary.uploader
+from typing import List, Optional
 
 from sqlalchemy.orm import Session
 from fastapi import UploadFile
 from starlette.concurrency import run_in_threadpool
 from server.utils.ex_inspect import ExtInspect
-from server.models.users import Users
+from server.utils.notif_hub import NOTIF_CHANNEL
+from server.models.users import Users, pwd_context
 from server.enums.user_enums import TransactionStatus, TransactionTypes, UserRoles
-from passlib.context import CryptContext
-from server.config import app_configs, redis_store
+from server.config import app_configs, redis_store, cloudinary_uploader
 from server.utils import (
     is_valid_email,
     otp_generator,
@@ -64,14 +64,27 @@ from fastapi import HTTPException
 ############################ Notification Services ############################
 ###############################################################################
 
+# Per-user notification counters: HASH {unread, total}. Deltas only apply
+# to a counter that exists, so a missing one is always rebuilt from
+# Postgres instead of starting from a partial count.
+NOTIF_COUNT_KEY = "notif:count:{}"
+NOTIF_COUNT_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('HINCRBY', KEYS[1], 'unread', ARGV[1])
+    redis.call('HINCRBY', KEYS[1], 'total', ARGV[2])
+end
+"""
+
+
 class UserNotificationServices(BaseService):
     def __init__(self, notif_repo):
         self.repo = notif_repo
         self.debug = app_configs.DEBUG
+        self._bump = None
 
     @staticmethod
     def user_notif_channel(user_id: str) -> str:
-        return f"user_notif_{user_id}"
+        return NOTIF_CHANNEL.format(user_id)
 
     async def list(self, notice: NotificationQuery):
         try:
@@ -109,20 +122,26 @@ class UserNotificationServices(BaseService):
                 print(f"Unexpected error in {method_name}: {e}")
             raise ExcRaiser500(detail=str(e))
 
+    @staticmethod
+    def coalesce_key(notice: CreateNotificationSchema) -> Optional[str]:
+        """
+        Repeats about one auction (same user, auction, class and title)
+        share a key and are merged while the coalescing window is open.
+        Notices that name no auction are never merged.
+        """
+        if notice.auction_id is None:
+            return None
+        digest = hashlib.sha1(notice.title.encode()).hexdigest()[:16]
+        return (
+            f"notif:coalesce:{notice.user_id}:{notice.auction_id}:"
+            f"{notice.class_name}:{digest}"
+        )
+
     async def create(self, data: CreateNotificationSchema):
         try:
-            channel = self.user_notif_channel(data.user_id)
-            result = await self.repo.add(data.model_dump())
+            result = await self.create_many([data])
             if result:
-                valid_result = GetNotificationsSchema.model_validate(result)
-                if valid_result:
-                    # publish to redis
-                    async_redis = await redis_store.get_async_redis()
-                    _ = await async_redis.publish(
-                        channel,
-                        valid_result.model_dump_json()
-                    )
-                return valid_result
+                return result[0]
             raise ExcRaiser400(message='Unable to create Notification')
         except ExcRaiser as e:
             raise
@@ -132,12 +151,134 @@ class UserNotificationServices(BaseService):
                 print(f"Unexpected error in {method_name}: {e}")
             raise ExcRaiser500(detail=str(e))
 
+    # List: inside this class `list` is the method above.
+    async def create_many(
+        self, data: List[CreateNotificationSchema], commit: bool = True
+    ) -> List[GetNotificationsSchema]:
+        """
+        Creates notifications, coalescing repeats: within
+        NOTIF_COALESCE_WINDOW seconds, notifications sharing a
+        `coalesce_key` (those naming an auction) become one row (titled "<title> (n)", latest
+        message, back to unread) and one push. New rows go in with one
+        multi-row INSERT, merged ones with one bulk UPDATE; pushes are
+        published in one pipelined round trip.
+        """
+        try:
+            # Merge repeats within this batch first: key -> [notice, count]
+            batch: dict[str, list] = {}
+            inserts, merges = [], []
+            for notice in data:
+                key = self.coalesce_key(notice)
+                if key is None:
+                    inserts.append((None, notice.model_dump(), 1))
+                elif key in batch:
+                    batch[key] = [notice, batch[key][1] + 1]
+                else:
+                    batch[key] = [notice, 1]
+            if not batch and not inserts:
+                return []
+
+            # ...then into rows still inside their window: "id:count"
+            async_redis = await redis_store.get_async_redis()
+            windows = await async_redis.mget(list(batch)) if batch else []
+            for (key, (notice, count)), window in zip(batch.items(), windows):
+                row = notice.model_dump()
+                if window:
+                    notice_id, seen = window.split(':')
+                    count += int(seen)
+                    row = {
+                        'id': UUID(notice_id), 'message': row['message'],
+                        'read': False, 'updated_at': datetime.now(timezone.utc),
+                    }
+                if count > 1:
+                    row['title'] = f"{notice.title} ({count})"
+                (merges if window else inserts).append((key, row, count))
+
+            created = await self.repo.add_many(
+                [row for _, row, _ in inserts], commit=False
+            )
+            merged, reopened = await self.repo.merge_many(
+                [row for _, row, _ in merges], commit=False
+            )
+            if commit:
+                await self.repo.db.commit()
+
+            deltas: dict[str, list[int]] = {}
+            for notice in created:
+                delta = deltas.setdefault(str(notice.user_id), [0, 0])
+                delta[0] += 1
+                delta[1] += 1
+            for notice in merged:
+                if notice.id in reopened:
+                    deltas.setdefault(str(notice.user_id), [0, 0])[0] += 1
+            await self.bump_counts(deltas)
+
+            async with async_redis.pipeline(transaction=False) as pipe:
+                # add_many returns the rows in the order they were given
+                for (key, _, count), notice in zip(inserts, created):
+                    if key is None:
+                        continue
+                    pipe.set(
+                        key, f"{notice.id}:{count}",
+                        ex=app_configs.NOTIF_COALESCE_WINDOW,
+                    )
+                for key, row, count in merges:
+                    # The window is fixed from the first notification
+                    pipe.set(key, f"{row['id']}:{count}", keepttl=True)
+                await pipe.execute()
+
+            valid_results = [
+                GetNotificationsSchema.model_validate(notice)
+                for notice in [*created, *merged]
+            ]
+            if valid_results and commit:
+                await self.publish_many(valid_results)
+            return valid_results
+        except ExcRaiser as e:
+            raise
+        except Exception as e:
+            if self.debug:
+                method_name = inspect.stack()[0].frame.f_code.co_name
+                print(f"Unexpected error in {method_name}: {e}")
+            raise ExcRaiser500(detail=str(e))
+
+    async def publish_many(self, notices: List[GetNotificationsSchema]):
+        async_redis = await redis_store.get_async_redis()
+        async with async_redis.pipeline(transaction=False) as pipe:
+            for notice in notices:
+                pipe.publish(
+                    self.user_notif_channel(notice.user_id),
+                    notice.model_dump_json()
+                )
+            await pipe.execute()
+
+    async def bump_counts(self, deltas: dict[str, List[int]]):
+        """Applies `{user_id: [unread delta, total delta]}` to the counters."""
+        if not deltas:
+            return
+        async_redis = await redis_store.get_async_redis()
+        if self._bump is None:
+            self._bump = async_redis.register_script(NOTIF_COUNT_LUA)
+        async with async_redis.pipeline(transaction=False) as pipe:
+            for user_id, (unread, total) in deltas.items():
+                await self._bump(
+                    keys=[NOTIF_COUNT_KEY.format(user_id)],
+                    args=[unread, total],
+                    client=pipe,
+                )
+            await pipe.execute()
+
     async def update(self, id: str, read: bool):
         try:
             notice = await self.repo.get_by_id(id)
             if notice:
+                was_read = notice.read
                 result = await self.repo.save(notice, {"read": read})
                 if result:
+                    if was_read != read:
+                        await self.bump_counts(
+                            {str(notice.user_id): [-1 if read else 1, 0]}
+                        )
                     return True
             raise ExcRaiser404(message='Notification not found')
         except ExcRaiser as e:
@@ -148,17 +289,36 @@ class UserNotificationServices(BaseService):
                 print(f"Unexpected error in {method_name}: {e}")
             raise ExcRaiser500(detail=str(e))
 
+    async def mark_all_read(self, user_id: str) -> int:
+        try:
+            marked = await self.repo.mark_all_read(user_id)
+            await self.bump_counts({str(user_id): [-marked, 0]})
+            return marked
+        except ExcRaiser as e:
+            raise
+        except Exception as e:
+            if self.debug:
+                method_name = inspect.stack()[0].frame.f_code.co_name
+                print(f"Unexpected error in {method_name}: {e}")
+            raise ExcRaiser500(detail=str(e))
+
     async def count(self, user_id: str):
+        """
+        Reads the user's maintained counters; on a miss they are rebuilt
+        with one aggregate query. `reconcile_counts` repairs any drift.
+        """
         try:
-            notice = await self.repo.get_by_attr(attr={'user_id': user_id}, many=True)
-            if notice:
-                unread_len = len([n for n in notice if not n.read])
-                total = len(notice)
-                return {
-                    'unread': unread_len,
-                    'total': total
-                }
-            return {"unread": 0, "total": 0}
+            async_redis = await redis_store.get_async_redis()
+            key = NOTIF_COUNT_KEY.format(user_id)
+            unread, total = await async_redis.hmget(key, 'unread', 'total')
+            if unread is not None and total is not None:
+                return {'unread': max(int(unread), 0), 'total': int(total)}
+            counts = (await self.repo.counts([user_id]))[str(user_id)]
+            async with async_redis.pipeline(transaction=True) as pipe:
+                pipe.hset(key, mapping=counts)
+                pipe.expire(key, app_configs.NOTIF_COUNT_TTL)
+                await pipe.execute()
+            return counts
         except ExcRaiser as e:
             raise
         except Exception as e:
@@ -167,6 +327,35 @@ class UserNotificationServices(BaseService):
                 print(f"Unexpected error in {method_name}: {e}")
             raise ExcRaiser500(detail=str(e))
 
+    async def reconcile_counts(self, batch: int = 500) -> int:
+        """
+        Overwrites every cached counter with the aggregate from Postgres,
+        `batch` users per grouped query. Returns how many were checked.
+        """
+        async_redis = await redis_store.get_async_redis()
+        checked = 0
+        keys = []
+        async for key in async_redis.scan_iter(
+            match=NOTIF_COUNT_KEY.format('*'), count=batch
+        ):
+            keys.append(key)
+            if len(keys) >= batch:
+                checked += await self._reconcile(async_redis, keys)
+                keys = []
+        if keys:
+            checked += await self._reconcile(async_redis, keys)
+        return checked
+
+    async def _reconcile(self, async_redis, keys: List[str]) -> int:
+        prefix = NOTIF_COUNT_KEY.format('')
+        user_ids = [key[len(prefix):] for key in keys]
+        counts = await self.repo.counts(user_ids)
+        async with async_redis.pipeline(transaction=False) as pipe:
+            for user_id in user_ids:
+                pipe.hset(NOTIF_COUNT_KEY.format(user_id), mapping=counts[user_id])
+            await pipe.execute()
+        return len(user_ids)
+
 ###############################################################################
 ############################ Transaction Services ############################
 ###############################################################################
@@ -371,14 +560,13 @@ class UserServices(BaseService):
 
     def __init__(self, user_repo, notif_service, reward_service):
         self.repo = user_repo
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
         self.notification = notif_service
         self.reward_service = reward_service
         self.debug = app_configs.DEBUG
         self.inspect = ExtInspect(self.__class__.__name__).info
 
     def check_password(self, password, hashed_password) -> bool:
-        return self.pwd_context.verify(password, hashed_password)
+        return pwd_context().verify(password, hashed_password)
 
     async def __generate_token(self, user: Users) -> LoginToken:
         access_expires_at = datetime.now(tz=timezone.utc) + timedelta(
@@ -642,7 +830,8 @@ class UserServices(BaseService):
                     pages=result.pages,
                     count=result.count,
                     total=result.total,
-                    per_page=result.per_page
+                    per_page=result.per_page,
+                    next_cursor=result.next_cursor,
                 )
             raise ExcRaiser404(message='No User found')
         except ExcRaiser as e:
@@ -802,7 +991,7 @@ class UserServices(BaseService):
                 if data.password == data.confirm_password:
                     user = await self.repo.get_by_email(data.email)
                     _ = await self.repo.save(
-                        user, {"hash_password": self.pwd_context.hash(data.password)}
+                        user, {"hash_password": pwd_context().hash(data.password)}
                     )
                     _ = await async_redis.delete(f'reset_password:{data.email}')
                     return {'detail': 'Password reset successful'}
@@ -824,7 +1013,7 @@ class UserServices(BaseService):
                 raise ExcRaiser400(detail='Invalid old password')
             if data.new_password == data.confirm_password:
                 _ = await self.repo.save(
-                    user, {"hash_password": self.pwd_context.hash(data.new_password)}
+                    user, {"hash_password": pwd_context().hash(data.new_password)}
                 )
                 return {'detail': 'Password change successful'}
             raise ExcRaiser400(detail='Passwords do not match')
@@ -883,7 +1072,7 @@ class UserServices(BaseService):
 
             await self.repo.db.close()
             _result = await run_in_threadpool(
-                cloudinary.uploader.upload,
+                cloudinary_uploader().upload,
                 image.file,
                 folder="biddius/pp"
             )
@@ -0,0 +1,94 @@
+"""
+auction_schedule.py
+Deadline queue of auction lifecycle transitions, in Redis.
+
+One ZSET holds a member per pending transition, scored by its deadline:
+    activate:{auction_id}   at start_date (PENDING -> ACTIVE)
+    close:{auction_id}      at end_date   (ACTIVE  -> closed)
+
+Services register auctions as they are created or rescheduled and
+`server.events.auction_status_updater` sleeps until the earliest deadline,
+claims whatever is due and runs each transition in its own transaction.
+Claiming is a single atomic pop, so any number of updater replicas can
+share the queue without running a transition twice.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from server.config import redis_store
+from server.enums.auction_enums import AuctionStatus
+from server.utils.datetime_utils import now_utc
+
+
+SCHEDULE_KEY = "auction:schedule"
+ACTIVATE = "activate"
+CLOSE = "close"
+
+# KEYS: schedule   ARGV: now_ts, limit
+CLAIM_LUA = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+if #due > 0 then
+    redis.call('ZREM', KEYS[1], unpack(due))
+end
+return due
+"""
+
+
+class AuctionSchedule:
+    """Deadline queue of lifecycle transitions (see module docstring)."""
+
+    def __init__(self):
+        self._claim = None
+
+    async def add(self, action: str, auction_id: str, at: datetime):
+        redis = await redis_store.get_async_redis()
+        await redis.zadd(SCHEDULE_KEY, {f"{action}:{auction_id}": at.timestamp()})
+
+    async def schedule(self, auction):
+        """
+        Queues the next transition of `auction` (anything with id, status,
+        start_date and end_date) and forgets the one it no longer needs.
+        """
+        auction_id = str(auction.id)
+        redis = await redis_store.get_async_redis()
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.zrem(
+                SCHEDULE_KEY, f"{ACTIVATE}:{auction_id}", f"{CLOSE}:{auction_id}"
+            )
+            if auction.status == AuctionStatus.PENDING and auction.start_date:
+                pipe.zadd(
+                    SCHEDULE_KEY,
+                    {f"{ACTIVATE}:{auction_id}": auction.start_date.timestamp()},
+                )
+            elif auction.status == AuctionStatus.ACTIVE and auction.end_date:
+                pipe.zadd(
+                    SCHEDULE_KEY,
+                    {f"{CLOSE}:{auction_id}": auction.end_date.timestamp()},
+                )
+            await pipe.execute()
+
+    async def unschedule(self, auction_id: str):
+        redis = await redis_store.get_async_redis()
+        await redis.zrem(
+            SCHEDULE_KEY, f"{ACTIVATE}:{auction_id}", f"{CLOSE}:{auction_id}"
+        )
+
+    async def next_due(self) -> Optional[float]:
+        """Timestamp of the earliest queued transition, None if empty."""
+        redis = await redis_store.get_async_redis()
+        head = await redis.zrange(SCHEDULE_KEY, 0, 0, withscores=True)
+        return head[0][1] if head else None
+
+    async def claim(self, limit: int = 100) -> list[tuple[str, str]]:
+        """Atomically pops due transitions as `(action, auction_id)` pairs."""
+        redis = await redis_store.get_async_redis()
+        if self._claim is None:
+            self._claim = redis.register_script(CLAIM_LUA)
+        due = await self._claim(
+            keys=[SCHEDULE_KEY], args=[now_utc().timestamp(), limit]
+        )
+        return [tuple(member.split(":", 1)) for member in due]
+
+
+auction_schedule = AuctionSchedule()
@@ -0,0 +1,131 @@
+"""
+bid_board.py
+Incrementally maintained bid leaderboard of an auction, in Redis.
+
+Every accepted bid is applied as a delta: the bidder's entry is upserted,
+the auction's sequence number is bumped and the event is appended to a
+short replay log. Watchers get that one `new_bid` event instead of the
+whole list, and a client that missed events resyncs from the last
+sequence number it saw (or gets a fresh snapshot if the log no longer
+reaches that far back).
+
+Key layout (per auction):
+    auction:{id}:seq      last sequence number
+    auction:{id}:board    ZSET bidder id -> amount
+    auction:{id}:bidders  HASH bidder id -> entry JSON
+    auction:{id}:log      LIST of the latest event JSONs, oldest first
+"""
+
+import json
+from typing import Optional
+
+from server.config import redis_store, app_configs
+
+
+PARTS = ("seq", "board", "bidders", "log")
+
+# KEYS: seq, board, bidders, log
+# ARGV: bidder id, amount, entry JSON, log size
+# Returns the `new_bid` frame, or nil when the board was never built (the
+# caller rebuilds it from Postgres, which already holds this bid).
+APPLY_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return false
+end
+local seq = redis.call('INCR', KEYS[1])
+redis.call('ZADD', KEYS[2], ARGV[2], ARGV[1])
+redis.call('HSET', KEYS[3], ARGV[1], ARGV[3])
+local event = '{"type":"new_bid","seq":' .. seq .. ',"payload":' .. ARGV[3] .. '}'
+redis.call('RPUSH', KEYS[4], event)
+redis.call('LTRIM', KEYS[4], -tonumber(ARGV[4]), -1)
+return event
+"""
+
+
+class BidBoard:
+    """Per-auction leaderboard plus replay log (see module docstring)."""
+
+    def __init__(self):
+        self._apply = None
+
+    @staticmethod
+    def keys(auction_id: str) -> list[str]:
+        return [f"auction:{auction_id}:{part}" for part in PARTS]
+
+    @staticmethod
+    def entry(bid, username: str, image_link: dict = None) -> dict:
+        """One leaderboard row, in the shape clients already render."""
+        return {
+            "id": str(bid.user_id),
+            "username": username,
+            "amount": bid.amount,
+            "created_at": str(bid.created_at),
+            "avatar": (image_link or {}).get("link", None) or "",
+        }
+
+    async def seed(self, auction_id: str, entries: list[dict]):
+        """(Re)builds the board from a full list. The sequence is kept."""
+        redis = await redis_store.get_async_redis()
+        seq, board, bidders, log = self.keys(auction_id)
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.delete(board, bidders)
+            if entries:
+                pipe.zadd(board, {e["id"]: e["amount"] for e in entries})
+                pipe.hset(bidders, mapping={e["id"]: json.dumps(e) for e in entries})
+            pipe.setnx(seq, 0)
+            await pipe.execute()
+
+    async def apply(self, auction_id: str, entry: dict) -> Optional[str]:
+        """
+        Upserts one bidder and returns the serialized `new_bid` frame
+        (`{"type", "seq", "payload"}`), ready to broadcast as-is.
+        """
+        redis = await redis_store.get_async_redis()
+        if self._apply is None:
+            self._apply = redis.register_script(APPLY_LUA)
+        event = await self._apply(
+            keys=self.keys(auction_id),
+            args=[
+                entry["id"], entry["amount"], json.dumps(entry),
+                app_configs.BID_BOARD_LOG_SIZE,
+            ],
+        )
+        return event or None
+
+    async def snapshot(self, auction_id: str) -> Optional[tuple[int, list[dict]]]:
+        """Returns `(seq, entries by amount desc)`, None if not built."""
+        redis = await redis_store.get_async_redis()
+        seq, board, bidders, _ = self.keys(auction_id)
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.get(seq)
+            pipe.zrevrange(board, 0, -1)
+            pipe.hgetall(bidders)
+            last_seq, order, rows = await pipe.execute()
+        if last_seq is None:
+            return None
+        return int(last_seq), [json.loads(rows[i]) for i in order if i in rows]
+
+    async def since(self, auction_id: str, seq: int) -> Optional[list[dict]]:
+        """
+        `new_bid` frames after `seq`, oldest first. None when the log has
+        been trimmed past `seq` and the client needs a snapshot instead.
+        """
+        redis = await redis_store.get_async_redis()
+        last_seq, _, _, log = self.keys(auction_id)
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.get(last_seq)
+            pipe.lrange(log, 0, -1)
+            last_seq, events = await pipe.execute()
+        if last_seq is None or seq > int(last_seq):
+            return None
+        events = [json.loads(e) for e in events]
+        if int(last_seq) > seq and (not events or events[0]["seq"] > seq + 1):
+            return None
+        return [e for e in events if e["seq"] > seq]
+
+    async def drop(self, auction_id: str):
+        redis = await redis_store.get_async_redis()
+        await redis.delete(*self.keys(auction_id))
+
+
+bid_board = BidBoard()
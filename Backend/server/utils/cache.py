@@ -0,0 +1,472 @@
+"""
+cache.py
+Read-through cache for service reads, in Redis.
+
+Services wrap a read in `@cached(...)` instead of hand-rolling GET / SET
+around it, and announce writes with `cache.emit(event, ...)`:
+    single flight   one caller per key recomputes, within this process (a
+                    shared future) and across workers (a lock key); the
+                    others wait for its result
+    stale-while-    past its TTL an entry is still served for CACHE_STALE
+    revalidate      seconds; the one caller that takes the lock refreshes
+                    it, everyone else gets the stale value at once
+    jitter          TTLs are spread by +/- CACHE_JITTER so entries written
+                    together don't expire together
+    compact         msgpack, zstd-compressed past CACHE_COMPRESS_MIN bytes
+    tags            each entry is filed under the tags it depends on; an
+                    event drops every entry of its tags (EVENT_TAGS)
+    local tier      hot reads (`local=True`) are also kept decoded in a
+                    bounded in-process LRU (LocalTier), so a hit costs no
+                    round trip; drops are published on `cache:invalidate`
+                    and every worker applies them to its own tier
+
+An entry is `[fresh until, value]` with the value in JSON mode, validated
+back into the declared model on every read, so callers never share one
+instance. Dropping a tag also bumps its version: a recompute that read the
+database before the change finds the version moved and keeps its result
+to itself instead of writing it back.
+
+Key layout:
+    cache:{name}:{key}  entry: codec byte + msgpack (zstd past the minimum)
+    cache:lock:{key}    single-flight lock, CACHE_LOCK_TTL
+    cache:tag:{tag}     SET entry keys filed under the tag
+    cache:tagv:{tag}    tag version, bumped when the tag is dropped
+    cache:invalidate    channel: newline-separated tags just dropped
+"""
+
+import asyncio
+import functools
+import inspect
+import logging
+import random
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Iterable
+
+import msgpack
+import zstandard
+from pydantic import TypeAdapter
+
+from server.config import redis_store, app_configs
+
+
+ENTRY_KEY = "cache:{}"
+LOCK_KEY = "cache:lock:{}"
+TAG_KEY = "cache:tag:{}"
+TAG_VERSION_KEY = "cache:tagv:{}"
+TAG_VERSION_TTL = 60 * 60 * 24
+# Workers publish the tags they drop here, for the others' local tiers.
+INVALIDATE_CHANNEL = "cache:invalidate"
+
+PLAIN = b"m"
+COMPRESSED = b"z"
+
+logger = logging.getLogger(__name__)
+
+# Domain events -> tags whose entries they make stale
+BID_PLACED = "bid_placed"
+AUCTION_UPDATED = "auction_updated"
+CATEGORY_CHANGED = "category_changed"
+EVENT_TAGS = {
+    BID_PLACED: ("auction:{auction_id}",),
+    AUCTION_UPDATED: ("auction:{auction_id}",),
+    CATEGORY_CHANGED: ("categories",),
+}
+
+# KEYS: entry, n tag sets, n tag versions
+# ARGV: blob, ttl ms, n, the n versions read before loading
+# Returns 0 (nothing written) when a tag was dropped since.
+STORE_LUA = """
+local n = tonumber(ARGV[3])
+for i = 1, n do
+    if (redis.call('GET', KEYS[1 + n + i]) or '0') ~= ARGV[3 + i] then
+        return 0
+    end
+end
+redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+for i = 1, n do
+    redis.call('SADD', KEYS[1 + i], KEYS[1])
+    if redis.call('PTTL', KEYS[1 + i]) < tonumber(ARGV[2]) then
+        redis.call('PEXPIRE', KEYS[1 + i], ARGV[2])
+    end
+end
+return 1
+"""
+
+# KEYS: n tag sets, n tag versions
+# ARGV: version ttl
+DROP_TAGS_LUA = """
+local n = #KEYS / 2
+for i = 1, n do
+    redis.call('INCR', KEYS[n + i])
+    redis.call('EXPIRE', KEYS[n + i], ARGV[1])
+    local entries = redis.call('SMEMBERS', KEYS[i])
+    for j = 1, #entries, 500 do
+        redis.call('DEL', unpack(entries, j, math.min(j + 499, #entries)))
+    end
+    redis.call('DEL', KEYS[i])
+end
+return n
+"""
+
+# KEYS: lock
+# ARGV: owner token
+UNLOCK_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+@functools.cache
+def adapter(model) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+class LocalTier:
+    """
+    Bounded in-process LRU in front of Redis, by entries and by encoded
+    bytes. Holds fresh entries only, for at most CACHE_L1_TTL seconds.
+    """
+
+    def __init__(self):
+        # key -> (expires, fresh until, value, size, tags)
+        self._entries: OrderedDict[str, tuple] = OrderedDict()
+        self._tags: dict[str, set[str]] = {}
+        self.bytes = 0
+        # Bumped by every drop: a fill that read Redis before one is
+        # discarded rather than resurrect what the drop removed.
+        self.generation = 0
+
+    def get(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            self._pop(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[2]
+
+    def put(
+        self, key: str, fresh_until: float, value, size: int,
+        tags: list[str], generation: int,
+    ):
+        ttl = min(app_configs.CACHE_L1_TTL, fresh_until - time.time())
+        if generation != self.generation or ttl <= 0 \
+                or size > app_configs.CACHE_L1_MAX_BYTES:
+            return
+        self._pop(key)
+        self._entries[key] = (time.monotonic() + ttl, fresh_until, value, size, tags)
+        self.bytes += size
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while self._entries and (
+            len(self._entries) > app_configs.CACHE_L1_MAX_ENTRIES
+            or self.bytes > app_configs.CACHE_L1_MAX_BYTES
+        ):
+            self._pop(next(iter(self._entries)))
+
+    def _pop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.bytes -= entry[3]
+        for tag in entry[4]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def drop_tags(self, tags: Iterable[str]):
+        self.generation += 1
+        for tag in tags:
+            for key in list(self._tags.get(tag, ())):
+                self._pop(key)
+
+    def clear(self):
+        self.generation += 1
+        self._entries.clear()
+        self._tags.clear()
+        self.bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class Cache:
+    """Tagged read-through cache (see module docstring)."""
+
+    def __init__(self):
+        self._scripts = None
+        self._flights: dict[str, asyncio.Future] = {}
+        self._zstd = zstandard.ZstdCompressor(level=3)
+        self._unzstd = zstandard.ZstdDecompressor()
+        self.local = LocalTier()
+        self._pubsub_redis = None
+        self._pubsub = None
+        self._listener: asyncio.Task | None = None
+        self.stats = {"local_hits": 0, "hits": 0, "stale": 0, "misses": 0}
+
+    async def _redis(self):
+        redis = await redis_store.get_async_redis_raw()
+        if self._scripts is None:
+            self._scripts = (
+                redis.register_script(STORE_LUA),
+                redis.register_script(DROP_TAGS_LUA),
+                redis.register_script(UNLOCK_LUA),
+            )
+        return redis
+
+    # Codec
+    def encode(self, fresh_until: float, value) -> bytes:
+        packed = msgpack.packb([fresh_until, value])
+        if len(packed) >= app_configs.CACHE_COMPRESS_MIN:
+            return COMPRESSED + self._zstd.compress(packed)
+        return PLAIN + packed
+
+    def decode(self, blob: bytes) -> tuple[float, Any]:
+        packed = blob[1:]
+        if blob[:1] == COMPRESSED:
+            packed = self._unzstd.decompress(packed)
+        fresh_until, value = msgpack.unpackb(packed)
+        return fresh_until, value
+
+    # Reads
+    async def fetch(
+        self,
+        key: str,
+        load: Callable[[], Awaitable],
+        model,
+        ttl: int,
+        tags: Iterable[str] = (),
+        local: bool = False,
+    ):
+        """
+        The cached value of `key`, validated as `model`; `load()` computes
+        it on a miss or, for one caller, once it went stale. `local` keeps
+        it in this process's tier too.
+        """
+        key, tags = ENTRY_KEY.format(key), list(tags)
+        if local:
+            value = self.local.get(key)
+            if value is not None:
+                self.stats["local_hits"] += 1
+                return adapter(model).validate_python(value)
+            await self._listen()
+        generation = self.local.generation
+        redis = await self._redis()
+        blob = await redis.get(key)
+        if blob is not None:
+            fresh_until, value = self.decode(blob)
+            size = len(blob)
+            if fresh_until >= time.time():
+                self.stats["hits"] += 1
+            else:
+                self.stats["stale"] += 1
+                if key not in self._flights:
+                    fresh_until, value, size = await self._flight(
+                        key, load, model, ttl, tags, value
+                    )
+        else:
+            self.stats["misses"] += 1
+            fresh_until, value, size = await self._flight(
+                key, load, model, ttl, tags
+            )
+        if local:
+            self.local.put(key, fresh_until, value, size, tags, generation)
+        return adapter(model).validate_python(value)
+
+    async def _flight(self, key, load, model, ttl, tags, stale=None):
+        future = self._flights.get(key)
+        if future is None:
+            future = asyncio.ensure_future(
+                self._recompute(key, load, model, ttl, tags, stale)
+            )
+            self._flights[key] = future
+            future.add_done_callback(lambda _: self._flights.pop(key, None))
+        # One caller going away must not cancel the others' result.
+        return await asyncio.shield(future)
+
+    async def _recompute(self, key, load, model, ttl, tags, stale):
+        """`(fresh until, value, encoded size)`; a stale value is never fresh."""
+        redis = await self._redis()
+        store, _, unlock = self._scripts
+        lock, token = LOCK_KEY.format(key), uuid.uuid4().hex
+        if not await redis.set(
+            lock, token, nx=True, px=app_configs.CACHE_LOCK_TTL * 1000
+        ):
+            if stale is not None:
+                return 0, stale, 0  # another worker is refreshing it
+            result = await self._wait(redis, key, lock)
+            if result is not None:
+                return result
+            # No result from the holder: compute it here too.
+        try:
+            versions = []
+            if tags:
+                versions = [
+                    v or b"0" for v in await redis.mget(
+                        [TAG_VERSION_KEY.format(tag) for tag in tags]
+                    )
+                ]
+            value = adapter(model).dump_python(await load(), mode="json")
+            ttl = ttl * random.uniform(
+                1 - app_configs.CACHE_JITTER, 1 + app_configs.CACHE_JITTER
+            )
+            fresh_until = time.time() + ttl
+            blob = self.encode(fresh_until, value)
+            await store(
+                keys=[
+                    key,
+                    *(TAG_KEY.format(tag) for tag in tags),
+                    *(TAG_VERSION_KEY.format(tag) for tag in tags),
+                ],
+                args=[
+                    blob,
+                    int((ttl + app_configs.CACHE_STALE) * 1000),
+                    len(tags),
+                    *versions,
+                ],
+            )
+            return fresh_until, value, len(blob)
+        finally:
+            await unlock(keys=[lock], args=[token])
+
+    async def _wait(self, redis, key, lock):
+        """What another worker is computing, None once it gave up."""
+        deadline = time.monotonic() + app_configs.CACHE_LOCK_TTL
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.get(key)
+                pipe.exists(lock)
+                blob, locked = await pipe.execute()
+            if blob is not None:
+                return *self.decode(blob), len(blob)
+            if not locked:
+                break  # failed, or its result was invalidated meanwhile
+        return None
+
+    # Invalidation
+    async def invalidate(self, *tags: str):
+        """Drops every entry filed under `tags`, here and in every worker."""
+        if not tags:
+            return
+        self.local.drop_tags(tags)
+        redis = await self._redis()
+        _, drop_tags, _ = self._scripts
+        await drop_tags(
+            keys=[
+                *(TAG_KEY.format(tag) for tag in tags),
+                *(TAG_VERSION_KEY.format(tag) for tag in tags),
+            ],
+            args=[TAG_VERSION_TTL],
+        )
+        await redis.publish(INVALIDATE_CHANNEL, "\n".join(tags))
+
+    async def emit(self, event: str, **ids):
+        """A domain event happened (after its commit): drop what it staled."""
+        await self.invalidate(*(tag.format(**ids) for tag in EVENT_TAGS[event]))
+
+    async def _listen(self):
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._drop_published())
+
+    async def _drop_published(self):
+        """Applies other workers' invalidations to the local tier."""
+        while True:
+            try:
+                if self._pubsub is None:
+                    # Dedicated connection — pubsub must not share the general one
+                    self._pubsub_redis = await redis_store.get_pubsub_redis()
+                    self._pubsub = self._pubsub_redis.pubsub()
+                    await self._pubsub.subscribe(INVALIDATE_CHANNEL)
+                    # Whatever was published while unsubscribed is lost.
+                    self.local.clear()
+                async for message in self._pubsub.listen():
+                    if message["type"] == "message":
+                        self.local.drop_tags(message["data"].split("\n"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Cache invalidation listener error: {e}")
+                await self._reset_pubsub()
+                await asyncio.sleep(1)
+
+    async def _reset_pubsub(self):
+        pubsub, self._pubsub = self._pubsub, None
+        if pubsub is not None:
+            try:
+                await pubsub.aclose()
+                await self._pubsub_redis.aclose()
+            except Exception:
+                pass
+
+    # Metrics
+    def metrics(self) -> dict:
+        """This worker's hit ratios and local tier footprint."""
+        lookups = sum(self.stats.values())
+        served = lookups - self.stats["misses"]
+        return {
+            **self.stats,
+            "local_hit_ratio": self.stats["local_hits"] / lookups if lookups else 0.0,
+            "hit_ratio": served / lookups if lookups else 0.0,
+            "local_entries": len(self.local),
+            "local_bytes": self.local.bytes,
+            "local_max_bytes": app_configs.CACHE_L1_MAX_BYTES,
+        }
+
+    async def close(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+        await self._reset_pubsub()
+        self.local.clear()
+
+
+cache = Cache()
+
+
+def cached(
+    name: str,
+    model,
+    ttl: int,
+    tags: Iterable[str] = (),
+    key: Callable[..., str] = None,
+    local: bool = False,
+):
+    """
+    Caches an async service method under `cache:{name}:{key}`. `key`
+    builds the key from the call's arguments (default: their values
+    joined by ':'); `tags` are format strings over the arguments by name,
+    e.g. "auction:{id}". `local` adds the in-process tier, for hot reads.
+    `fn.uncached` bypasses the cache.
+    """
+    def wrap(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        async def inner(self, *args, **kwargs):
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            arguments.pop("self")
+            part = (
+                key(**arguments) if key
+                else ":".join(str(value) for value in arguments.values())
+            )
+            return await cache.fetch(
+                f"{name}:{part or '_'}",
+                lambda: fn(self, *args, **kwargs),
+                model,
+                ttl,
+                [tag.format(**arguments) for tag in tags],
+                local,
+            )
+        inner.uncached = fn
+        return inner
+    return wrap
@@ -1,10 +1,11 @@
-import os
+import asyncio
 import smtplib
 from datetime import datetime
 from smtplib import SMTP_SSL
 from email.message import EmailMessage
 from server.config.app_configs import app_configs
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from server.utils.mail_dispatcher import mail_dispatcher
+from server.utils.template_registry import templates
 
 
 class Emailer:
@@ -27,13 +28,7 @@ class Emailer:
         **kwargs
     ):
         self.kwargs = kwargs
-        self.env = Environment(
-            loader=FileSystemLoader(
-                os.path.join(os.path.dirname(__file__), '../templates')
-            ),
-            autoescape=select_autoescape(["html", "xml"]),
-        )
-        self.template = self.env.get_template(template_name)
+        self.template = templates.get(template_name)
         self.SUBJECT = subject
         self.TO = to
         self.CC = cc
@@ -42,8 +37,6 @@ class Emailer:
         self.message: EmailMessage = EmailMessage()
 
     async def enter(self):
-        self.server: SMTP_SSL = smtplib.SMTP_SSL(self.SERVER, self.PORT)
-        self.server.login(self.email, self.password)
         self.message["Subject"] = self.SUBJECT
         self.message["From"] = (
             f"Biddius <{self.FROM}>"
@@ -69,15 +62,26 @@ class Emailer:
 
     async def close(self):
         self.message.clear_content()
-        self.server.quit()
+        if self.server:
+            await asyncio.to_thread(self.server.quit)
+            self.server = None
 
     async def __aenter__(self):
         await self.enter()
         return self
 
+    def _connect_and_send(self):
+        self.server: SMTP_SSL = smtplib.SMTP_SSL(self.SERVER, self.PORT)
+        self.server.login(self.email, self.password)
+        self.server.send_message(self.message)
+
     async def send_message(self):
         # TODO: check user settings if `to` allows emails
-        self.server.send_message(self.message)
+        if mail_dispatcher.running:
+            # Pooled, already authenticated connection (see mail_dispatcher)
+            await mail_dispatcher.send(self.message)
+        else:
+            await asyncio.to_thread(self._connect_and_send)
         await self.close()
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -3,15 +3,16 @@ import random
 import re
 import string
 import importlib
-from typing import Any
 import base64
 import inspect
+from datetime import datetime
 
 from fastapi import Depends
-from pydantic import BaseModel
 
 from server.config import app_configs
-from server.middlewares.exception_handler import ExcRaiser, ExcRaiser500
+from server.middlewares.exception_handler import (
+    ExcRaiser, ExcRaiser400, ExcRaiser500
+)
 
 # from server.repositories import get_category_repo, get_sub_category_repo
 
@@ -91,64 +92,40 @@ def paginator(page: int, item_per_page: int) -> int:
     return (page - 1) * item_per_page if page > 1 else 0
 
 
-def cache_obj_format(entity: BaseModel | list[BaseModel] | Any) -> str:
-    """
-    Returns the cache object format.
-    """
-    if isinstance(entity, list) and len(entity) == 0:
-        return []
-    if isinstance(entity, list):
-        temp = []
-        for ent in entity:
-            if issubclass(type(ent), BaseModel):
-                temp.append(ent.model_dump_json())
-            else:
-                temp.append(json.dumps(ent))
-        return json.dumps(temp)
-    elif isinstance(entity, BaseModel):
-        return entity.model_dump_json()
-    elif isinstance(entity, dict):
-        return json.dumps(entity)
-    elif isinstance(entity, str):
-        return entity
-    elif isinstance(entity, int):
-        return str(entity)
-    elif isinstance(entity, float):
-        return str(entity)
-    else:
-        return json.dumps(entity)
-
-
-def load_obj_from_cache(
-    obj: str,
-    model: BaseModel | None = None,
-) -> BaseModel | dict:
-    """
-    Loads the object from cache.
-    
-    Parameters:
-        obj (str | dict): The object to load.
-        
-    Returns:
-        BaseModel | dict: The loaded object.
+def encode_cursor(values: list) -> str:
     """
+    Packs the keyset of the last row on a page (sort value, id) into an
+    opaque, url-safe cursor for the next page.
+    """
+    packed = [
+        {"dt": v.isoformat()} if isinstance(v, datetime) else
+        v if isinstance(v, (int, float, str, type(None))) else str(v)
+        for v in values
+    ]
+    raw = json.dumps(packed, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    """Reverses `encode_cursor`. Raises a 400 on a malformed cursor."""
     try:
-        obj = json.loads(obj)
-        if isinstance(obj, list):
-            temp = []
-            for ent in obj:
-                if model:
-                    temp.append(model.model_validate_json(ent))
-                else:
-                    temp.append(ent)
-            return temp
-        elif isinstance(obj, dict):
-            if model:
-                return model.model_validate_json(obj)
-        else:
-            return obj
-    except Exception as e:
-        raise TypeError(f"Invalid type: {type(obj)}")
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        return [
+            datetime.fromisoformat(v["dt"]) if isinstance(v, dict) else v
+            for v in values
+        ]
+    except Exception:
+        raise ExcRaiser400(detail="Invalid pagination cursor")
+
+
+def prefix_tsquery(term: str) -> str | None:
+    """
+    Turns free text into a `to_tsquery` string matching every word as a
+    prefix ("red sho" -> "red:* & sho:*"). None when no word is left.
+    """
+    words = re.findall(r"\w+", (term or "").lower())
+    return " & ".join(f"{w}:*" for w in words) or None
 
 
 def generate_referral_code(username: str) -> str:
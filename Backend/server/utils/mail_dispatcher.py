@@ -0,0 +1,167 @@
+"""
+mail_dispatcher.py
+Concurrent mail delivery over a bounded pool of persistent SMTP sessions.
+
+`MailDispatcher` runs N workers; each owns one authenticated SMTP
+connection, kept open between messages and reopened when the server
+drops it. A worker takes up to `batch` queued messages at a time and
+sends them over its connection in one go. smtplib is blocking, so every
+connection is driven from a worker thread and the event loop stays free.
+
+`Emailer.send_message` goes through the process-wide `mail_dispatcher`
+once it has been started (the subscriber does this); elsewhere Emailer
+keeps sending on its own short-lived connection.
+"""
+
+import asyncio
+import logging
+import smtplib
+from email.message import EmailMessage
+
+from server.config.app_configs import app_configs
+
+
+logger = logging.getLogger(__name__)
+
+
+class SMTPSession:
+    """One persistent, authenticated SMTP connection."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str = None,
+        password: str = None,
+        use_ssl: bool = True,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_ssl = use_ssl
+        self.server: smtplib.SMTP | None = None
+
+    def open(self):
+        smtp = smtplib.SMTP_SSL if self.use_ssl else smtplib.SMTP
+        self.server = smtp(self.host, self.port)
+        if self.username:
+            self.server.login(self.username, self.password)
+
+    def close(self):
+        if self.server is None:
+            return
+        try:
+            self.server.quit()
+        except smtplib.SMTPException:
+            pass
+        finally:
+            self.server = None
+
+    def send_batch(self, messages: list[EmailMessage]) -> list[Exception | None]:
+        """
+        Sends `messages` in order over this connection, reconnecting once
+        if the server hung up. Returns one error (or None) per message.
+        """
+        results = []
+        for message in messages:
+            try:
+                if self.server is None:
+                    self.open()
+                try:
+                    self.server.send_message(message)
+                except smtplib.SMTPServerDisconnected:
+                    self.server = None
+                    self.open()
+                    self.server.send_message(message)
+                results.append(None)
+            except Exception as e:
+                # Don't reuse a connection in an unknown state
+                self.close()
+                results.append(e)
+        return results
+
+
+class MailDispatcher:
+    """Queue plus N SMTP workers (see module docstring)."""
+
+    def __init__(
+        self,
+        workers: int = None,
+        batch: int = None,
+        host: str = None,
+        port: int = None,
+        username: str = None,
+        password: str = None,
+        use_ssl: bool = True,
+    ):
+        settings = app_configs.email_settings
+        self.workers = workers or app_configs.MAIL_WORKERS
+        self.batch = batch or app_configs.MAIL_BATCH
+        self.host = host or settings.MAIL_SERVER
+        self.port = port or settings.MAIL_PORT
+        self.username = settings.MAIL_USERNAME if username is None else username
+        self.password = settings.MAIL_PASSWORD if password is None else password
+        self.use_ssl = use_ssl
+        self.queue: asyncio.Queue | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self):
+        if self.running:
+            return
+        self.queue = asyncio.Queue(maxsize=app_configs.MAIL_QUEUE_SIZE)
+        self._tasks = [
+            asyncio.create_task(self._worker(i)) for i in range(self.workers)
+        ]
+        logger.info(f"📮 Mail dispatcher started with {self.workers} worker(s)")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def send(self, message: EmailMessage):
+        """Queues `message` and waits until it was handed to the server."""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((message, future))
+        await future
+
+    async def _worker(self, index: int):
+        session = SMTPSession(
+            self.host, self.port, self.username, self.password, self.use_ssl
+        )
+        try:
+            while True:
+                try:
+                    first = await asyncio.wait_for(
+                        self.queue.get(), app_configs.MAIL_IDLE_TIMEOUT
+                    )
+                except asyncio.TimeoutError:
+                    # Servers drop idle sessions anyway; release ours first.
+                    await asyncio.to_thread(session.close)
+                    continue
+                items = [first]
+                while len(items) < self.batch and not self.queue.empty():
+                    items.append(self.queue.get_nowait())
+
+                results = await asyncio.to_thread(
+                    session.send_batch, [message for message, _ in items]
+                )
+                for (_, future), error in zip(items, results):
+                    if future.done():
+                        continue
+                    if error is None:
+                        future.set_result(True)
+                    else:
+                        future.set_exception(error)
+        except asyncio.CancelledError:
+            await asyncio.to_thread(session.close)
+            raise
+
+
+mail_dispatcher = MailDispatcher()
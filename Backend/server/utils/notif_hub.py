@@ -0,0 +1,97 @@
+"""
+notif_hub.py
+Per-process fan-in of the notification channels.
+
+Every `/notifications/subscribe` stream used to open its own Redis
+connection, subscribe to `user_notif_{id}` and poll it every second, so
+connections and wake-ups grew with the users online. Now each worker
+holds one `PSUBSCRIBE user_notif_*` on one connection; a single listener
+task routes each message to the in-memory queues of that user's streams
+on this worker, and an idle stream sleeps on its queue.
+
+Channels:
+    user_notif_{user_id}  GetNotificationsSchema JSON (publish_many)
+"""
+
+import asyncio
+import logging
+
+from server.config import redis_store, app_configs
+
+
+NOTIF_CHANNEL = "user_notif_{}"
+NOTIF_PATTERN = NOTIF_CHANNEL.format("*")
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationHub:
+    """One pattern subscription per worker (see module docstring)."""
+
+    def __init__(self):
+        self._redis = None
+        self._pubsub = None
+        self._listener: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+        self._queues: dict[str, set[asyncio.Queue]] = {}
+
+    async def _start(self):
+        async with self._lock:
+            if self._pubsub is None:
+                # Dedicated connection — pubsub must not share the general one
+                self._redis = await redis_store.get_pubsub_redis()
+                self._pubsub = self._redis.pubsub()
+                await self._pubsub.psubscribe(NOTIF_PATTERN)
+            if self._listener is None or self._listener.done():
+                self._listener = asyncio.create_task(self._listen())
+
+    async def _listen(self):
+        """Routes published notifications to the local streams' queues."""
+        prefix = NOTIF_CHANNEL.format("")
+        while self._pubsub is not None:
+            try:
+                # Blocks on the socket until a message arrives; no polling.
+                async for message in self._pubsub.listen():
+                    if message["type"] != "pmessage":
+                        continue
+                    self.dispatch(message["channel"][len(prefix):], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Notification fan-in error: {e}")
+                await asyncio.sleep(1)
+
+    def dispatch(self, user_id: str, data: str):
+        for queue in self._queues.get(user_id, ()):
+            if queue.full():
+                # A stream that stopped reading only needs the latest ones.
+                queue.get_nowait()
+            queue.put_nowait(data)
+
+    async def subscribe(self, user_id) -> asyncio.Queue:
+        """Queue receiving `user_id`'s notifications until `unsubscribe`."""
+        queue = asyncio.Queue(maxsize=app_configs.NOTIF_STREAM_QUEUE_SIZE)
+        self._queues.setdefault(str(user_id), set()).add(queue)
+        await self._start()
+        return queue
+
+    def unsubscribe(self, user_id, queue: asyncio.Queue):
+        queues = self._queues.get(str(user_id))
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._queues[str(user_id)]
+
+    async def close(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+        self._queues.clear()
+        if self._pubsub is not None:
+            pubsub, self._pubsub = self._pubsub, None
+            await pubsub.aclose()
+            await self._redis.aclose()
+
+
+notif_hub = NotificationHub()
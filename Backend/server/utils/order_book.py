@@ -0,0 +1,311 @@
+"""
+order_book.py
+Per-auction order book held in Redis.
+
+Bid acceptance used to serialize every bidder of an auction on a single
+`SELECT ... FOR UPDATE` of the auction row. The order book moves the
+accept/reject decision into one Lua script per bid, so validating and
+advancing the highest bid is atomic, independent of how many bids the
+auction already has, and never touches Postgres.
+
+Postgres stays the system of record:
+  - the bid row and the wallet movement are still written by BidServices
+    right after the book accepts (only the bidder's own user row is locked);
+  - `auctions.current_price` / `auctions.buy_now` are written behind, in
+    batches, by `OrderBook.flush` (scheduler tick + auction close).
+
+Key layout (one hash per auction):
+    orderbook:{auction_id}  status, end_ts, owner, private, current_price,
+                            buy_now, buy_now_price, high_bidder, high_bid,
+                            version
+    orderbook:dirty         set of auction ids whose price awaits a flush
+"""
+
+import uuid
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from sqlalchemy import update as sa_update, bindparam
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from server.config import redis_store, app_configs
+from server.enums.auction_enums import AuctionStatus
+from server.utils.datetime_utils import now_utc
+
+
+BOOK_KEY = "orderbook:{}"
+DIRTY_KEY = "orderbook:dirty"
+
+# Seeds a book only if nobody else did in the meantime; a concurrent seeder
+# could otherwise overwrite bids accepted right after the first seed.
+SEED_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return 0
+end
+redis.call('HSET', KEYS[1], unpack(ARGV, 2))
+redis.call('EXPIREAT', KEYS[1], ARGV[1])
+return 1
+"""
+
+# ARGV: bidder, amount, now_ts, mode ('bid' | 'buy_now'), auction_id
+# Returns {code, version, prev_bidder, prev_bid, buy_now_disabled, price}.
+# Numbers are returned as strings: Redis truncates Lua numbers to integers.
+PLACE_LUA = """
+local book = KEYS[1]
+if redis.call('EXISTS', book) == 0 then
+    return {'MISSING'}
+end
+local f = redis.call('HMGET', book,
+    'status', 'end_ts', 'owner', 'current_price', 'buy_now',
+    'buy_now_price', 'high_bidder', 'high_bid', 'version')
+local status, end_ts, owner = f[1], tonumber(f[2]), f[3]
+local current_price = tonumber(f[4]) or 0
+local buy_now = f[5] == '1'
+local buy_now_price = tonumber(f[6]) or 0
+local prev_bidder, prev_bid = f[7] or '', f[8] or '0'
+local bidder, amount, now, mode = ARGV[1], tonumber(ARGV[2]), tonumber(ARGV[3]), ARGV[4]
+
+if status ~= 'ACTIVE' then return {'NOT_ACTIVE'} end
+if end_ts <= now then return {'ENDED'} end
+if bidder == owner then return {'OWNER'} end
+
+local disabled = '0'
+if mode == 'buy_now' then
+    if not buy_now then return {'BUY_NOW_DISABLED'} end
+    amount = buy_now_price
+    -- No other bid may land while the buyer's payment is persisted.
+    redis.call('HSET', book, 'status', 'CLOSING')
+else
+    if buy_now and amount >= buy_now_price then return {'BUY_NOW'} end
+    if amount <= current_price then return {'LOW'} end
+    if buy_now and amount >= buy_now_price * 0.9 then
+        redis.call('HSET', book, 'buy_now', '0')
+        disabled = '1'
+    end
+end
+
+redis.call('HSET', book,
+    'current_price', tostring(amount),
+    'high_bidder', bidder,
+    'high_bid', tostring(amount))
+local version = redis.call('HINCRBY', book, 'version', 1)
+redis.call('SADD', KEYS[2], ARGV[5])
+return {'OK', tostring(version), prev_bidder, prev_bid, disabled, tostring(amount)}
+"""
+
+# ARGV: version, prev_bidder, prev_bid, buy_now_disabled, mode
+# Undoes an accepted bid whose Postgres write failed, but only while it is
+# still the latest one; a newer (higher) bid already supersedes it.
+REVERT_LUA = """
+local book = KEYS[1]
+if redis.call('HGET', book, 'version') ~= ARGV[1] then
+    return 0
+end
+local prev = tonumber(ARGV[3]) or 0
+local base = tonumber(redis.call('HGET', book, 'base_price')) or 0
+redis.call('HSET', book,
+    'high_bidder', ARGV[2],
+    'high_bid', ARGV[3],
+    'current_price', tostring(math.max(prev, base)))
+if ARGV[4] == '1' then redis.call('HSET', book, 'buy_now', '1') end
+if ARGV[5] == 'buy_now' then redis.call('HSET', book, 'status', 'ACTIVE') end
+redis.call('HINCRBY', book, 'version', 1)
+return 1
+"""
+
+
+class PlacedBid(NamedTuple):
+    """Outcome of `OrderBook.place`."""
+    code: str
+    version: Optional[str] = None
+    prev_bidder: Optional[str] = None
+    prev_bid: float = 0.0
+    buy_now_disabled: bool = False
+    amount: float = 0.0
+    mode: str = "bid"
+
+    @property
+    def accepted(self) -> bool:
+        return self.code == "OK"
+
+
+class OrderBook:
+    """Atomic per-auction bid book (see module docstring)."""
+
+    def __init__(self):
+        self._place = None
+        self._seed = None
+        self._revert = None
+
+    async def _scripts(self):
+        redis = await redis_store.get_async_redis()
+        if self._place is None:
+            self._place = redis.register_script(PLACE_LUA)
+            self._seed = redis.register_script(SEED_LUA)
+            self._revert = redis.register_script(REVERT_LUA)
+        return redis
+
+    @staticmethod
+    def key(auction_id: str) -> str:
+        return BOOK_KEY.format(auction_id)
+
+    async def seed(self, auction_id: str, snapshot: dict) -> bool:
+        """
+        Loads a book from a Postgres snapshot (see
+        `AuctionRepository.get_order_book_seed`). The book expires a grace
+        period after the auction ends so closed auctions don't linger.
+        """
+        await self._scripts()
+        end_date: datetime = snapshot["end_date"]
+        expire_at = int(end_date.timestamp()) + app_configs.ORDER_BOOK_GRACE
+        status = snapshot["status"]
+        fields = {
+            "status": (
+                status.name if isinstance(status, AuctionStatus)
+                else str(status).upper()
+            ),
+            "end_ts": end_date.timestamp(),
+            "owner": str(snapshot["users_id"]),
+            "private": int(bool(snapshot["private"])),
+            "base_price": snapshot["current_price"] or 0.0,
+            "current_price": snapshot["current_price"] or 0.0,
+            "buy_now": int(bool(snapshot["buy_now"])),
+            "buy_now_price": snapshot["buy_now_price"] or 0.0,
+            "high_bidder": str(snapshot["high_bidder"] or ""),
+            "high_bid": snapshot["high_bid"] or 0.0,
+            "version": 0,
+        }
+        args = [expire_at]
+        for field, value in fields.items():
+            args.extend([field, str(value)])
+        return bool(await self._seed(keys=[self.key(auction_id)], args=args))
+
+    async def place(
+        self,
+        auction_id: str,
+        bidder_id: str,
+        amount: float,
+        mode: str = "bid",
+    ) -> PlacedBid:
+        """Validates and advances the book in one step."""
+        await self._scripts()
+        res = await self._place(
+            keys=[self.key(auction_id), DIRTY_KEY],
+            args=[
+                str(bidder_id), str(amount or 0.0),
+                now_utc().timestamp(), mode, str(auction_id)
+            ],
+        )
+        if res[0] != "OK":
+            return PlacedBid(code=res[0], mode=mode)
+        return PlacedBid(
+            code="OK",
+            version=res[1],
+            prev_bidder=res[2] or None,
+            prev_bid=float(res[3]),
+            buy_now_disabled=res[4] == "1",
+            amount=float(res[5]),
+            mode=mode,
+        )
+
+    async def revert(self, auction_id: str, placed: PlacedBid) -> bool:
+        if not placed or not placed.accepted:
+            return False
+        await self._scripts()
+        return bool(await self._revert(
+            keys=[self.key(auction_id)],
+            args=[
+                placed.version, placed.prev_bidder or "",
+                str(placed.prev_bid), int(placed.buy_now_disabled), placed.mode
+            ],
+        ))
+
+    async def peek(self, auction_id: str) -> Optional[dict]:
+        """
+        The book's fields a bidder is checked against before `place`
+        (private, buy_now, buy_now_price); None when there is no book.
+        """
+        redis = await redis_store.get_async_redis()
+        private, buy_now, buy_now_price = await redis.hmget(
+            self.key(auction_id), "private", "buy_now", "buy_now_price"
+        )
+        if private is None:
+            return None
+        return {
+            "private": private == "1",
+            "buy_now": buy_now == "1",
+            "buy_now_price": float(buy_now_price or 0.0),
+        }
+
+    async def drop(self, auction_id: str):
+        """
+        Forgets a book after its auction changed outside the bid path
+        (status transition, seller edit, restart). The next bid reseeds it.
+        """
+        redis = await redis_store.get_async_redis()
+        await redis.delete(self.key(auction_id))
+
+    async def mark_dirty(self, auction_ids: list[str]):
+        """Queues prices again, e.g. after the flush's commit failed."""
+        if auction_ids:
+            redis = await redis_store.get_async_redis()
+            await redis.sadd(DIRTY_KEY, *[str(i) for i in auction_ids])
+
+    async def flush(
+        self, db: AsyncSession, auction_ids: list[str] = None
+    ) -> list[str]:
+        """
+        Writes the latest accepted price (and the buy-now switch) of dirty
+        books to `auctions` with a single executemany UPDATE and returns
+        the ids written. `auction_ids` limits the flush to those auctions,
+        e.g. right before closing one. The caller owns the transaction and
+        calls `mark_dirty` if its commit fails.
+        """
+        from server.models.auction import Auctions
+
+        redis = await redis_store.get_async_redis()
+        if auction_ids:
+            ids = [str(i) for i in auction_ids]
+            removed = await redis.srem(DIRTY_KEY, *ids)
+            if not removed:
+                return []
+        else:
+            ids = await redis.spop(DIRTY_KEY, app_configs.ORDER_BOOK_FLUSH_BATCH)
+        if not ids:
+            return []
+
+        async with redis.pipeline(transaction=False) as pipe:
+            for auction_id in ids:
+                pipe.hmget(self.key(auction_id), "current_price", "buy_now")
+            snapshots = await pipe.execute()
+
+        rows = [
+            {
+                "_id": uuid.UUID(auction_id),
+                "_price": float(price),
+                "_buy_now": buy_now == "1",
+            }
+            for auction_id, (price, buy_now) in zip(ids, snapshots)
+            if price is not None
+        ]
+        if not rows:
+            return []
+
+        table = Auctions.__table__
+        stmt = (
+            sa_update(table)
+            .where(table.c.id == bindparam("_id"))
+            # Never move a price backwards if a slower writer races us.
+            .where(table.c.current_price <= bindparam("_price"))
+            .values(current_price=bindparam("_price"), buy_now=bindparam("_buy_now"))
+        )
+        try:
+            await db.execute(stmt, rows)
+        except Exception:
+            # Keep them dirty so the next tick retries.
+            await self.mark_dirty([r["_id"] for r in rows])
+            raise
+        return [str(r["_id"]) for r in rows]
+
+
+order_book = OrderBook()
@@ -0,0 +1,182 @@
+"""
+principal_cache.py
+Short-lived cache of authenticated principals, in front of `users`.
+
+Two tiers, both keyed by user id:
+    L1  in-process LRU, PRINCIPAL_L1_SIZE entries for PRINCIPAL_L1_TTL s
+    L2  Redis `principal:{user_id}` (GetUserSchema JSON) for PRINCIPAL_TTL s
+L1 also remembers, per token, that it was checked against the logout
+blacklist, so a warm request needs no Redis or database round trip; a
+cold one gets the blacklist flag and the principal in one pipeline.
+
+Invalidation: any flushed change to a Users row is recorded on the
+session and both tiers are dropped once it commits; bulk UPDATEs that
+bypass the unit of work call `touch`. Logout calls `revoke`. Other
+processes' L1 entries age out within PRINCIPAL_L1_TTL.
+"""
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from server.config import redis_store, app_configs
+from server.models.users import Users
+from server.schemas import GetUserSchema
+
+
+PRINCIPAL_KEY = "principal:{}"
+BLACKLIST_KEY = "blacklist_{}"
+SESSION_KEY = "principal_cache.dirty"
+
+
+class PrincipalCache:
+    """Two-tier principal cache (see module docstring)."""
+
+    def __init__(self):
+        self._users: OrderedDict[str, tuple[float, GetUserSchema]] = OrderedDict()
+        self._tokens: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._tasks: set[asyncio.Task] = set()
+
+    def _local_get(self, table: OrderedDict, key: str):
+        entry = table.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < time.monotonic():
+            table.pop(key, None)
+            return None
+        table.move_to_end(key)
+        return value
+
+    def _local_put(self, table: OrderedDict, key: str, value):
+        table[key] = (time.monotonic() + app_configs.PRINCIPAL_L1_TTL, value)
+        table.move_to_end(key)
+        while len(table) > app_configs.PRINCIPAL_L1_SIZE:
+            table.popitem(last=False)
+
+    async def lookup(
+        self, token: str, user_id: str
+    ) -> tuple[bool, Optional[GetUserSchema]]:
+        """
+        `(blacklisted, principal)` for a decoded token. The principal is
+        None on a miss; the caller loads it and hands it to `put`.
+        """
+        checked = self._local_get(self._tokens, token) == user_id
+        principal = self._local_get(self._users, user_id)
+        if checked and principal is not None:
+            return False, principal
+
+        redis = await redis_store.get_async_redis()
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.get(BLACKLIST_KEY.format(token))
+            pipe.get(PRINCIPAL_KEY.format(user_id))
+            blacklisted, cached = await pipe.execute()
+        if blacklisted:
+            return True, None
+        self._local_put(self._tokens, token, user_id)
+        if principal is None and cached:
+            principal = GetUserSchema.model_validate_json(cached)
+            self._local_put(self._users, user_id, principal)
+        return False, principal
+
+    async def get(self, user_id: str) -> Optional[GetUserSchema]:
+        """Principal by id alone (no token check), None on a miss."""
+        principal = self._local_get(self._users, user_id)
+        if principal is None:
+            redis = await redis_store.get_async_redis()
+            cached = await redis.get(PRINCIPAL_KEY.format(user_id))
+            if cached:
+                principal = GetUserSchema.model_validate_json(cached)
+                self._local_put(self._users, user_id, principal)
+        return principal
+
+    async def put(self, principal: GetUserSchema):
+        user_id = str(principal.id)
+        self._local_put(self._users, user_id, principal)
+        redis = await redis_store.get_async_redis()
+        await redis.setex(
+            PRINCIPAL_KEY.format(user_id),
+            app_configs.PRINCIPAL_TTL,
+            principal.model_dump_json(),
+        )
+
+    async def invalidate(self, user_ids: Iterable):
+        keys = []
+        for user_id in user_ids:
+            self._users.pop(str(user_id), None)
+            keys.append(PRINCIPAL_KEY.format(user_id))
+        if keys:
+            redis = await redis_store.get_async_redis()
+            await redis.delete(*keys)
+
+    async def revoke(self, token: str, user_id=None):
+        """
+        Logout: blacklist the token for the rest of its lifetime, forget
+        its check and, if known, its principal.
+        """
+        redis = await redis_store.get_async_redis()
+        await redis.setex(
+            BLACKLIST_KEY.format(token),
+            app_configs.security.ACCESS_TOKEN_EXPIRES * 3600,
+            json.dumps({"token": token}),
+        )
+        self._tokens.pop(token, None)
+        if user_id is not None:
+            await self.invalidate([user_id])
+
+    def forget(self, user_ids: Iterable):
+        """Sync form of `invalidate`, for session events."""
+        user_ids = [str(user_id) for user_id in user_ids]
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Sync sessions outside the event loop (scheduler jobs)
+            for user_id in user_ids:
+                self._users.pop(user_id, None)
+            redis_store.redis.delete(*(PRINCIPAL_KEY.format(u) for u in user_ids))
+            return
+        task = loop.create_task(self.invalidate(user_ids))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def touch(self, session, user_ids: Iterable):
+        """
+        For writes the unit of work does not see (bulk UPDATEs): drops the
+        principals now and again once `session` commits.
+        """
+        user_ids = set(user_ids)
+        if not user_ids:
+            return
+        self.forget(user_ids)
+        session = getattr(session, "sync_session", session)
+        session.info.setdefault(SESSION_KEY, set()).update(user_ids)
+
+
+principal_cache = PrincipalCache()
+
+
+@event.listens_for(Session, "after_flush")
+def _track_users(session, flush_context):
+    changed = {
+        obj.id for obj in (*session.dirty, *session.deleted)
+        if isinstance(obj, Users) and obj.id is not None
+    }
+    if changed:
+        session.info.setdefault(SESSION_KEY, set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _forget_users(session):
+    changed = session.info.pop(SESSION_KEY, None)
+    if changed:
+        principal_cache.forget(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_users(session):
+    session.info.pop(SESSION_KEY, None)
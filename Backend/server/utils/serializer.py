@@ -0,0 +1,173 @@
+"""
+serializer.py
+Compiled ORM -> JSON serialization for the hot listing endpoints.
+
+The default path turns every row into a dict with `BaseModel.to_dict`
+(recursive, stringifying as it goes), validates that into a response
+schema, and FastAPI validates and serializes the whole response again.
+
+`CompiledSerializer.of(schema)` instead walks the pydantic schema once
+and keeps a flat plan: one (field, nested plan, default) entry per field.
+Rows are then read straight off the ORM objects (only relationships
+and deferred columns that were loaded, so no lazy IO), enums reduced to
+their values, and the response envelope is dumped to JSON bytes in one
+pass by pydantic-core. A schema's `counted` list counts are filled in by
+the plan; a schema with any other validator, serializer or a custom
+__init__ has its rows passed through the schema after the plan reads them.
+Endpoints return that through `json_response`, which skips FastAPI's
+response-model round trip.
+"""
+
+import types
+import typing as t
+from enum import Enum
+from functools import cache
+
+import pydantic as pyd
+from fastapi import Response
+from pydantic_core import PydanticUndefined
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.exc import NoInspectionAvailable
+
+from server.models.base import BaseModel as Model
+
+
+_MISSING = object()
+
+
+@cache
+def _unloadable(cls: type) -> frozenset[str]:
+    """Attributes a query may leave unloaded: relationships, deferred columns."""
+    try:
+        mapper = sa_inspect(cls)
+    except NoInspectionAvailable:
+        return frozenset()
+    return frozenset(
+        key for key, prop in mapper.attrs.items()
+        if key in mapper.relationships or getattr(prop, "deferred", False)
+    )
+
+
+# Schema hooks a plan cannot run on its own. A schema declaring `counted`
+# (list count field -> list) has its `count_lists` validator applied by
+# the plan itself.
+HOOKS = (
+    "validators", "field_validators", "root_validators", "field_serializers",
+    "model_serializers", "model_validators", "computed_fields",
+)
+
+
+def _opaque(schema: type[pyd.BaseModel]) -> bool:
+    """True when rows of `schema` must be finished by pydantic itself."""
+    decorators = schema.__pydantic_decorators__
+    hooks = {name for kind in HOOKS for name in getattr(decorators, kind)}
+    if getattr(schema, "counted", None):
+        hooks.discard("count_lists")
+    return bool(hooks) or schema.__init__ is not pyd.BaseModel.__init__
+
+
+def _unwrap(annotation) -> tuple[bool, t.Optional[type]]:
+    """`(is_list, nested schema or None)` of a field annotation."""
+    many = False
+    while True:
+        origin = t.get_origin(annotation)
+        if origin in (t.Union, types.UnionType):
+            args = [a for a in t.get_args(annotation) if a is not type(None)]
+            if len(args) != 1:
+                return many, None
+            annotation = args[0]
+        elif origin in (list, tuple, set):
+            many = True
+            annotation = t.get_args(annotation)[0]
+        else:
+            break
+    if isinstance(annotation, type) and issubclass(annotation, pyd.BaseModel):
+        return many, annotation
+    return many, None
+
+
+def _plain(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Model):
+        return value.to_dict()
+    if isinstance(value, list) and value and isinstance(value[0], Model):
+        return [v.to_dict() for v in value]
+    return value
+
+
+class CompiledSerializer:
+    """Flat serialization plan of one response schema (see module docstring)."""
+
+    _plans: dict[type, "CompiledSerializer"] = {}
+
+    def __init__(self, schema: type[pyd.BaseModel]):
+        self.schema = schema
+        self.fields = []
+        self.counted: dict[str, str] = getattr(schema, "counted", None) or {}
+        self.opaque = _opaque(schema)
+
+    @classmethod
+    def of(cls, schema: type[pyd.BaseModel]) -> "CompiledSerializer":
+        plan = cls._plans.get(schema)
+        if plan is None:
+            # Registered before compiling so self-referencing schemas resolve
+            plan = cls._plans[schema] = cls(schema)
+            plan._compile()
+        return plan
+
+    def _compile(self):
+        for name, field in self.schema.model_fields.items():
+            many, nested = _unwrap(field.annotation)
+            default = field.get_default(call_default_factory=True)
+            if default is PydanticUndefined:
+                default = None
+            self.fields.append(
+                (name, many, nested and CompiledSerializer.of(nested), default)
+            )
+
+    @staticmethod
+    def _read(obj, name: str):
+        if isinstance(obj, dict):
+            return obj.get(name, _MISSING)
+        if name in _unloadable(type(obj)) and name not in obj.__dict__:
+            return _MISSING  # not loaded by this query's profile
+        return getattr(obj, name, _MISSING)
+
+    def row(self, obj) -> dict:
+        out = {}
+        for name, many, nested, default in self.fields:
+            value = self._read(obj, name)
+            if value is _MISSING:
+                out[name] = default
+            elif value is None or nested is None:
+                out[name] = _plain(value)
+            elif many:
+                out[name] = [nested.row(v) for v in value]
+            else:
+                out[name] = nested.row(value)
+        for count, items in self.counted.items():
+            if out.get(items):
+                out[count] = len(out[items])
+        if self.opaque:
+            # A custom __init__ or validators: the row is read safely by the
+            # plan above, then finished by the schema.
+            out = self.schema.model_validate(out).model_dump()
+        return out
+
+    def rows(self, objs) -> list[dict]:
+        return [self.row(obj) for obj in objs]
+
+
+def json_response(
+    payload: pyd.BaseModel | str | bytes, status_code: int = 200
+) -> Response:
+    """
+    Sends `payload` (a response model whose data are already plain rows,
+    or its pre-dumped JSON) as is, bypassing the route's response model.
+    """
+    if isinstance(payload, pyd.BaseModel):
+        payload = payload.model_dump_json()
+    return Response(
+        content=payload, status_code=status_code, media_type="application/json"
+    )
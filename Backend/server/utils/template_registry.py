@@ -0,0 +1,57 @@
+"""
+template_registry.py
+Process-wide registry of the compiled email templates.
+
+Every template in `server/templates` is compiled once per process and kept
+(no mtime checks on later lookups). Templates extending
+`base_template.html` all share its single compiled copy. Set
+`TEMPLATE_BYTECODE_DIR` to also persist the compiled bytecode, so a fresh
+process skips recompiling too.
+"""
+
+import os
+
+from jinja2 import (
+    Environment, FileSystemLoader, FileSystemBytecodeCache, Template,
+    select_autoescape,
+)
+
+from server.config.app_configs import app_configs
+
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), '../templates')
+
+
+class TemplateRegistry:
+    def __init__(self, directory: str = TEMPLATE_DIR, bytecode_dir: str = None):
+        bytecode_cache = None
+        if bytecode_dir:
+            os.makedirs(bytecode_dir, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(bytecode_dir)
+        self.env = Environment(
+            loader=FileSystemLoader(directory),
+            autoescape=select_autoescape(["html", "xml"]),
+            bytecode_cache=bytecode_cache,
+            # Templates ship with the code; never re-stat them per email.
+            auto_reload=False,
+            cache_size=-1,
+        )
+        self._templates: dict[str, Template] = {}
+
+    def load_all(self) -> int:
+        """Compiles every template up front (call at startup)."""
+        for name in self.env.list_templates(extensions=["html"]):
+            self.get(name)
+        return len(self._templates)
+
+    def get(self, name: str) -> Template:
+        template = self._templates.get(name)
+        if template is None:
+            template = self._templates[name] = self.env.get_template(name)
+        return template
+
+    def render(self, name: str, **context) -> str:
+        return self.get(name).render(**context)
+
+
+templates = TemplateRegistry(bytecode_dir=app_configs.TEMPLATE_BYTECODE_DIR)
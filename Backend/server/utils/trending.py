@@ -0,0 +1,255 @@
+"""
+trending.py
+Live trending score of public ACTIVE auctions, in Redis.
+
+Each auction's activity is a sum of exponentially decaying events
+(bids, watcher joins, being listed), scaled by how soon it closes:
+
+    trend(now) = sum(w_i * 2^-((now - t_i) / HALF_LIFE))
+                 * 2^-((end - now) / CLOSE_HALF_LIFE)
+
+Every factor that depends on `now` is the same for all auctions, so the
+ranking is fixed between events and the stored score is its log, taken
+against a fixed epoch (forward decay):
+
+    activity = ln(sum(w_i * e^(lambda * (t_i - EPOCH))))
+    score    = activity - mu * (end - EPOCH)
+
+An event is one `logaddexp` on the auction's activity plus one ZADD; the
+landing page reads a page of ids off the ZSET, never the database.
+
+Key layout:
+    trending:score     ZSET auction id -> score
+    trending:activity  HASH auction id -> activity (log space)
+    trending:ends      HASH auction id -> end_date - EPOCH, seconds
+    trending:card:{id} card JSON (GetAuctionSchema row), TRENDING_CARD_TTL s
+    trending:live      HASH '{id}:current_price' / '{id}:watchers_count'
+    trending:seeded    set once the set was built from Postgres
+"""
+
+import math
+from datetime import datetime
+from typing import Optional
+
+from server.config import redis_store, app_configs
+from server.enums.auction_enums import AuctionStatus
+from server.utils.datetime_utils import now_utc
+
+
+SCORE_KEY = "trending:score"
+ACTIVITY_KEY = "trending:activity"
+ENDS_KEY = "trending:ends"
+CARD_KEY = "trending:card:{}"
+LIVE_KEY = "trending:live"
+SEEDED_KEY = "trending:seeded"
+SEED_LOCK_KEY = "trending:seed_lock"
+KEYS = [SCORE_KEY, ACTIVITY_KEY, ENDS_KEY]
+
+EPOCH = 1_700_000_000  # fixed origin of the log-space scores
+LISTED = "listed"
+BID = "bid"
+WATCH = "watch"
+
+# KEYS: score, activity, ends
+# ARGV: auction id, event (ln w + lambda * (t - EPOCH)), mu,
+#       end - EPOCH or '' to keep the stored one, '1' to only track
+# Returns 0 when the auction is not tracked (not public and ACTIVE).
+SCORE_LUA = """
+local id = ARGV[1]
+if ARGV[4] ~= '' then
+    redis.call('HSET', KEYS[3], id, ARGV[4])
+end
+local ends = redis.call('HGET', KEYS[3], id)
+if not ends then
+    return 0
+end
+local activity = redis.call('HGET', KEYS[2], id)
+local event = tonumber(ARGV[2])
+if not activity then
+    activity = event
+elseif ARGV[5] == '1' then
+    activity = tonumber(activity)
+else
+    activity = tonumber(activity)
+    local hi = math.max(activity, event)
+    activity = hi + math.log(1 + math.exp(math.min(activity, event) - hi))
+end
+redis.call('HSET', KEYS[2], id, string.format('%.17g', activity))
+redis.call('ZADD', KEYS[1], activity - tonumber(ARGV[3]) * tonumber(ends), id)
+return 1
+"""
+
+
+def _offset(at: datetime) -> float:
+    return at.timestamp() - EPOCH
+
+
+class Trending:
+    """Decayed trending scores of live auctions (see module docstring)."""
+
+    def __init__(self):
+        self._score = None
+        self.weights = {
+            LISTED: 1.0,
+            BID: app_configs.TRENDING_BID_WEIGHT,
+            WATCH: app_configs.TRENDING_WATCH_WEIGHT,
+        }
+        self.decay = math.log(2) / app_configs.TRENDING_HALF_LIFE
+        self.urgency = math.log(2) / app_configs.TRENDING_CLOSE_HALF_LIFE
+
+    async def _apply(
+        self, auction_id, event: float, end: Optional[datetime] = None,
+        track_only: bool = False,
+    ) -> bool:
+        redis = await redis_store.get_async_redis()
+        if self._score is None:
+            self._score = redis.register_script(SCORE_LUA)
+        return bool(await self._score(
+            keys=KEYS,
+            args=[
+                str(auction_id), event, self.urgency,
+                _offset(end) if end else "", "1" if track_only else "",
+            ],
+        ))
+
+    def _event(self, kind: str, weight: float = 1.0, at: datetime = None) -> float:
+        at = at or now_utc()
+        return math.log(self.weights[kind] * weight) + self.decay * _offset(at)
+
+    async def sync(self, auction):
+        """
+        Follows a lifecycle change of `auction` (id, status, private and
+        end_date): public ACTIVE auctions are tracked, the rest dropped.
+        Keeps the activity of an auction that is already tracked.
+        """
+        if auction.status == AuctionStatus.ACTIVE and not auction.private \
+                and auction.end_date:
+            await self._apply(
+                auction.id, self._event(LISTED), auction.end_date,
+                track_only=True,
+            )
+        else:
+            await self.untrack(auction.id)
+
+    async def record(
+        self, auction_id, kind: str, weight: float = 1.0, **live
+    ) -> bool:
+        """
+        Adds one `kind` event to a tracked auction. `live` card fields
+        (current_price, watchers_count) are stored alongside for the page.
+        """
+        tracked = await self._apply(auction_id, self._event(kind, weight))
+        if tracked and live:
+            redis = await redis_store.get_async_redis()
+            await redis.hset(LIVE_KEY, mapping={
+                f"{auction_id}:{field}": value for field, value in live.items()
+            })
+        return tracked
+
+    async def seed(self, rows):
+        """
+        Builds the set from Postgres: one listed event per auction plus
+        its watchers and recent bids, as if they all happened now.
+        `rows`: (id, end_date, watchers_count, recent bid count).
+        """
+        redis = await redis_store.get_async_redis()
+        for auction_id, end_date, watchers, bids in rows:
+            weight = (
+                self.weights[LISTED]
+                + self.weights[WATCH] * (watchers or 0)
+                + self.weights[BID] * (bids or 0)
+            )
+            await self._apply(
+                auction_id, math.log(weight) + self.decay * _offset(now_utc()),
+                end_date, track_only=True,
+            )
+        await redis.set(SEEDED_KEY, 1)
+
+    async def seed_lock(self) -> Optional[bool]:
+        """True when the set must be seeded by this caller, None while
+        another one is doing it, False once seeded."""
+        redis = await redis_store.get_async_redis()
+        if await redis.exists(SEEDED_KEY):
+            return False
+        if await redis.set(
+            SEED_LOCK_KEY, 1, nx=True, ex=app_configs.TRENDING_SEED_LOCK
+        ):
+            return True
+        return None
+
+    async def untrack(self, auction_id):
+        auction_id = str(auction_id)
+        redis = await redis_store.get_async_redis()
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.zrem(SCORE_KEY, auction_id)
+            pipe.hdel(ACTIVITY_KEY, auction_id)
+            pipe.hdel(ENDS_KEY, auction_id)
+            pipe.delete(CARD_KEY.format(auction_id))
+            pipe.hdel(
+                LIVE_KEY,
+                f"{auction_id}:current_price", f"{auction_id}:watchers_count",
+            )
+            await pipe.execute()
+
+    async def forget_card(self, auction_id):
+        """Drops the cached card of an auction whose listing changed."""
+        redis = await redis_store.get_async_redis()
+        await redis.delete(CARD_KEY.format(auction_id))
+
+    async def store_cards(self, cards: dict[str, str]):
+        """
+        Caches rendered cards for TRENDING_CARD_TTL seconds, so a change
+        that forgets no card (e.g. a new participant) still shows up.
+        """
+        if cards:
+            redis = await redis_store.get_async_redis()
+            async with redis.pipeline(transaction=False) as pipe:
+                for auction_id, card in cards.items():
+                    pipe.set(
+                        CARD_KEY.format(auction_id), card,
+                        ex=app_configs.TRENDING_CARD_TTL,
+                    )
+                await pipe.execute()
+
+    async def page(
+        self, offset: int, limit: int
+    ) -> tuple[int, list[tuple[str, Optional[str], dict]]]:
+        """
+        `(total, [(auction id, card JSON or None, live fields)])` of the
+        top `offset:offset+limit` auctions. Auctions already past their
+        end (a close that never untracked them) are dropped on the way.
+        """
+        redis = await redis_store.get_async_redis()
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.zcard(SCORE_KEY)
+            pipe.zrevrange(SCORE_KEY, offset, offset + limit - 1)
+            total, ids = await pipe.execute()
+        if not ids:
+            return total, []
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.mget([CARD_KEY.format(i) for i in ids])
+            pipe.hmget(ENDS_KEY, ids)
+            pipe.hmget(LIVE_KEY, [
+                f"{i}:{field}" for i in ids
+                for field in ("current_price", "watchers_count")
+            ])
+            cards, ends, live = await pipe.execute()
+
+        now = _offset(now_utc())
+        rows = []
+        for n, (auction_id, card, end) in enumerate(zip(ids, cards, ends)):
+            if end is not None and float(end) < now:
+                await self.untrack(auction_id)
+                total -= 1
+                continue
+            price, watchers = live[2 * n], live[2 * n + 1]
+            fields = {}
+            if price is not None:
+                fields["current_price"] = float(price)
+            if watchers is not None:
+                fields["watchers_count"] = int(watchers)
+            rows.append((auction_id, card, fields))
+        return total, rows
+
+
+trending = Trending()
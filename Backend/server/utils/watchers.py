@@ -0,0 +1,147 @@
+"""
+watchers.py
+Who watches which auction, in Redis.
+
+Joining used to load the auction, append to its `watchers` JSON list and
+write the whole list back with `watchers_count` on every WebSocket
+connect: a read-modify-write race and a row rewrite per viewer. Now a
+join is one Lua call that adds the user to the auction's set and the
+auction to the user's index; only the count goes to Postgres, written
+behind in batches by `WatcherIndex.flush` (scheduler tick). Closing or
+deleting an auction drops its set and its entry in every watcher's index.
+
+Key layout:
+    auction:{id}:watchers   SET user ids watching the auction
+    user:{id}:watching      ZSET auction id -> first joined (timestamp)
+    watchers:dirty          SET auction ids whose count awaits a flush
+"""
+
+import uuid
+
+from sqlalchemy import update as sa_update, bindparam, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from server.config import redis_store, app_configs
+from server.utils.datetime_utils import now_utc
+
+
+WATCHERS_KEY = "auction:{}:watchers"
+WATCHING_KEY = "user:{}:watching"
+DIRTY_KEY = "watchers:dirty"
+
+# KEYS: auction watchers, user watching, dirty
+# ARGV: user id, auction id, now_ts
+# Returns {1 if the user just joined else 0, watchers count}.
+JOIN_LUA = """
+local joined = redis.call('SADD', KEYS[1], ARGV[1])
+if joined == 1 then
+    redis.call('ZADD', KEYS[2], 'NX', ARGV[3], ARGV[2])
+    redis.call('SADD', KEYS[3], ARGV[2])
+end
+return {joined, redis.call('SCARD', KEYS[1])}
+"""
+
+
+class WatcherIndex:
+    """Auction watcher sets plus per-user index (see module docstring)."""
+
+    def __init__(self):
+        self._join = None
+
+    async def is_watching(self, auction_id, user_id) -> bool:
+        redis = await redis_store.get_async_redis()
+        return bool(await redis.sismember(
+            WATCHERS_KEY.format(auction_id), str(user_id)
+        ))
+
+    async def join(self, auction_id, user_id) -> tuple[bool, int]:
+        """`(joined just now, watchers count)` after `user_id` joins."""
+        redis = await redis_store.get_async_redis()
+        if self._join is None:
+            self._join = redis.register_script(JOIN_LUA)
+        joined, count = await self._join(
+            keys=[
+                WATCHERS_KEY.format(auction_id),
+                WATCHING_KEY.format(user_id),
+                DIRTY_KEY,
+            ],
+            args=[str(user_id), str(auction_id), now_utc().timestamp()],
+        )
+        return bool(joined), int(count)
+
+    async def count(self, auction_id) -> int:
+        redis = await redis_store.get_async_redis()
+        return await redis.scard(WATCHERS_KEY.format(auction_id))
+
+    async def watching(
+        self, user_id, offset: int, limit: int
+    ) -> tuple[int, list[str]]:
+        """`(total, auction ids)` the user watches, latest joined first."""
+        redis = await redis_store.get_async_redis()
+        key = WATCHING_KEY.format(user_id)
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.zcard(key)
+            pipe.zrevrange(key, offset, offset + limit - 1)
+            total, ids = await pipe.execute()
+        return total, ids
+
+    async def drop(self, auction_id):
+        """Forgets a finished auction's watchers (see module docstring)."""
+        auction_id = str(auction_id)
+        redis = await redis_store.get_async_redis()
+        key = WATCHERS_KEY.format(auction_id)
+        users = await redis.smembers(key)
+        async with redis.pipeline(transaction=True) as pipe:
+            for user_id in users:
+                pipe.zrem(WATCHING_KEY.format(user_id), auction_id)
+            pipe.delete(key)
+            pipe.srem(DIRTY_KEY, auction_id)
+            await pipe.execute()
+
+    async def mark_dirty(self, auction_ids: list[str]):
+        """Queues counts again, e.g. after the flush's commit failed."""
+        if auction_ids:
+            redis = await redis_store.get_async_redis()
+            await redis.sadd(DIRTY_KEY, *auction_ids)
+
+    async def flush(self, db: AsyncSession) -> list[str]:
+        """
+        Writes the watcher counts of dirty auctions to `auctions` with a
+        single executemany UPDATE and returns the ids written. The caller
+        owns the transaction and calls `mark_dirty` if its commit fails.
+        """
+        from server.models.auction import Auctions
+
+        redis = await redis_store.get_async_redis()
+        ids = await redis.spop(DIRTY_KEY, app_configs.WATCHERS_FLUSH_BATCH)
+        if not ids:
+            return []
+
+        async with redis.pipeline(transaction=False) as pipe:
+            for auction_id in ids:
+                pipe.scard(WATCHERS_KEY.format(auction_id))
+            counts = await pipe.execute()
+
+        rows = [
+            {"_id": uuid.UUID(auction_id), "_count": count}
+            for auction_id, count in zip(ids, counts)
+        ]
+        table = Auctions.__table__
+        stmt = (
+            sa_update(table)
+            .where(table.c.id == bindparam("_id"))
+            # Counts only grow; also keeps those of the old JSON list
+            # until the set catches up with them.
+            .where(func.coalesce(table.c.watchers_count, 0) < bindparam("_count"))
+            .values(watchers_count=bindparam("_count"))
+        )
+        try:
+            await db.execute(stmt, rows)
+        except Exception:
+            # Keep them dirty so the next tick retries.
+            await self.mark_dirty(ids)
+            raise
+        return ids
+
+
+watcher_index = WatcherIndex()
@@ -1,14 +1,201 @@
+import asyncio
+import json
+import logging
+import uuid
 from fastapi import WebSocket
 from functools import lru_cache
 from pydantic import BaseModel
 from fastapi import WebSocket, WebSocketException, status
 from starlette.websockets import WebSocketState
 
+from server.config import redis_store, app_configs
+
+
+# Every worker subscribes to the channel of each auction it has sockets
+# for; broadcast() publishes there, so a bid handled by one worker reaches
+# watchers connected to any other.
+AUCTION_CHANNEL = "ws:auction:{}"
+# Hash of worker instance -> local watcher count, summed for the total.
+WATCHERS_KEY = "ws:watchers:{}"
+# Sent ahead of the next frame after an Outbox dropped some
+RESYNC_HINT = json.dumps({"type": "resync_hint"})
+
+logger = logging.getLogger(__name__)
+
+
+class Outbox:
+    """
+    Bounded outbound queue of one socket, drained by its own writer task.
+    When the client can't keep up the oldest frame is dropped. `new_bid`
+    frames are deltas, so a drop loses a bid: the next frame is preceded
+    by a `resync_hint`, and clients resync from the last `seq` they saw
+    whenever they see a gap. A client that keeps falling behind is
+    disconnected.
+    """
+
+    def __init__(self, manager: "WSManager", auction_id: str, websocket: WebSocket):
+        self.manager = manager
+        self.auction_id = auction_id
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(
+            maxsize=app_configs.WS_SEND_QUEUE_SIZE
+        )
+        self.dropped = 0
+        self.lagged = False
+        self.task = asyncio.create_task(self._drain())
+
+    def put(self, text: str) -> bool:
+        """Queues a frame; False once the client is too slow to keep."""
+        stats = self.manager.stats(self.auction_id)
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.lagged = True
+            self.dropped += 1
+            stats["dropped"] += 1
+            if self.dropped >= app_configs.WS_MAX_DROPPED:
+                return False
+        self.queue.put_nowait(text)
+        return True
+
+    async def _drain(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            text = await self.queue.get()
+            frames = [text]
+            if self.lagged:
+                self.lagged = False
+                frames.insert(0, RESYNC_HINT)
+            started = loop.time()
+            try:
+                for frame in frames:
+                    await asyncio.wait_for(
+                        self.websocket.send_text(frame), app_configs.WS_SEND_TIMEOUT
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Gone or stuck: free the slot instead of blocking the room.
+                await self.manager.evict(
+                    self.auction_id, self.websocket, status.WS_1013_TRY_AGAIN_LATER
+                )
+                return
+            self.manager.observe(self.auction_id, loop.time() - started)
+
 
 class WSManager:
     def __init__(self):
         self.active_connections: dict[str, list[WebSocket]] = {}
         self.chatroom: dict[str, dict[str, dict[str, str] | WebSocket]] = {}
+        self.instance_id = uuid.uuid4().hex
+        self._redis = None
+        self._pubsub = None
+        self._listener: asyncio.Task | None = None
+        self._outboxes: dict[WebSocket, Outbox] = {}
+        self._stats: dict[str, dict[str, float]] = {}
+
+    # Cross-process backend
+    async def _get_pubsub(self):
+        if self._pubsub is None:
+            # Dedicated connection — pubsub must not share the general one
+            self._redis = await redis_store.get_pubsub_redis()
+            self._pubsub = self._redis.pubsub()
+        return self._pubsub
+
+    async def _subscribe(self, auction_id: str):
+        pubsub = await self._get_pubsub()
+        await pubsub.subscribe(AUCTION_CHANNEL.format(auction_id))
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def _unsubscribe(self, auction_id: str):
+        if self._pubsub is not None:
+            await self._pubsub.unsubscribe(AUCTION_CHANNEL.format(auction_id))
+
+    async def _listen(self):
+        """Fans messages from other workers out to this worker's sockets."""
+        prefix = AUCTION_CHANNEL.format("")
+        while self._pubsub is not None:
+            try:
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=1.0
+                )
+                if not message:
+                    continue
+                auction_id = message["channel"][len(prefix):]
+                # Already serialized by the publisher; queue it as-is.
+                await self.local_broadcast(auction_id, message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ WS fan-out error: {e}")
+                await asyncio.sleep(1)
+
+    async def _track_watchers(self, auction_id: str) -> int:
+        """Publishes this worker's watcher count and returns the cluster total."""
+        redis = await redis_store.get_async_redis()
+        key = WATCHERS_KEY.format(auction_id)
+        local = len(self.active_connections.get(auction_id, []))
+        async with redis.pipeline(transaction=True) as pipe:
+            if local:
+                pipe.hset(key, self.instance_id, local)
+            else:
+                pipe.hdel(key, self.instance_id)
+            # A crashed worker can't clean up its field; let the key lapse.
+            pipe.expire(key, app_configs.WS_WATCHERS_TTL)
+            pipe.hvals(key)
+            *_, counts = await pipe.execute()
+        return sum(int(c) for c in counts)
+
+    # Metrics
+    def stats(self, auction_id: str) -> dict:
+        if auction_id not in self._stats:
+            self._stats[auction_id] = {
+                "sent": 0, "dropped": 0, "evicted": 0,
+                "send_ms_avg": 0.0, "send_ms_max": 0.0,
+            }
+        return self._stats[auction_id]
+
+    def observe(self, auction_id: str, seconds: float):
+        stats = self.stats(auction_id)
+        ms = seconds * 1000
+        stats["sent"] += 1
+        # Exponential moving average: recent sends weigh the most.
+        stats["send_ms_avg"] += (ms - stats["send_ms_avg"]) * 0.1
+        stats["send_ms_max"] = max(stats["send_ms_max"], ms)
+
+    def metrics(self) -> dict[str, dict]:
+        """Per auction: local sockets, queued frames and send latency."""
+        result = {}
+        for auction_id, connections in self.active_connections.items():
+            depths = [
+                self._outboxes[c].queue.qsize()
+                for c in connections if c in self._outboxes
+            ]
+            result[auction_id] = {
+                "connections": len(connections),
+                "queue_depth": sum(depths),
+                "queue_depth_max": max(depths, default=0),
+                **self.stats(auction_id),
+            }
+        return result
+
+    async def close(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+        for outbox in self._outboxes.values():
+            outbox.task.cancel()
+        self._outboxes.clear()
+        for auction_id in list(self.active_connections):
+            self.active_connections[auction_id] = []
+            try:
+                await self._track_watchers(auction_id)
+            except Exception:
+                pass
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            await self._redis.aclose()
+            self._pubsub = None
 
     async def connect(self, auction_id: str, websocket: WebSocket):
         # Callers (e.g. bid_controller.ws_create) may have already accepted
@@ -19,7 +206,9 @@ class WSManager:
             await websocket.accept()
         if auction_id not in self.active_connections:
             self.active_connections[auction_id] = []
+            await self._subscribe(auction_id)
         self.active_connections[auction_id].append(websocket)
+        self._outboxes[websocket] = Outbox(self, auction_id, websocket)
         await self.count(auction_id)
 
     async def create_chatroom(
@@ -110,44 +299,83 @@ class WSManager:
                 print(e)
 
     async def disconnect(self, auction_id: str, websocket: WebSocket):
+        await self.evict(auction_id, websocket)
+
+    async def evict(self, auction_id: str, websocket: WebSocket, code: int = None):
+        """
+        Forgets a socket and stops its writer. `code` also closes it, for
+        clients dropped by the server (e.g. too slow to keep up).
+        """
+        outbox = self._outboxes.pop(websocket, None)
+        if outbox and outbox.task is not asyncio.current_task():
+            outbox.task.cancel()
         connections = self.active_connections.get(auction_id)
-        # broadcast() may have already pruned this socket after a failed send
+        # A writer may have already evicted this socket after a failed send
         if not connections or websocket not in connections:
             return
         connections.remove(websocket)
+        if code is not None:
+            self.stats(auction_id)["evicted"] += 1
+            try:
+                await websocket.close(code=code)
+            except Exception:
+                pass
         if len(connections) <= 0:
             del self.active_connections[auction_id]
-        else:
-            await self.count(auction_id)
+            self._stats.pop(auction_id, None)
+            await self._unsubscribe(auction_id)
+        # Watchers on other workers still need the new count
+        await self.count(auction_id)
 
     async def count(self, id: str):
-        count = len(self.active_connections.get(id, []))
+        """Broadcasts the number of watchers across all workers."""
+        try:
+            count = await self._track_watchers(id)
+        except Exception:
+            count = len(self.active_connections.get(id, []))
         await self.broadcast(id, {"type": "count", "Watchers": count})
 
     async def send_message(self, message: str, websocket: WebSocket):
         await websocket.send_text(message)
 
-    async def send_data(self, data: dict | list, websocket: WebSocket):
-        await websocket.send_json({'type': 'bids', 'payload': data})
+    async def send_data(self, data: dict | list, websocket: WebSocket, seq: int = None):
+        frame = {'type': 'bids', 'payload': data}
+        if seq is not None:
+            frame['seq'] = seq
+        await websocket.send_json(frame)
 
     async def broadcast(self, auction_id: str, data: any):
+        """
+        Publishes `data` on the auction's channel; every worker (this one
+        included) delivers it to its own sockets from `_listen`. A str is
+        taken as an already serialized frame.
+        """
+        try:
+            redis = await redis_store.get_async_redis()
+            text = data if isinstance(data, str) else json.dumps(data)
+            await redis.publish(AUCTION_CHANNEL.format(auction_id), text)
+        except Exception as e:
+            # Redis down: still reach the sockets we hold ourselves.
+            logger.error(f"❌ WS publish failed, delivering locally: {e}")
+            await self.local_broadcast(auction_id, data)
+
+    async def local_broadcast(self, auction_id: str, data: any):
+        """
+        Serializes `data` once (str payloads are sent as-is) and queues it
+        on every local socket of the auction. Each socket has its own
+        writer, so a slow client only ever delays itself.
+        """
         connections = self.active_connections.get(auction_id, [])
-        dead = []
-        for connection in connections:
-            try:
-                await connection.send_json(data)
-            except Exception:
-                # Client already gone (e.g. disconnected mid-handshake) —
-                # don't let one dead socket break broadcasting to everyone
-                # else, and don't leave it stuck in the list forever.
-                dead.append(connection)
-        if not dead:
-            return
-        for connection in dead:
-            connections.remove(connection)
         if not connections:
-            self.active_connections.pop(auction_id, None)
-
+            return
+        text = data if isinstance(data, str) else json.dumps(data)
+        slow = [
+            connection for connection in connections
+            if connection in self._outboxes
+            and not self._outboxes[connection].put(text)
+        ]
+        for connection in slow:
+            await self.evict(auction_id, connection, status.WS_1013_TRY_AGAIN_LATER)
 
 
 @lru_cache(maxsize=1)
@@ -0,0 +1,83 @@
+from datetime import timedelta
+
+from server.enums.auction_enums import AuctionStatus
+from server.models.auction import Auctions
+from server.models.items import Items
+from server.repositories.auction_repository import (
+    AuctionRepository, AuctionParticipantRepository,
+)
+from server.schemas import GetAuctionSchema
+from server.utils.datetime_utils import now_utc
+
+
+def test_card_profile_statements_and_counts(statements, auctions, load):
+    busy, bare = auctions
+    statements.count = 0
+    cards = load('card')
+
+    # The auctions (counts included), their items and their sellers
+    assert statements.count == 3
+    assert cards[busy].__dict__['bids'] == []  # noloaded, not lazy
+
+    rendered = {
+        id: GetAuctionSchema.model_validate(card) for id, card in cards.items()
+    }
+    assert statements.count == 3
+    assert (rendered[busy].bids_count, rendered[busy].participants_count) == (2, 1)
+    assert (rendered[bare].bids_count, rendered[bare].participants_count) == (0, 0)
+    assert rendered[busy].item[0].name == "Item 0"
+
+
+def test_detail_profile_counts_loaded_lists(statements, auctions, load):
+    busy, bare = auctions
+    statements.count = 0
+    auctions = load('detail')
+
+    # The auctions and one selectin per relationship (and their own)
+    assert statements.count == 9
+    rendered = {
+        id: GetAuctionSchema.model_validate(auction.to_dict())
+        for id, auction in auctions.items()
+    }
+    assert statements.count == 9
+    assert len(rendered[busy].bids) == 2 and rendered[busy].bids_count == 2
+    assert (
+        len(rendered[busy].participants) == 1
+        and rendered[busy].participants_count == 1
+    )
+    assert (rendered[bare].bids_count, rendered[bare].participants_count) == (0, 0)
+
+
+def test_update_renders_without_lazy_counts(session, statements, auctions):
+    busy, _ = auctions
+    repo = AuctionRepository(AuctionParticipantRepository())
+    statements.count = 0
+    stmt = repo.update_stmt(busy, {"current_price": 120.0}, 'detail')
+    updated = session.execute(stmt).scalars().all()
+
+    # As AuctionServices.update renders it
+    assert statements.count == 9
+    rendered = GetAuctionSchema.model_validate(updated[0].to_dict())
+    assert statements.count == 9
+    assert rendered.current_price == 120.0
+    assert (rendered.bids_count, rendered.participants_count) == (2, 1)
+
+
+def test_new_auction_renders_without_lazy_counts(session, statements, auctions):
+    seller = session.get(Auctions, auctions[0]).users_id
+    # As Repository.add persists it
+    auction = Auctions(
+        users_id=seller, start_price=50.0, current_price=50.0,
+        start_date=now_utc(), end_date=now_utc() + timedelta(days=1),
+        status=AuctionStatus.ACTIVE, item=[Items(seller, "New", "Brand new")],
+    )
+    session.add(auction)
+    session.commit()
+    session.refresh(auction)
+
+    statements.count = 0
+    rendered = GetAuctionSchema.model_validate(auction.to_dict())
+    assert statements.count == 0
+    assert "bids_count" not in auction.__dict__  # deferred, never loaded
+    assert (rendered.bids_count, rendered.participants_count) == (0, 0)
+    assert rendered.item[0].name == "New"
@@ -0,0 +1,33 @@
+import uuid
+
+from server.schemas import CreateNotificationSchema
+from server.services.user_service import UserNotificationServices
+
+
+def notice(**kwargs) -> CreateNotificationSchema:
+    fields = dict(
+        title="Bid Placed", message="Bid submitted", user_id="u1", class_name="BID"
+    )
+    return CreateNotificationSchema(**{**fields, **kwargs})
+
+
+def test_coalesce_key_is_scoped_to_the_auction():
+    key = UserNotificationServices.coalesce_key
+    first, second = str(uuid.uuid4()), str(uuid.uuid4())
+
+    assert key(notice(auction_id=first)) == key(
+        notice(auction_id=first, message="Bid raised")
+    )
+    assert key(notice(auction_id=first)) != key(notice(auction_id=second))
+    assert key(notice(auction_id=first)) != key(
+        notice(auction_id=first, title="You Have been Outbid!")
+    )
+    assert key(notice(auction_id=first)) != key(notice(auction_id=first, user_id="u2"))
+
+
+def test_notices_without_an_auction_are_not_coalesced():
+    assert UserNotificationServices.coalesce_key(notice(links=["/dashboard/"])) is None
+
+
+def test_auction_id_is_not_stored():
+    assert "auction_id" not in notice(auction_id=str(uuid.uuid4())).model_dump()
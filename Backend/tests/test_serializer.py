@@ -0,0 +1,45 @@
+import pytest
+from pydantic_core import to_jsonable_python
+from sqlalchemy import select
+
+from server.models.bids import Bids
+from server.repositories.bid_repository import BidRepository
+from server.schemas import GetAuctionSchema, GetBidSchemaWUser
+from server.utils.serializer import CompiledSerializer
+
+
+def same_json(statements, schema, rows: list, source=lambda row: row):
+    """
+    The compiled rows dump to the same JSON as the schema's own path, and
+    reading them issues no statement (no lazy IO under the async session).
+    """
+    statements.count = 0
+    compiled = CompiledSerializer.of(schema).rows(rows)
+    assert statements.count == 0
+    validated = [
+        schema.model_validate(source(row)).model_dump(mode='json') for row in rows
+    ]
+    assert to_jsonable_python(compiled) == validated
+    return compiled
+
+
+@pytest.mark.parametrize('profile', ['card', 'detail'])
+def test_auction_rows_match_model_validate(statements, auctions, load, profile):
+    busy, bare = auctions
+    rows = load(profile)
+    compiled = same_json(statements, GetAuctionSchema, list(rows.values()))
+
+    counts = {row['id']: (row['bids_count'], row['participants_count']) for row in compiled}
+    assert counts == {busy: (2, 1), bare: (0, 0)}
+
+
+def test_bid_rows_match_model_validate(session, statements, auctions):
+    repo = BidRepository()
+    stmt = repo.with_profile(select(Bids).order_by(Bids.amount), 'list')
+    rows = session.execute(stmt).scalars().all()
+
+    # `user` is Any: the listing used to_dict() for it, as the plan does
+    compiled = same_json(
+        statements, GetBidSchemaWUser, rows, source=lambda bid: bid.to_dict()
+    )
+    assert [row['amount'] for row in compiled] == [110.0, 111.0]